@@ -0,0 +1,76 @@
+"""아침 브리핑 지연 시간 벤치마크.
+
+API마다 요청 지연을 준 가짜 서버에서 list_events → list_messages(unread_only) →
+list_notifications를 차례로 부르는 경우와 daily_briefing 한 번을 비교한다. 차례로 부르면
+세 서비스 지연의 합이, 브리핑은 가장 느린 서비스의 지연이 걸려야 한다.
+
+실행: uv run python benchmarks/bench_briefing.py [--latency calendar=0.1,gmail=0.15,github=0.3]
+      [--size 1000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastmcp import Client, FastMCP
+
+from bench_tools import connect
+from fake_upstream import FakeUpstream, first_day
+from jarvis.tools.briefing import register_briefing_tools
+from jarvis.tools.calendar import register_calendar_tools
+from jarvis.tools.github import register_github_tools
+from jarvis.tools.gmail import register_gmail_tools
+
+
+def _latency(value: str) -> dict[str, float]:
+    return {api: float(sec) for api, _, sec in (p.partition("=") for p in value.split(","))}
+
+
+async def _sequential(client, day: str, max_results: int) -> None:
+    await client.call_tool("list_events", {"start_date": day, "max_results": max_results})
+    await client.call_tool("list_messages", {"unread_only": True, "max_results": max_results})
+    await client.call_tool("list_notifications", {"max_results": max_results})
+
+
+async def _briefing(client, day: str, max_results: int) -> None:
+    await client.call_tool("daily_briefing", {"date": day, "max_results": max_results})
+
+
+async def run(args) -> None:
+    upstream = FakeUpstream(args.size, latency=args.latency).start()
+    try:
+        connect(upstream.url, throttle=False)
+        mcp = FastMCP("Jarvis-bench")
+        register_calendar_tools(mcp)
+        register_gmail_tools(mcp)
+        register_github_tools(mcp)
+        register_briefing_tools(mcp)
+
+        day = first_day().isoformat()
+        print(", ".join(f"{api} {sec * 1000:.0f}ms" for api, sec in args.latency.items()))
+        async with Client(mcp) as client:
+            for name, fn in (("도구 3번 차례로", _sequential), ("daily_briefing", _briefing)):
+                # 첫 호출은 클라이언트 생성 등 워밍업
+                await fn(client, day, args.max_results)
+                durations = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    await fn(client, day, args.max_results)
+                    durations.append((time.perf_counter() - started) * 1000)
+                print(f"{name:<16} p50 {statistics.median(durations):>8.1f} ms")
+    finally:
+        upstream.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--latency", type=_latency, default=_latency("calendar=0.1,gmail=0.15,github=0.3"))
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--max-results", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""빈 시간 계산 마이크로 벤치마크.
+
+참석자 수 × 기간별로 합성 바쁜 구간을 만들어 find_free_slots가 쓰는
+merge_busy(정렬 + 스윕 라인) + free_slots(투 포인터)를 측정하고,
+근무 시간 구간마다 모든 바쁜 구간을 훑는 단순 방식과 비교한다.
+
+실행: uv run python benchmarks/bench_free_slots.py [--meetings-per-day 6]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from datetime import time as clock
+from zoneinfo import ZoneInfo
+
+from jarvis.utils.slots import free_slots, merge_busy, working_windows
+
+TZ = ZoneInfo("Asia/Seoul")
+SIZES = [(5, 1), (20, 2), (50, 4), (100, 8)]  # (참석자 수, 주)
+
+
+def make_busy(attendees: int, windows, meetings_per_day: int, seed: int = 0):
+    """참석자마다 근무일당 meetings_per_day개의 일정을 근무 시간 안팎에 흩뿌린다."""
+    rng = random.Random(seed)
+    busy = []
+    for _ in range(attendees):
+        for start, end in windows:
+            for _ in range(meetings_per_day):
+                begin = rng.uniform(start - 3600, end)
+                busy.append((begin, begin + rng.choice([15, 30, 30, 60, 60, 90]) * 60))
+    return busy
+
+
+def naive_free_slots(busy, windows, duration):
+    """근무 시간 구간마다 전체 바쁜 구간을 정렬·스캔하는 기준 구현."""
+    slots = []
+    for window_start, window_end in windows:
+        overlapping = sorted((s, e) for s, e in busy if s < window_end and e > window_start)
+        cursor = window_start
+        for s, e in overlapping:
+            if s - cursor >= duration:
+                slots.append((cursor, s))
+            cursor = max(cursor, e)
+        if window_end - cursor >= duration:
+            slots.append((cursor, window_end))
+    return slots
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--meetings-per-day", type=int, default=6)
+    parser.add_argument("--duration-min", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    duration = args.duration_min * 60
+    first_day = date(2025, 3, 3)
+
+    print(f"{'attendees':>9} {'weeks':>5} {'intervals':>10} {'sweep(ms)':>10} {'naive(ms)':>10}")
+    for attendees, weeks in SIZES:
+        last_day = first_day + timedelta(weeks=weeks) - timedelta(days=1)
+        windows = working_windows(first_day, last_day, clock(9), clock(18), TZ)
+        busy = make_busy(attendees, windows, args.meetings_per_day)
+
+        expected = naive_free_slots(busy, windows, duration)
+        assert free_slots(merge_busy(busy), windows, duration) == expected
+
+        sweep_ms = _median_ms(
+            lambda: free_slots(merge_busy(busy), windows, duration), args.repeat
+        )
+        naive_ms = _median_ms(lambda: naive_free_slots(busy, windows, duration), 3)
+        print(
+            f"{attendees:>9} {weeks:>5} {len(busy):>10,} {sweep_ms:>10.2f} {naive_ms:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Gmail 로컬 검색 vs API 검색 지연 시간 벤치마크.
+
+합성 메일 코퍼스(기본 100k)를 미러에 색인한 뒤 search_messages가 쓰는
+로컬 경로(GmailMirror.search)와 원격 경로(messages.list + 배치 메타데이터 조회)를 비교한다.
+원격 경로는 왕복 지연(--rtt-ms)을 주입한 가짜 Gmail 서비스로 모델링한다.
+
+실행: uv run python benchmarks/bench_gmail_search.py [--messages 100000] [--rtt-ms 120]
+"""
+
+import argparse
+import base64
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from jarvis.store.gmail import GmailMirror
+from jarvis.store.gmail_query import parse_gmail_query
+from jarvis.tools.gmail import _batch_get_messages
+
+WORDS = (
+    "회의 회의록 일정 청구서 보고서 프로젝트 배포 장애 점검 리뷰 계약 견적 출장 휴가 "
+    "채용 면접 공지 안내 요청 승인 invoice meeting report release review deploy "
+    "incident budget roadmap weekly monthly newsletter security update"
+).split()
+SENDERS = [f"user{i}@example{i % 50}.com" for i in range(500)]
+QUERIES = [
+    "회의록",
+    "from:user42@example42.com",
+    "subject:invoice",
+    "is:unread 배포",
+    "after:2025/01/01 before:2025/02/01 보고서",
+    '"security update"',
+]
+
+
+# 실제 메일처럼 대부분의 단어는 드물게 등장하도록 Zipf 분포의 합성 어휘를 쓴다
+FILLER = [f"w{i}" for i in range(20_000)]
+FILLER_WEIGHTS = [1 / (rank + 1) for rank in range(len(FILLER))]
+
+
+def _sentence(rng: random.Random, n: int) -> str:
+    words = rng.choices(FILLER, FILLER_WEIGHTS, k=n)
+    # 주제어는 메일당 한두 개만 섞는다
+    for _ in range(rng.randint(1, 2)):
+        words[rng.randrange(n)] = rng.choice(WORDS)
+    return " ".join(words)
+
+
+def make_corpus(count: int, seed: int = 0) -> list[dict]:
+    """합성 메일 메타데이터 + 본문을 만든다."""
+    rng = random.Random(seed)
+    start = int(time.mktime((2024, 1, 1, 0, 0, 0, 0, 0, -1)) * 1000)
+    messages = []
+    for i in range(count):
+        body = _sentence(rng, 80)
+        labels = ["INBOX"] + (["UNREAD"] if rng.random() < 0.2 else [])
+        messages.append(
+            {
+                "id": f"m{i:07d}",
+                "threadId": f"t{i // 3:07d}",
+                "labelIds": labels,
+                "snippet": body[:100],
+                "internalDate": str(start + i * 5 * 60 * 1000),
+                "payload": {
+                    "headers": [
+                        {"name": "Subject", "value": _sentence(rng, 5)},
+                        {"name": "From", "value": rng.choice(SENDERS)},
+                        {"name": "Date", "value": "Tue, 11 Feb 2025 10:00:00 +0900"},
+                    ],
+                    "body": {"data": base64.urlsafe_b64encode(body.encode()).decode()},
+                },
+            }
+        )
+    return messages
+
+
+class _LatencyGmail:
+    """모든 HTTP 왕복에 rtt만큼 지연을 주는 가짜 Gmail 서비스."""
+
+    def __init__(self, corpus: list[dict], rtt: float):
+        self._by_id = {m["id"]: m for m in corpus}
+        self._ids = [m["id"] for m in corpus]
+        self.rtt = rtt
+        self.requests = 0
+
+    def _round_trip(self):
+        self.requests += 1
+        time.sleep(self.rtt)
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def list(self, userId, q, maxResults, fields):
+        service = self
+
+        class _Request:
+            def execute(self):
+                service._round_trip()
+                return {"messages": [{"id": i} for i in service._ids[:maxResults]]}
+
+        return _Request()
+
+    def get(self, id, **kwargs):
+        return self._by_id[id]
+
+    def new_batch_http_request(self, callback):
+        service = self
+
+        class _Batch:
+            def __init__(self):
+                self._items = []
+
+            def add(self, request, request_id):
+                self._items.append((request_id, request))
+
+            def execute(self):
+                service._round_trip()
+                for request_id, response in self._items:
+                    callback(request_id, response, None)
+
+        return _Batch()
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--max-results", type=int, default=10)
+    parser.add_argument("--rtt-ms", type=float, default=120.0)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.messages)
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror = GmailMirror(Path(tmp) / "bench.db")
+
+        started = time.perf_counter()
+        mirror.replace_all(corpus, history_id="1", complete=True)
+        index_s = time.perf_counter() - started
+        print(f"색인: {args.messages:,}개 메일, {index_s:.1f}s")
+
+        remote = _LatencyGmail(corpus, args.rtt_ms / 1000)
+
+        def _remote_search():
+            result = remote.list(userId="me", q="", maxResults=args.max_results, fields="")
+            ids = [m["id"] for m in result.execute()["messages"]]
+            _batch_get_messages(remote, ids)
+
+        remote_ms = _median_ms(_remote_search, 3)
+        remote_requests = remote.requests // 3
+
+        print(f"\n{'query':<45} {'local(ms)':>10} {'remote(ms)':>11} {'speedup':>8}")
+        for query in QUERIES:
+            parsed = parse_gmail_query(query)
+            local_ms = _median_ms(lambda: mirror.search(parsed, args.max_results), args.repeat)
+            print(
+                f"{query:<45} {local_ms:>10.2f} {remote_ms:>11.1f} "
+                f"{remote_ms / local_ms:>7.0f}x"
+            )
+
+        print(
+            f"\nremote = messages.list + 배치 조회 {remote_requests}회 왕복 "
+            f"(RTT {args.rtt_ms:.0f}ms, 서버 처리 시간 제외)"
+        )
+
+
+if __name__ == "__main__":
+    main()
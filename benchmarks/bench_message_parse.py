@@ -0,0 +1,161 @@
+"""메일 헤더 조회·본문 추출 벤치마크.
+
+헤더 수백 개(Received, ARC, X-* 등)와 수 MB짜리 본문을 가진 합성 메일로 이전 방식(필드마다
+헤더 목록 선형 탐색, 최상위 파트만 보고 본문 전체 디코딩)과 ParsedMessage(헤더 한 번 색인,
+MIME 트리 반복 탐색, 고른 파트만 limit 바이트까지 디코딩)를 비교한다.
+
+실행: uv run python benchmarks/bench_message_parse.py [--headers 400] [--body-mb 4] [--messages 500]
+"""
+
+import argparse
+import base64
+import statistics
+import time
+import tracemalloc
+
+from jarvis.utils.formatting import format_message, format_message_list
+from jarvis.utils.mime import ParsedMessage
+
+# 미러 색인과 같은 본문 상한
+INDEX_LIMIT = 64 * 1024
+
+
+def _legacy_get_header(message: dict, name: str) -> str:
+    for header in message.get("payload", {}).get("headers", []):
+        if header["name"].lower() == name.lower():
+            return header["value"]
+    return ""
+
+
+def _legacy_extract_body(message: dict) -> str:
+    payload = message.get("payload", {})
+    if "body" in payload and payload["body"].get("data"):
+        return base64.urlsafe_b64decode(payload["body"]["data"]).decode("utf-8")
+    parts = payload.get("parts", [])
+    for mime_type in ("text/plain", "text/html"):
+        for part in parts:
+            if part.get("mimeType") == mime_type:
+                data = part.get("body", {}).get("data", "")
+                if data:
+                    return base64.urlsafe_b64decode(data).decode("utf-8")
+    return ""
+
+
+def _legacy_list_fields(message: dict) -> tuple:
+    return tuple(_legacy_get_header(message, name) for name in ("Subject", "From", "Date"))
+
+
+def _list_fields(message: dict) -> tuple:
+    parsed = ParsedMessage(message)
+    return tuple(parsed.header(name) for name in ("Subject", "From", "Date"))
+
+
+def _data(size: int, word: str) -> str:
+    text = (word * (size // len(word.encode()) + 1)).encode()[:size]
+    return base64.urlsafe_b64encode(text).decode()
+
+
+def make_headers(count: int, i: int = 0) -> list[dict]:
+    """실제 메일처럼 전달 경로 헤더가 앞에, 제목·보낸 사람이 뒤에 오는 헤더 목록."""
+    headers = [
+        {"name": ("Received", "ARC-Seal", "X-Google-Smtp-Source", "DKIM-Signature")[k % 4],
+         "value": f"from relay{k}.example.com by mx.google.com; {k}"}
+        for k in range(count)
+    ]
+    headers += [
+        {"name": "From", "value": f"user{i}@example.com"},
+        {"name": "To", "value": "me@example.com"},
+        {"name": "Date", "value": "Thu, 01 Jan 2026 00:00:00 +0000"},
+        {"name": "Subject", "value": f"보고서 {i}"},
+    ]
+    return headers
+
+
+def make_message(headers: int, body_bytes: int, nested: bool) -> dict:
+    """text/plain + text/html 본문과 큰 첨부 파일이 있는 multipart/mixed 메일."""
+    alternative = [
+        {"mimeType": "text/plain", "body": {"data": _data(body_bytes, "주간 보고서 본문 ")}},
+        {"mimeType": "text/html", "body": {"data": _data(body_bytes * 2, "<p>주간 보고서</p>")}},
+    ]
+    attachment = {
+        "mimeType": "application/pdf",
+        "filename": "report.pdf",
+        "body": {"data": _data(body_bytes, "%PDF")},
+    }
+    if nested:
+        parts = [{"mimeType": "multipart/alternative", "body": {}, "parts": alternative}, attachment]
+    else:
+        parts = [*alternative, attachment]
+    return {
+        "id": "m0",
+        "threadId": "t0",
+        "snippet": "주간 보고서",
+        "payload": {
+            "mimeType": "multipart/mixed",
+            "headers": make_headers(headers),
+            "body": {},
+            "parts": parts,
+        },
+    }
+
+
+def measure(fn, repeat: int) -> dict:
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        durations.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "p50_ms": statistics.median(durations),
+        "peak_kib": peak / 1024,
+        "chars": len(result) if isinstance(result, str) else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--headers", type=int, default=400)
+    parser.add_argument("--body-mb", type=float, default=4)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    body_bytes = int(args.body_mb * 1024 * 1024)
+    listing = [
+        {"id": f"m{i}", "snippet": "", "payload": {"headers": make_headers(args.headers, i)}}
+        for i in range(args.messages)
+    ]
+    flat = make_message(args.headers, body_bytes, nested=False)
+    nested = make_message(args.headers, body_bytes, nested=True)
+
+    cases = [
+        (f"목록 헤더 {args.messages}건", "이전", lambda: [_legacy_list_fields(m) for m in listing]),
+        (f"목록 헤더 {args.messages}건", "색인", lambda: [_list_fields(m) for m in listing]),
+        ("format_message_list", "현재", lambda: format_message_list(listing)),
+        ("본문 (최상위 파트)", "이전", lambda: _legacy_extract_body(flat)),
+        ("본문 (최상위 파트)", "전체", lambda: ParsedMessage(flat).body()),
+        ("본문 (최상위 파트)", "64KiB", lambda: ParsedMessage(flat).body(INDEX_LIMIT)),
+        ("본문 (중첩 alternative)", "이전", lambda: _legacy_extract_body(nested)),
+        ("본문 (중첩 alternative)", "전체", lambda: ParsedMessage(nested).body()),
+        ("본문 (중첩 alternative)", "64KiB", lambda: ParsedMessage(nested).body(INDEX_LIMIT)),
+        ("미러 색인 본문", "이전", lambda: _legacy_extract_body(flat)[:32 * 1024]),
+        ("미러 색인 본문", "현재", lambda: ParsedMessage(flat).body(INDEX_LIMIT)),
+        ("format_message", "현재", lambda: format_message(nested)),
+    ]
+
+    print(f"헤더 {args.headers}개, text/plain {args.body_mb}MB + text/html {args.body_mb * 2}MB + 첨부")
+    header = f"{'경우':<26} {'방식':<6} {'p50 ms':>10} {'peak KiB':>11} {'결과 글자':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, variant, fn in cases:
+        r = measure(fn, args.repeat)
+        chars = "" if r["chars"] is None else r["chars"]
+        print(f"{name:<26} {variant:<6} {r['p50_ms']:>10.3f} {r['peak_kib']:>11.1f} {chars:>10}")
+
+
+if __name__ == "__main__":
+    main()
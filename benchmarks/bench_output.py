@@ -0,0 +1,129 @@
+"""목록 도구의 출력 형식별 응답 크기 비교.
+
+bench_tools와 같은 가짜 API 서버와 시나리오로 output을 받는 목록 도구를 text/json/tsv로 각각
+호출하고, 본문(content)의 UTF-8 바이트 수와 대략적인 토큰 수, json/tsv가 text보다 줄인 비율을
+잰다. json/tsv가 함께 보내는 구조화 출력(structuredContent)의 크기도 따로 적는다.
+
+토큰 수는 tiktoken이 있으면 cl100k_base로 세고, 없으면 영단어 하나, 숫자 세 자리, 기호 세 개
+(`","` 같은 JSON 구분자), 그 밖의 글자(한글, 이모지) 하나를 각각 1토큰으로 어림한다.
+
+실행: uv run python benchmarks/bench_output.py [--sizes 100,1000] [--only list_messages]
+"""
+
+import argparse
+import asyncio
+import json
+import re
+from pathlib import Path
+
+from fastmcp import Client, FastMCP
+
+from bench_tools import (
+    Upstream,
+    connect,
+    register_calendar_tools,
+    register_github_tools,
+    register_gmail_tools,
+    scenarios,
+)
+
+SIZES = [100, 1000]
+FORMATS = ("text", "json", "tsv")
+
+try:
+    import tiktoken
+
+    _encoding = tiktoken.get_encoding("cl100k_base")
+
+    def count_tokens(text: str) -> int:
+        return len(_encoding.encode(text))
+
+except ImportError:
+    _TOKEN = re.compile(r"[A-Za-z]+|\d{1,3}|[^\w\s]{1,3}|\S")
+
+    def count_tokens(text: str) -> int:
+        return len(_TOKEN.findall(text))
+
+
+async def measure(client, tool: str, args: dict) -> dict:
+    """도구 하나를 형식마다 한 번씩 호출해 본문과 구조화 출력 크기를 잰다."""
+    sizes = {}
+    for fmt in FORMATS:
+        result = await client.call_tool(tool, {**args, "output": fmt})
+        text = result.content[0].text
+        structured = result.structured_content
+        sizes[fmt] = {
+            "bytes": len(text.encode("utf-8")),
+            "tokens": count_tokens(text),
+            "structured_bytes": (
+                len(json.dumps(structured, ensure_ascii=False).encode("utf-8")) if structured else 0
+            ),
+        }
+    return sizes
+
+
+async def run_size(size: int, only: set | None) -> list[dict]:
+    upstream = Upstream(size)
+    try:
+        connect(upstream.url, throttle=False)
+        mcp = FastMCP("Jarvis-bench")
+        register_calendar_tools(mcp)
+        register_gmail_tools(mcp)
+        register_github_tools(mcp)
+
+        async with Client(mcp) as client:
+            tools = {
+                tool.name
+                for tool in await client.list_tools()
+                if "output" in tool.input_schema.get("properties", {})
+            }
+            results = []
+            for name, tool, args in scenarios(size):
+                if tool not in tools or (only and name not in only and tool not in only):
+                    continue
+                results.append({"size": size, "scenario": name, **await measure(client, tool, args)})
+            return results
+    finally:
+        upstream.close()
+
+
+def _saved(before: int, after: int) -> str:
+    return f"{(1 - after / before) * 100:5.1f}%" if before else "    -"
+
+
+def print_table(results: list[dict]) -> None:
+    header = (
+        f"{'size':>6} {'scenario':<22} {'text B':>9} {'json B':>9} {'tsv B':>9} "
+        f"{'text tok':>9} {'json tok':>9} {'tsv tok':>9} {'json 절감':>8} {'tsv 절감':>8} "
+        f"{'struct B':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        text, js, tsv = r["text"], r["json"], r["tsv"]
+        print(
+            f"{r['size']:>6} {r['scenario']:<22} {text['bytes']:>9} {js['bytes']:>9} "
+            f"{tsv['bytes']:>9} {text['tokens']:>9} {js['tokens']:>9} {tsv['tokens']:>9} "
+            f"{_saved(text['tokens'], js['tokens']):>10} {_saved(text['tokens'], tsv['tokens']):>10} "
+            f"{js['structured_bytes']:>9}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)))
+    parser.add_argument("--only", type=lambda s: set(s.split(",")), default=None)
+    parser.add_argument("--json", type=Path, help="결과를 JSON으로 저장한다")
+    args = parser.parse_args()
+
+    results = []
+    for size in map(int, args.sizes.split(",")):
+        results.extend(asyncio.run(run_size(size, args.only)))
+    print_table(results)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
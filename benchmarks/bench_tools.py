@@ -0,0 +1,305 @@
+"""MCP 도구 종단 간 오프라인 벤치마크.
+
+fake_upstream의 가짜 Calendar/Gmail/GitHub API 서버를 별도 프로세스로 띄우고,
+등록된 모든 도구를 MCP 클라이언트로 데이터 크기(기본 10 ~ 10k)별로 호출한다.
+실제 클라이언트 스택(googleapiclient + httplib2, PyGithub + requests, 스케줄러)을 그대로 거치며
+호출당 지연 시간, 업스트림 요청 수, 받은 바이트, 최대 메모리 할당, 출력 길이를 잰다.
+
+요청 수는 데이터 크기와 무관하게 페이지 수만큼만 늘어야 한다. N+1 조회 같은 회귀는
+--json으로 결과를 저장해 두고 --baseline으로 비교하면 잡을 수 있다.
+속도 제한 스케줄러는 기본적으로 풀어 두어 Jarvis 자체 비용만 잰다(--throttle로 실제 한도 적용).
+
+실행: uv run python benchmarks/bench_tools.py [--sizes 10,100,1000,10000] [--repeat 5]
+      [--only list_messages,list_issues] [--json out.json] [--baseline base.json]
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+from datetime import timedelta
+from pathlib import Path
+
+# 로컬 저장소/미러가 켜져 있으면 업스트림 대신 SQLite를 재게 되므로 끈다
+for _name in ("JARVIS_GMAIL_MIRROR", "JARVIS_CALENDAR_STORE"):
+    os.environ.pop(_name, None)
+
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ToolError
+from google.oauth2.credentials import Credentials
+
+from fake_upstream import EVENTS_PER_DAY, PRIMARY, first_day
+from jarvis.auth import google_auth
+from jarvis.tools.briefing import register_briefing_tools
+from jarvis.tools.calendar import register_calendar_tools
+from jarvis.tools.github import register_github_tools
+from jarvis.tools.gmail import register_gmail_tools
+from jarvis.utils import coalesce, ratelimit
+
+SIZES = [10, 100, 1000, 10000]
+FAKE_UPSTREAM = Path(__file__).with_name("fake_upstream.py")
+
+# Google API 한 번에 받을 수 있는 최대 개수
+CALENDAR_PAGE_MAX = 2500
+GMAIL_PAGE_MAX = 500
+
+
+def scenarios(size: int) -> list[tuple[str, str, dict]]:
+    """(이름, 도구, 인자) 목록. 목록형 도구는 데이터 크기만큼 요청한다."""
+    day0 = first_day()
+    last_day = day0 + timedelta(days=(size - 1) // EVENTS_PER_DAY)
+    period = {"start_date": day0.isoformat(), "end_date": last_day.isoformat()}
+    event_id = PRIMARY.split("@")[0] + "000000"
+    message_id = f"{0:016x}"
+    repo = "octo/repo-0"
+
+    return [
+        ("list_events", "list_events", {**period, "max_results": min(size, CALENDAR_PAGE_MAX)}),
+        ("list_events[all]", "list_events", {**period, "max_results": size, "calendar_id": "all"}),
+        ("search_events", "search_events", {**period, "query": "회의", "max_results": min(size, CALENDAR_PAGE_MAX)}),
+        ("search_events[all]", "search_events", {**period, "query": "회의", "max_results": size, "calendar_id": "all"}),
+        ("get_event", "get_event", {"event_id": event_id}),
+        ("create_event", "create_event", {
+            "summary": "벤치마크",
+            "start_time": f"{day0}T10:00:00+09:00",
+            "end_time": f"{day0}T11:00:00+09:00",
+            "attendees": ["a@example.com", "b@example.com"],
+        }),
+        ("update_event", "update_event", {"event_id": event_id, "summary": "변경"}),
+        ("delete_event", "delete_event", {"event_id": event_id}),
+        ("list_calendars", "list_calendars", {}),
+        ("find_free_slots", "find_free_slots", {
+            "attendees": [f"user{i}@example.com" for i in range(min(size, 1000))],
+            "start_date": day0.isoformat(),
+            "end_date": (day0 + timedelta(days=13)).isoformat(),
+        }),
+        ("list_messages", "list_messages", {"max_results": min(size, GMAIL_PAGE_MAX)}),
+        ("search_messages", "search_messages", {"query": "보고서", "max_results": min(size, GMAIL_PAGE_MAX)}),
+        ("get_message", "get_message", {"message_id": message_id}),
+        ("send_message", "send_message", {"to": "a@example.com", "subject": "벤치", "body": "본문"}),
+        ("reply_message", "reply_message", {"message_id": message_id, "body": "답장", "reply_all": True}),
+        ("modify_labels", "modify_labels", {"message_id": message_id, "remove_labels": ["UNREAD"]}),
+        ("list_labels", "list_labels", {}),
+        ("trash_message", "trash_message", {"message_id": message_id}),
+        ("save_attachments", "save_attachments", {"message_id": message_id}),
+        ("download_attachment", "download_attachment", {"message_id": message_id, "filename": "report.pdf"}),
+        ("bulk_modify_labels", "bulk_modify_labels", {"query": "보고서", "remove_labels": ["UNREAD"], "max_messages": size}),
+        ("bulk_trash_messages", "bulk_trash_messages", {"message_ids": [f"{i:016x}" for i in range(size)], "max_messages": size}),
+        ("list_repos", "list_repos", {"max_results": size}),
+        ("get_repo", "get_repo", {"owner_repo": repo}),
+        ("list_issues", "list_issues", {"owner_repo": repo, "state": "all", "max_results": size}),
+        ("list_issues[labels]", "list_issues", {"owner_repo": repo, "state": "all", "labels": "bug,urgent", "max_results": size}),
+        ("get_issue", "get_issue", {"owner_repo": repo, "issue_number": 1}),
+        ("create_issue", "create_issue", {"owner_repo": repo, "title": "벤치", "labels": ["bug"]}),
+        ("update_issue", "update_issue", {"owner_repo": repo, "issue_number": 1, "state": "closed"}),
+        ("list_pull_requests", "list_pull_requests", {"owner_repo": repo, "state": "all", "max_results": size}),
+        ("get_pull_request", "get_pull_request", {"owner_repo": repo, "pr_number": 1}),
+        ("create_pull_request", "create_pull_request", {"owner_repo": repo, "title": "벤치", "head": "feature", "base": "main"}),
+        ("merge_pull_request", "merge_pull_request", {"owner_repo": repo, "pr_number": 1}),
+        ("list_notifications", "list_notifications", {"all": True, "max_results": size}),
+        ("mark_notifications_read", "mark_notifications_read", {}),
+        ("daily_briefing", "daily_briefing", {"date": day0.isoformat(), "max_results": 10}),
+        ("daily_briefing[all]", "daily_briefing", {"date": day0.isoformat(), "max_results": 10, "calendar_id": "all"}),
+    ]
+
+
+class Upstream:
+    """가짜 API 서버 프로세스."""
+
+    def __init__(self, size: int):
+        self.process = subprocess.Popen(
+            [sys.executable, str(FAKE_UPSTREAM), "--size", str(size)],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        self.url = self.process.stdout.readline().strip()
+
+    def stats(self) -> dict:
+        with urllib.request.urlopen(f"{self.url}/__stats__") as response:
+            return json.load(response)
+
+    def reset(self) -> None:
+        urllib.request.urlopen(f"{self.url}/__reset__").close()
+
+    def close(self) -> None:
+        self.process.terminate()
+        self.process.wait()
+
+
+def connect(url: str, throttle: bool) -> None:
+    """Jarvis의 Google/GitHub 클라이언트가 가짜 서버를 보도록 바꾼다."""
+    bundled = google_auth._discovery_document
+
+    def _local_document(api: str, version: str) -> dict:
+        document = copy.deepcopy(bundled(api, version))
+        for key in ("rootUrl", "mtlsRootUrl"):
+            document[key] = f"{url}/"
+        document["baseUrl"] = f"{url}/{document['servicePath']}"
+        return document
+
+    google_auth._discovery_document = _local_document
+    google_auth._credentials = Credentials(token="bench")
+    google_auth._services.clear()
+
+    # 같은 인자로 반복 호출하므로 결과 캐시를 끄고 매번 업스트림까지 가게 한다
+    coalesce.RESULT_TTL = 0
+    coalesce.clear()
+
+    os.environ["GITHUB_TOKEN"] = "bench"
+    os.environ["GITHUB_API_URL"] = url
+    # 첨부 파일 저장 도구가 프로젝트 디렉터리에 파일을 남기지 않게 한다
+    os.environ.setdefault("JARVIS_ATTACHMENT_DIR", tempfile.mkdtemp(prefix="jarvis-bench-"))
+
+    if not throttle:
+        ratelimit._schedulers.update(
+            {
+                api: ratelimit.UpstreamScheduler(api, 1e9, 10**9, 64)
+                for api in ("calendar", "gmail", "github")
+            }
+        )
+
+
+def _total(stats: dict, key: str) -> int:
+    return sum(entry[key] for entry in stats.values())
+
+
+async def measure(client, upstream, name, tool, args, repeat) -> dict:
+    """도구 하나를 repeat번 호출해 지표를 모은다. 첫 호출(워밍업)은 제외한다."""
+    try:
+        await client.call_tool(tool, args)
+    except ToolError as e:
+        return {"scenario": name, "error": str(e)}
+
+    upstream.reset()
+    durations = []
+    output = ""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await client.call_tool(tool, args)
+        durations.append((time.perf_counter() - started) * 1000)
+        output = result.content[0].text
+    stats = upstream.stats()
+
+    tracemalloc.start()
+    await client.call_tool(tool, args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    durations.sort()
+    return {
+        "scenario": name,
+        "p50_ms": round(statistics.median(durations), 2),
+        "p95_ms": round(durations[min(len(durations) - 1, int(len(durations) * 0.95))], 2),
+        "requests": _total(stats, "requests") / repeat,
+        "batch_parts": _total(stats, "batch_parts") / repeat,
+        "kib_received": round(_total(stats, "bytes") / repeat / 1024, 1),
+        "peak_alloc_kib": round(peak / 1024, 1),
+        "output_chars": len(output),
+    }
+
+
+async def run_size(size: int, args) -> list[dict]:
+    upstream = Upstream(size)
+    try:
+        connect(upstream.url, args.throttle)
+        mcp = FastMCP("Jarvis-bench")
+        register_calendar_tools(mcp)
+        register_gmail_tools(mcp)
+        register_github_tools(mcp)
+        register_briefing_tools(mcp)
+
+        async with Client(mcp) as client:
+            registered = {tool.name for tool in await client.list_tools()}
+            selected = scenarios(size)
+            missing = registered - {tool for _, tool, _ in selected}
+            if missing:
+                print(f"경고: 벤치마크 시나리오가 없는 도구: {', '.join(sorted(missing))}")
+            if args.only:
+                selected = [s for s in selected if s[0] in args.only or s[1] in args.only]
+
+            results = []
+            for name, tool, tool_args in selected:
+                record = await measure(client, upstream, name, tool, tool_args, args.repeat)
+                results.append({"size": size, **record})
+            return results
+    finally:
+        upstream.close()
+
+
+def print_table(results: list[dict]) -> None:
+    header = (
+        f"{'size':>6} {'scenario':<22} {'p50 ms':>9} {'p95 ms':>9} {'req':>7} "
+        f"{'batch':>7} {'KiB in':>9} {'peak KiB':>9} {'out chars':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        if "error" in r:
+            print(f"{r['size']:>6} {r['scenario']:<22} 오류: {r['error'][:80]}")
+            continue
+        print(
+            f"{r['size']:>6} {r['scenario']:<22} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} "
+            f"{r['requests']:>7.1f} {r['batch_parts']:>7.1f} {r['kib_received']:>9.1f} "
+            f"{r['peak_alloc_kib']:>9.1f} {r['output_chars']:>10}"
+        )
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """기준 결과보다 요청 수가 늘었거나 지연 시간이 tolerance 이상 늘어난 시나리오를 찾는다."""
+    base = {(r["size"], r["scenario"]): r for r in baseline if "error" not in r}
+    regressions = []
+    for r in results:
+        before = base.get((r["size"], r["scenario"]))
+        if before is None:
+            continue
+        if "error" in r:
+            regressions.append(f"{r['size']} {r['scenario']}: 오류 {r['error'][:80]}")
+            continue
+        if r["requests"] > before["requests"]:
+            regressions.append(
+                f"{r['size']} {r['scenario']}: 요청 수 {before['requests']} → {r['requests']}"
+            )
+        if r["p50_ms"] > before["p50_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{r['size']} {r['scenario']}: p50 {before['p50_ms']}ms → {r['p50_ms']}ms"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", type=lambda s: set(s.split(",")), default=None)
+    parser.add_argument("--throttle", action="store_true", help="실제 속도 제한을 적용한다")
+    parser.add_argument("--json", type=Path, help="결과를 JSON으로 저장한다")
+    parser.add_argument("--baseline", type=Path, help="이 결과와 비교해 회귀가 있으면 종료 코드 1")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="허용할 p50 증가 비율")
+    args = parser.parse_args()
+
+    results = []
+    for size in map(int, args.sizes.split(",")):
+        results.extend(asyncio.run(run_size(size, args)))
+    print_table(results)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        if regressions:
+            print("\n회귀:")
+            for line in regressions:
+                print(f"  - {line}")
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,788 @@
+"""오프라인 벤치마크용 가짜 Google Calendar / Gmail / GitHub API 서버.
+
+합성 데이터 size건을 메모리에 만들어 두고 Jarvis 도구가 쓰는 엔드포인트만 흉내 낸다.
+실제 클라이언트(httplib2 + googleapiclient, requests + PyGithub)가 그대로 붙을 수 있도록
+페이지 토큰, Link 헤더, 배치(multipart/mixed), GraphQL 커서, ETag/304, fields 부분 응답을 지원한다.
+API별 요청 수와 응답 바이트를 세며, /__stats__ 로 읽고 /__reset__ 으로 초기화한다.
+latency(API → 초)를 주면 그 API의 요청마다 응답 전에 그만큼 기다린다.
+
+단독 실행: python benchmarks/fake_upstream.py --size 1000 [--latency github=0.3]
+          (첫 줄에 포트를 출력한다)
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import traceback
+from datetime import date, datetime, timedelta, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlencode, urlsplit
+
+KST = timezone(timedelta(hours=9))
+
+WORDS = (
+    "회의 보고서 배포 점검 리뷰 계약 견적 출장 채용 면접 공지 안내 요청 승인 "
+    "invoice meeting report release review deploy incident budget roadmap weekly"
+).split()
+LABELS = ["bug", "urgent", "enhancement", "docs", "question", "good first issue"]
+
+# 합성 일정은 근무일 하루에 이만큼씩 채운다
+EVENTS_PER_DAY = 8
+OTHER_CALENDARS = 3
+# freebusy 응답에서 캘린더 하나에 넣는 하루 바쁜 구간 수
+BUSY_PER_DAY = 4
+
+PRIMARY = "me@example.com"
+
+# 첫 메일에 붙는 큰 첨부 파일 크기. size에 비례하고 Gmail 한도(25MB)에서 멈춘다
+ATTACHMENT_BYTES_PER_ITEM = 25 * 1024
+ATTACHMENT_MAX = 25 * 1024 * 1024
+
+
+def first_day() -> date:
+    """합성 일정이 시작되는 날. 도구가 지난 시간을 걸러내므로 다음 주 월요일로 잡는다."""
+    today = date.today()
+    return today + timedelta(days=7 - today.weekday())
+
+
+def _body(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode()).decode()
+
+
+def attachment_content(attachment_id: str, size: int) -> bytes:
+    """첨부 파일 내용. ID로 정해지므로 테스트가 같은 내용을 다시 만들어 해시를 비교할 수 있다."""
+    block = hashlib.sha256(attachment_id.encode()).digest() * 64
+    return (block * (size // len(block) + 1))[:size]
+
+
+# ---------------------------------------------------------------------------
+# fields 부분 응답
+# ---------------------------------------------------------------------------
+
+
+def parse_fields(spec: str) -> dict:
+    """Google fields 파라미터("a,b/c,items(d,e)")를 {이름: 하위 트리 또는 None} 트리로 바꾼다."""
+
+    def _parse(i: int) -> tuple[dict, int]:
+        tree: dict = {}
+        while i < len(spec) and spec[i] != ")":
+            j = i
+            while j < len(spec) and spec[j] not in ",()":
+                j += 1
+            *parents, leaf = spec[i:j].strip().split("/")
+            node = tree
+            for name in parents:
+                if node.get(name) is None:
+                    node[name] = {}
+                node = node[name]
+            if j < len(spec) and spec[j] == "(":
+                node[leaf], j = _parse(j + 1)
+                j += 1
+            elif leaf not in node:
+                node[leaf] = None
+            if j < len(spec) and spec[j] == ",":
+                j += 1
+            i = j
+        return tree, i
+
+    return _parse(0)[0]
+
+
+def project(value, tree: dict | None):
+    """fields 트리에 있는 키만 남긴다."""
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [project(v, tree) for v in value]
+    if isinstance(value, dict):
+        return {k: project(value[k], sub) for k, sub in tree.items() if k in value}
+    return value
+
+
+# ---------------------------------------------------------------------------
+# 합성 데이터
+# ---------------------------------------------------------------------------
+
+
+class Dataset:
+    """size에 비례하는 합성 일정·메일·GitHub 데이터."""
+
+    def __init__(self, size: int, seed: int = 0):
+        self.size = size
+        rng = random.Random(seed)
+        self.day0 = first_day()
+
+        self.calendars = [
+            {"id": PRIMARY, "summary": "내 캘린더", "primary": True, "timeZone": "Asia/Seoul"}
+        ] + [
+            {"id": f"team{i}@group.example.com", "summary": f"팀 {i}", "timeZone": "Asia/Seoul"}
+            for i in range(OTHER_CALENDARS)
+        ]
+        self.events = {PRIMARY: self._events(PRIMARY, size, rng)}
+        for calendar in self.calendars[1:]:
+            self.events[calendar["id"]] = self._events(calendar["id"], max(1, size // 4), rng)
+
+        self.labels = [
+            {"id": name, "name": name, "type": "system"}
+            for name in ("INBOX", "UNREAD", "STARRED", "IMPORTANT", "SENT", "DRAFT", "TRASH")
+        ] + [{"id": f"Label_{i}", "name": f"프로젝트/{i}", "type": "user"} for i in range(20)]
+        self.messages = [self._message(i, rng) for i in range(size)]
+        self.messages_by_id = {m["id"]: m for m in self.messages}
+        # attachmentId → 크기
+        self.attachments: dict[str, int] = {}
+        if self.messages:
+            self._attach(self.messages[0], min(size * ATTACHMENT_BYTES_PER_ITEM, ATTACHMENT_MAX))
+
+        self.repos = [self._repo(i, rng) for i in range(size)]
+        self.issues = [self._issue(size - i, rng) for i in range(size)]
+        self.pulls = [self._pull(size - i, rng) for i in range(size)]
+        self.notifications = [self._notification(i, rng) for i in range(size)]
+
+    def last_day(self) -> date:
+        """primary 캘린더의 마지막 일정 날짜."""
+        return self.day0 + timedelta(days=(self.size - 1) // EVENTS_PER_DAY)
+
+    def _events(self, calendar_id: str, count: int, rng: random.Random) -> list[dict]:
+        events = []
+        for i in range(count):
+            day = self.day0 + timedelta(days=i // EVENTS_PER_DAY)
+            start = datetime.combine(day, datetime.min.time(), KST) + timedelta(
+                hours=9 + i % EVENTS_PER_DAY, minutes=rng.choice([0, 15, 30])
+            )
+            end = start + timedelta(minutes=rng.choice([30, 45, 60]))
+            event_id = f"{calendar_id.split('@')[0]}{i:06d}"
+            events.append(
+                {
+                    "id": event_id,
+                    "status": "confirmed",
+                    "summary": f"{rng.choice(WORDS)} {rng.choice(WORDS)} #{i}",
+                    "description": " ".join(rng.choices(WORDS, k=30)),
+                    "location": f"회의실 {rng.randint(1, 12)}",
+                    "start": {"dateTime": start.isoformat(), "timeZone": "Asia/Seoul"},
+                    "end": {"dateTime": end.isoformat(), "timeZone": "Asia/Seoul"},
+                    "attendees": [{"email": f"user{rng.randint(0, 99)}@example.com"}],
+                    "htmlLink": f"https://calendar.google.com/event?eid={event_id}",
+                    "etag": f'"{i}"',
+                    "_ts": start.timestamp(),
+                }
+            )
+        return events
+
+    def _message(self, i: int, rng: random.Random) -> dict:
+        message_id = f"{i:016x}"
+        labels = ["INBOX"] + (["UNREAD"] if i % 3 == 0 else [])
+        subject = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}"
+        sent = datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=7 * i)
+        headers = [
+            {"name": "From", "value": f"user{i % 97}@example.com"},
+            {"name": "To", "value": PRIMARY},
+            {"name": "Cc", "value": "team@example.com"},
+            {"name": "Subject", "value": subject},
+            {"name": "Date", "value": sent.strftime("%a, %d %b %Y %H:%M:%S +0000")},
+            {"name": "Message-Id", "value": f"<{message_id}@mail.example.com>"},
+        ]
+        text = " ".join(rng.choices(WORDS, k=150))
+        return {
+            "id": message_id,
+            "threadId": f"{i // 3:016x}",
+            "labelIds": labels,
+            "snippet": text[:120],
+            "internalDate": str(int(sent.timestamp() * 1000)),
+            "sizeEstimate": 4000,
+            "payload": {
+                "mimeType": "multipart/alternative",
+                "headers": headers,
+                "parts": [
+                    {"mimeType": "text/plain", "body": {"size": len(text), "data": _body(text)}},
+                    {
+                        "mimeType": "text/html",
+                        "body": {"size": len(text) + 13, "data": _body(f"<p>{text}</p>")},
+                    },
+                ],
+            },
+        }
+
+    def _attach(self, message: dict, size: int) -> None:
+        """메일을 multipart/mixed로 바꾸고 큰 PDF와 작은 텍스트 첨부를 붙인다."""
+        body = message["payload"]
+        parts = [{**body, "partId": "0", "headers": []}]
+        for n, (filename, mime_type, nbytes) in enumerate(
+            [("report.pdf", "application/pdf", size), ("notes.txt", "text/plain", 1000)], 1
+        ):
+            attachment_id = f"att-{message['id']}-{n}"
+            self.attachments[attachment_id] = nbytes
+            parts.append(
+                {
+                    "partId": str(n),
+                    "mimeType": mime_type,
+                    "filename": filename,
+                    "body": {"attachmentId": attachment_id, "size": nbytes},
+                }
+            )
+        message["payload"] = {
+            "mimeType": "multipart/mixed",
+            "headers": body["headers"],
+            "body": {"size": 0},
+            "parts": parts,
+        }
+
+    def _repo(self, i: int, rng: random.Random) -> dict:
+        name = f"repo-{i}"
+        return {
+            "id": i + 1,
+            "name": name,
+            "full_name": f"octo/{name}",
+            "owner": {"login": "octo", "id": 1},
+            "description": " ".join(rng.choices(WORDS, k=8)),
+            "language": rng.choice(["Python", "Go", "TypeScript", None]),
+            "stargazers_count": rng.randint(0, 5000),
+            "forks_count": rng.randint(0, 500),
+            "private": i % 4 == 0,
+            "default_branch": "main",
+            "html_url": f"https://github.com/octo/{name}",
+            "url": f"/repos/octo/{name}",
+            "updated_at": "2026-01-01T00:00:00Z",
+        }
+
+    def _issue(self, number: int, rng: random.Random) -> dict:
+        return {
+            "number": number,
+            "title": f"{rng.choice(WORDS)} {rng.choice(WORDS)} 문제 #{number}",
+            "state": "OPEN" if number % 4 else "CLOSED",
+            "createdAt": f"2026-01-{1 + number % 28:02d}T09:00:00+00:00",
+            "url": f"https://github.com/octo/repo-0/issues/{number}",
+            "body": " ".join(rng.choices(WORDS, k=60)),
+            "author": {"login": f"user{number % 13}"},
+            "labels": {"nodes": [{"name": n} for n in rng.sample(LABELS, rng.randint(0, 3))]},
+            "assignees": {"nodes": [{"login": f"user{number % 5}"}]},
+        }
+
+    def _pull(self, number: int, rng: random.Random) -> dict:
+        merged = number % 5 == 0
+        return {
+            "number": number,
+            "title": f"{rng.choice(WORDS)} 개선 #{number}",
+            "state": "MERGED" if merged else ("OPEN" if number % 3 else "CLOSED"),
+            "merged": merged,
+            "createdAt": f"2026-02-{1 + number % 28:02d}T09:00:00+00:00",
+            "url": f"https://github.com/octo/repo-0/pull/{number}",
+            "body": " ".join(rng.choices(WORDS, k=60)),
+            "headRefName": f"feature/{number}",
+            "baseRefName": "main",
+            "author": {"login": f"user{number % 13}"},
+            "labels": {"nodes": [{"name": n} for n in rng.sample(LABELS, rng.randint(0, 2))]},
+        }
+
+    def _notification(self, i: int, rng: random.Random) -> dict:
+        return {
+            "id": str(i + 1),
+            "unread": i % 2 == 0,
+            "reason": rng.choice(["mention", "review_requested", "subscribed", "assign"]),
+            "updated_at": "2026-01-01T00:00:00Z",
+            "subject": {
+                "title": f"{rng.choice(WORDS)} 알림 {i}",
+                "type": rng.choice(["Issue", "PullRequest"]),
+                "url": f"/repos/octo/repo-0/issues/{i + 1}",
+            },
+            "repository": {"full_name": f"octo/repo-{i % 10}", "name": f"repo-{i % 10}"},
+        }
+
+
+# ---------------------------------------------------------------------------
+# HTTP 서버
+# ---------------------------------------------------------------------------
+
+
+class Response:
+    def __init__(self, status: int = 200, body=None, headers: dict | None = None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    def encode(self) -> tuple[bytes, dict]:
+        headers = dict(self.headers)
+        if self.body is None:
+            return b"", headers
+        if isinstance(self.body, bytes):
+            return self.body, headers
+        headers.setdefault("Content-Type", "application/json; charset=UTF-8")
+        return json.dumps(self.body, ensure_ascii=False).encode(), headers
+
+
+def _error(status: int, message: str) -> Response:
+    return Response(status, {"error": {"code": status, "message": message, "errors": []}})
+
+
+def _int(query: dict, name: str, default: int) -> int:
+    return int(query.get(name, [default])[0])
+
+
+class FakeUpstream:
+    """가짜 API 서버. start()로 백그라운드 스레드에서 띄운다."""
+
+    def __init__(self, size: int, port: int = 0, latency: dict[str, float] | None = None):
+        self.data = Dataset(size)
+        # API → 요청마다 더할 지연(초). 느린 서비스를 흉내 낼 때 쓴다
+        self.latency = dict(latency or {})
+        self._stats_lock = threading.Lock()
+        self.stats: dict[str, dict[str, int]] = {}
+        upstream = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # 헤더와 본문을 따로 쓰므로 Nagle + 지연 ACK로 응답마다 40ms씩 늦어지지 않게 한다
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                headers = {k.lower(): v for k, v in self.headers.items()}
+                delay = upstream.latency.get(upstream._api(self.path))
+                if delay:
+                    time.sleep(delay)
+                try:
+                    response = upstream.dispatch(self.command, self.path, headers, body)
+                except Exception:
+                    traceback.print_exc()
+                    response = _error(500, "fake upstream error")
+                payload, headers = response.encode()
+                self.send_response(response.status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                # 클라이언트가 응답을 받자마자 통계를 읽을 수 있으므로 보내기 전에 센다
+                upstream._count(self.path, len(payload))
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self) -> "FakeUpstream":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    # ---- 통계 ----
+
+    @staticmethod
+    def _api(path: str) -> str | None:
+        if path.startswith("/__"):
+            return None
+        if path.startswith(("/calendar/", "/batch/calendar/")):
+            return "calendar"
+        # Gmail discovery 문서의 batchPath는 "batch"다
+        if path.startswith(("/gmail/", "/batch")):
+            return "gmail"
+        return "github"
+
+    def _count(self, path: str, nbytes: int) -> None:
+        api = self._api(path)
+        if api is None:
+            return
+        with self._stats_lock:
+            entry = self.stats.setdefault(api, {"requests": 0, "bytes": 0, "batch_parts": 0})
+            entry["requests"] += 1
+            entry["bytes"] += nbytes
+
+    def _count_batch_parts(self, api: str, parts: int) -> None:
+        with self._stats_lock:
+            entry = self.stats.setdefault(api, {"requests": 0, "bytes": 0, "batch_parts": 0})
+            entry["batch_parts"] += parts
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self.stats = {}
+
+    def snapshot_stats(self) -> dict:
+        with self._stats_lock:
+            return {api: dict(entry) for api, entry in self.stats.items()}
+
+    # ---- 라우팅 ----
+
+    def dispatch(self, method: str, target: str, headers: dict, body: bytes) -> Response:
+        split = urlsplit(target)
+        path, query = unquote(split.path), parse_qs(split.query)
+        payload = json.loads(body) if body and "json" in headers.get("content-type", "") else None
+
+        if path == "/__stats__":
+            return Response(200, self.snapshot_stats())
+        if path == "/__reset__":
+            self.reset_stats()
+            return Response(204)
+
+        if path.startswith("/batch"):
+            return self._batch(path, headers, body)
+        if path.startswith("/calendar/v3/"):
+            response = self._calendar(method, path[len("/calendar/v3") :], query, payload)
+        elif path.startswith("/gmail/v1/users/me/"):
+            response = self._gmail(method, path[len("/gmail/v1/users/me") :], query, payload)
+        else:
+            return self._github(method, path, query, payload, headers)
+
+        if response.status < 300 and "fields" in query and isinstance(response.body, dict):
+            response.body = project(response.body, parse_fields(query["fields"][0]))
+        return response
+
+    # ---- Google 배치 ----
+
+    def _batch(self, path: str, headers: dict, body: bytes) -> Response:
+        """multipart/mixed 배치 요청을 풀어 각 요청을 처리하고 같은 형식으로 돌려준다."""
+        api = self._api(path)
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {headers['content-type']}\r\n\r\n".encode() + body
+        )
+        boundary = "batch_fake_upstream"
+        chunks = []
+        parts = list(message.iter_parts())
+        for part in parts:
+            request = part.get_payload(decode=True).decode()
+            head, _, sub_body = request.partition("\r\n\r\n")
+            if not sub_body:
+                head, _, sub_body = request.partition("\n\n")
+            request_line, *header_lines = head.splitlines()
+            method, target, _ = request_line.split(" ", 2)
+            sub_headers = {
+                name.lower(): value
+                for name, _, value in (line.partition(": ") for line in header_lines)
+            }
+            response = self.dispatch(method, target, sub_headers, sub_body.encode())
+            payload, response_headers = response.encode()
+            lines = [f"HTTP/1.1 {response.status} OK"]
+            lines += [f"{k}: {v}" for k, v in response_headers.items()]
+            content_id = part["Content-ID"].strip("<>")
+            chunks.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                + "\r\n".join(lines)
+                + "\r\n\r\n"
+                + payload.decode()
+                + "\r\n"
+            )
+        self._count_batch_parts(api, len(parts))
+        chunks.append(f"--{boundary}--\r\n")
+        return Response(
+            200,
+            "".join(chunks).encode(),
+            {"Content-Type": f"multipart/mixed; boundary={boundary}"},
+        )
+
+    # ---- Calendar ----
+
+    def _calendar_id(self, calendar_id: str) -> str:
+        return PRIMARY if calendar_id == "primary" else calendar_id
+
+    def _find_event(self, calendar_id: str, event_id: str) -> dict | None:
+        for event in self.data.events.get(self._calendar_id(calendar_id), []):
+            if event["id"] == event_id:
+                return event
+        return None
+
+    @staticmethod
+    def _public(event: dict) -> dict:
+        return {k: v for k, v in event.items() if not k.startswith("_")}
+
+    def _calendar(self, method: str, path: str, query: dict, payload) -> Response:
+        if path == "/users/me/calendarList":
+            return Response(200, {"items": self.data.calendars})
+        if path == "/freeBusy" and method == "POST":
+            return Response(200, self._freebusy(payload))
+        match = re.fullmatch(r"/calendars/([^/]+)", path)
+        if match and method == "GET":
+            calendar_id = self._calendar_id(match.group(1))
+            if calendar_id not in self.data.events:
+                return _error(404, "calendar not found")
+            return Response(200, {"id": calendar_id, "timeZone": "Asia/Seoul"})
+
+        match = re.fullmatch(r"/calendars/([^/]+)/events(?:/([^/]+))?", path)
+        if not match:
+            return _error(404, f"unknown calendar path {path}")
+        calendar_id, event_id = self._calendar_id(match.group(1)), match.group(2)
+        if calendar_id not in self.data.events:
+            return _error(404, "calendar not found")
+
+        if event_id is None and method == "GET":
+            return Response(200, self._list_events(calendar_id, query))
+        if event_id is None and method == "POST":
+            return Response(200, {**payload, "id": "created0001", "htmlLink": "https://x"})
+
+        event = self._find_event(calendar_id, event_id)
+        if event is None:
+            return _error(404, "event not found")
+        if method == "GET":
+            return Response(200, self._public(event))
+        if method in ("PUT", "PATCH"):
+            return Response(200, {**self._public(event), **payload})
+        if method == "DELETE":
+            return Response(204)
+        return _error(405, method)
+
+    def _list_events(self, calendar_id: str, query: dict) -> dict:
+        time_min = datetime.fromisoformat(query["timeMin"][0]).timestamp()
+        time_max = datetime.fromisoformat(query["timeMax"][0]).timestamp()
+        text = query.get("q", [None])[0]
+        matched = [
+            e
+            for e in self.data.events[calendar_id]
+            if time_min <= e["_ts"] < time_max
+            and (text is None or text in e["summary"] or text in e["description"])
+        ]
+        offset = int(query.get("pageToken", ["0"])[0])
+        limit = min(_int(query, "maxResults", 250), 2500)
+        page = matched[offset : offset + limit]
+        result = {"items": [self._public(e) for e in page], "timeZone": "Asia/Seoul"}
+        if offset + limit < len(matched):
+            result["nextPageToken"] = str(offset + limit)
+        return result
+
+    def _freebusy(self, payload: dict) -> dict:
+        start = datetime.fromisoformat(payload["timeMin"])
+        end = datetime.fromisoformat(payload["timeMax"])
+        calendars = {}
+        for item in payload["items"]:
+            rng = random.Random(item["id"])
+            busy = []
+            day = start
+            while day < end:
+                for _ in range(BUSY_PER_DAY):
+                    begin = day + timedelta(hours=rng.uniform(8, 19))
+                    busy.append(
+                        {
+                            "start": begin.isoformat(),
+                            "end": (begin + timedelta(minutes=rng.choice([30, 60]))).isoformat(),
+                        }
+                    )
+                day += timedelta(days=1)
+            calendars[item["id"]] = {"busy": sorted(busy, key=lambda b: b["start"])}
+        return {"kind": "calendar#freeBusy", "calendars": calendars}
+
+    # ---- Gmail ----
+
+    def _gmail(self, method: str, path: str, query: dict, payload) -> Response:
+        if path == "/labels":
+            return Response(200, {"labels": self.data.labels})
+        if path == "/messages" and method == "GET":
+            return Response(200, self._list_messages(query))
+        if path == "/messages/send":
+            return Response(200, {"id": "sent0001", "threadId": payload.get("threadId", "t0001")})
+        if path == "/messages/batchModify":
+            # 실제 API처럼 ID 중 하나라도 잘못되면 묶음 전체가 실패한다
+            if len(payload["ids"]) > 1000 or any(i not in self.data.messages_by_id for i in payload["ids"]):
+                return _error(400, "Invalid id value")
+            return Response(204)
+
+        match = re.fullmatch(r"/messages/([^/]+)/attachments/([^/]+)", path)
+        if match:
+            size = self.data.attachments.get(match.group(2))
+            if size is None:
+                return _error(404, "Invalid attachment token")
+            data = attachment_content(match.group(2), size)
+            return Response(200, {"size": size, "data": base64.urlsafe_b64encode(data).decode()})
+
+        match = re.fullmatch(r"/messages/([^/]+)(?:/(modify|trash))?", path)
+        if not match:
+            return _error(404, f"unknown gmail path {path}")
+        message = self.data.messages_by_id.get(match.group(1))
+        if message is None:
+            return _error(404, "Requested entity was not found.")
+        if match.group(2) == "modify":
+            labels = set(message["labelIds"]) | set(payload.get("addLabelIds", []))
+            labels -= set(payload.get("removeLabelIds", []))
+            return Response(200, {"id": message["id"], "labelIds": sorted(labels)})
+        if match.group(2) == "trash":
+            return Response(200, {"id": message["id"], "labelIds": ["TRASH"]})
+
+        if query.get("format", ["full"])[0] == "metadata":
+            wanted = {h.lower() for h in query.get("metadataHeaders", [])}
+            payload_meta = {
+                "mimeType": message["payload"]["mimeType"],
+                "headers": [
+                    h
+                    for h in message["payload"]["headers"]
+                    if not wanted or h["name"].lower() in wanted
+                ],
+            }
+            return Response(200, {**message, "payload": payload_meta})
+        return Response(200, message)
+
+    def _list_messages(self, query: dict) -> dict:
+        labels = set(query.get("labelIds", []))
+        text = query.get("q", [None])[0]
+        matched = [
+            m
+            for m in self.data.messages
+            if labels.issubset(m["labelIds"])
+            and (text is None or any(word in m["snippet"] for word in text.split()))
+        ]
+        offset = int(query.get("pageToken", ["0"])[0])
+        limit = min(_int(query, "maxResults", 100), 500)
+        page = matched[offset : offset + limit]
+        result = {
+            "messages": [{"id": m["id"], "threadId": m["threadId"]} for m in page],
+            "resultSizeEstimate": len(matched),
+        }
+        if offset + limit < len(matched):
+            result["nextPageToken"] = str(offset + limit)
+        return result
+
+    # ---- GitHub ----
+
+    def _github(self, method, path, query, payload, headers) -> Response:
+        response = self._github_route(method, path, query, payload)
+        resource = "graphql" if path == "/graphql" else "core"
+        response.headers.update(
+            {
+                "X-RateLimit-Resource": resource,
+                "X-RateLimit-Limit": "5000",
+                "X-RateLimit-Remaining": "4999",
+                "X-RateLimit-Reset": "4102444800",
+            }
+        )
+        if method == "GET" and response.status == 200:
+            etag = '"' + hashlib.md5(json.dumps(response.body).encode()).hexdigest() + '"'
+            response.headers["ETag"] = etag
+            if headers.get("If-None-Match") == etag:
+                return Response(304, None, response.headers)
+        return response
+
+    def _paginate(self, path: str, query: dict, items: list) -> Response:
+        per_page = _int(query, "per_page", 30)
+        page = _int(query, "page", 1)
+        chunk = items[(page - 1) * per_page : page * per_page]
+        headers = {}
+        if page * per_page < len(items):
+            rest = {k: v[0] for k, v in query.items() if k != "page"}
+            headers["Link"] = f'<{self.url}{path}?{urlencode({**rest, "page": page + 1})}>; rel="next"'
+        return Response(200, chunk, headers)
+
+    def _github_route(self, method, path, query, payload) -> Response:
+        data = self.data
+        if path == "/user":
+            return Response(200, {"login": "octo", "id": 1, "url": "/user"})
+        if path == "/user/repos":
+            return self._paginate(path, query, data.repos)
+        if path == "/notifications":
+            if method == "PUT":
+                return Response(205)
+            items = data.notifications
+            if query.get("all", ["false"])[0] != "true":
+                items = [n for n in items if n["unread"]]
+            return self._paginate(path, query, items)
+        if path == "/graphql":
+            return Response(200, self._graphql(payload))
+
+        match = re.fullmatch(r"/repos/([^/]+)/([^/]+)(/.*)?", path)
+        if not match:
+            return Response(404, {"message": "Not Found"})
+        owner, name, rest = match.groups()
+        repo = {**data.repos[0], "name": name, "full_name": f"{owner}/{name}"}
+        if not rest:
+            return Response(200, repo)
+
+        match = re.fullmatch(r"/(issues|pulls)(?:/(\d+))?(/merge)?", rest)
+        if not match:
+            return Response(404, {"message": "Not Found"})
+        kind, number, merge = match.groups()
+        if merge:
+            return Response(200, {"merged": True, "message": "Pull Request successfully merged", "sha": "abc"})
+        nodes = data.issues if kind == "issues" else data.pulls
+        if number is None:
+            node = {**nodes[0], "number": len(nodes) + 1, "state": "OPEN", "merged": False}
+        else:
+            node = nodes[(len(nodes) - int(number)) % len(nodes)]
+        rest_object = self._rest_issue(node, kind, owner, name)
+        if method in ("POST", "PATCH"):
+            rest_object.update({k: v for k, v in payload.items() if k in ("title", "body", "state")})
+        return Response(201 if method == "POST" else 200, rest_object)
+
+    def _rest_issue(self, node: dict, kind: str, owner: str, name: str) -> dict:
+        number = node["number"]
+        result = {
+            "id": number,
+            "number": number,
+            "title": node["title"],
+            "state": "open" if node["state"] == "OPEN" else "closed",
+            "user": node["author"],
+            "created_at": node["createdAt"].replace("+00:00", "Z"),
+            "labels": [{"name": l["name"]} for l in node["labels"]["nodes"]],
+            "assignees": node.get("assignees", {"nodes": []})["nodes"],
+            "html_url": node["url"],
+            "body": node["body"],
+            "url": f"/repos/{owner}/{name}/{kind}/{number}",
+        }
+        if kind == "pulls":
+            result.update(
+                {
+                    "merged": node["merged"],
+                    "head": {"ref": node["headRefName"]},
+                    "base": {"ref": node["baseRefName"]},
+                    "additions": 120,
+                    "deletions": 30,
+                    "changed_files": 4,
+                }
+            )
+        return result
+
+    def _graphql(self, payload: dict) -> dict:
+        variables = payload["variables"]
+        connection = "pullRequests" if "pullRequests(" in payload["query"] else "issues"
+        nodes = self.data.pulls if connection == "pullRequests" else self.data.issues
+        states = variables.get("states")
+        labels = variables.get("labels")
+        if states:
+            nodes = [n for n in nodes if n["state"] in states]
+        if labels:
+            nodes = [n for n in nodes if any(l["name"] in labels for l in n["labels"]["nodes"])]
+        offset = int(variables.get("after") or 0)
+        page = nodes[offset : offset + variables["first"]]
+        has_next = offset + len(page) < len(nodes)
+        return {
+            "data": {
+                "repository": {
+                    connection: {
+                        "pageInfo": {
+                            "hasNextPage": has_next,
+                            "endCursor": str(offset + len(page)) if has_next else None,
+                        },
+                        "nodes": page,
+                    }
+                }
+            }
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument(
+        "--latency",
+        type=lambda s: {api: float(sec) for api, _, sec in (p.partition("=") for p in s.split(","))},
+        default={},
+        help="API별 요청 지연(초). 예: calendar=0.1,github=0.3",
+    )
+    args = parser.parse_args()
+
+    upstream = FakeUpstream(args.size, args.port, args.latency)
+    print(upstream.url, flush=True)
+    upstream.server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,101 @@
 """GitHub PAT 기반 인증 모듈."""
 
+import functools
 import os
+import threading
+import time
+from typing import TYPE_CHECKING
 
-from github import Github
+from jarvis.utils.ratelimit import get_scheduler, parse_retry_after
 
+if TYPE_CHECKING:
+    from github import Github
 
-def get_github_client() -> Github:
+# 토큰별 클라이언트(=requests 세션과 커넥션 풀)를 스레드마다 하나씩 유지한다.
+# PyGithub의 Requester는 하나의 커넥션 객체에 요청 상태를 저장하므로 스레드 간에 공유할 수 없다.
+_local = threading.local()
+
+_DEFAULT_API_URL = "https://api.github.com"
+
+# 2차 속도 제한에 Retry-After가 없으면 최소 1분 기다리라고 GitHub 문서가 권장한다
+_SECONDARY_LIMIT_WAIT = 60.0
+
+_WRITE_VERBS = ("POST", "PATCH", "PUT", "DELETE")
+
+
+def _is_write(verb: str, url: str) -> bool:
+    """내용을 바꾸는 요청인지 확인한다. GraphQL 조회는 POST지만 읽기다."""
+    return verb in _WRITE_VERBS and not url.split("?", 1)[0].endswith("/graphql")
+
+
+def _record_quota(headers) -> None:
+    """X-RateLimit-* 헤더로 남은 쿼터를 기록한다. 리소스(core, graphql 등)별로 따로 센다."""
+    remaining = headers.get("x-ratelimit-remaining")
+    if remaining is None:
+        return
+    limit = headers.get("x-ratelimit-limit")
+    reset = headers.get("x-ratelimit-reset")
+    get_scheduler("github").update_quota(
+        headers.get("x-ratelimit-resource", "core"),
+        int(limit) if limit else None,
+        int(remaining),
+        float(reset) if reset else None,
+    )
+
+
+def _github_retry_after(verb: str, response) -> float | None:
+    """재시도할 응답이면 대기 시간, 아니면 None. 쿼터 헤더도 여기서 기록한다."""
+    headers = response.headers
+    _record_quota(headers)
+
+    status = response.status
+    if status in (403, 429):
+        retry_after = parse_retry_after(headers.get("retry-after"))
+        if retry_after is not None:
+            return retry_after
+        if headers.get("x-ratelimit-remaining") == "0":
+            # 1차 한도 소진: 초기화 시각까지 기다려야 한다
+            reset = float(headers.get("x-ratelimit-reset") or 0)
+            return max(0.0, reset - time.time())
+        if status == 429 or "secondary rate limit" in response.read().lower():
+            return _SECONDARY_LIMIT_WAIT
+        return None
+    if status >= 500 and verb in ("GET", "HEAD"):
+        return 0.0
+    return None
+
+
+def _content_length(response) -> int:
+    """PyGithub 응답에서 받은 바이트 수를 구한다."""
+    return len(response.response.content or b"")
+
+
+@functools.cache
+def _scheduled_connection_class(secure: bool = True):
+    """모든 GitHub 요청을 스케줄러에 통과시키는 연결 클래스를 만든다."""
+    from github.Requester import HTTPRequestsConnectionClass, HTTPSRequestsConnectionClass
+
+    scheduler = get_scheduler("github")
+    base = HTTPSRequestsConnectionClass if secure else HTTPRequestsConnectionClass
+
+    class _ScheduledConnection(base):
+        def getresponse(self):
+            return scheduler.call(
+                super().getresponse,
+                functools.partial(_github_retry_after, self.verb),
+                size=_content_length,
+                write=_is_write(self.verb, self.url),
+            )
+
+    return _ScheduledConnection
+
+
+def get_github_client() -> "Github":
     """GitHub 클라이언트를 반환한다.
 
     환경변수 GITHUB_TOKEN에서 Personal Access Token을 읽어 인증한다.
+    GitHub Enterprise Server 등 다른 API 주소는 GITHUB_API_URL로 지정한다.
+    같은 스레드에서 같은 토큰·주소에 대해서는 한 번 만든 클라이언트를 재사용한다.
     """
     token = os.getenv("GITHUB_TOKEN")
     if not token:
@@ -17,4 +104,30 @@ def get_github_client() -> Github:
             "GitHub Personal Access Token을 .env 파일에 설정하세요.\n"
             "예: GITHUB_TOKEN=ghp_xxxxxxxxxxxx"
         )
-    return Github(token)
+
+    clients = getattr(_local, "clients", None)
+    if clients is None:
+        clients = _local.clients = {}
+
+    base_url = os.getenv("GITHUB_API_URL") or _DEFAULT_API_URL
+    client = clients.get((token, base_url))
+    if client is None:
+        # PyGithub은 불러오는 데만 수백 ms가 걸리므로 처음 쓸 때 불러온다
+        from github import Auth, Github
+
+        # 재시도와 요청 간격 조절은 스케줄러가 맡으므로 PyGithub 자체 재시도(GithubRetry)와
+        # 요청 사이 대기(기본 0.25초, 쓰기 1초)는 끈다. PyGithub은 GraphQL 조회도 POST라
+        # 매 페이지 1초를 기다리므로, 쓰기 간격은 GraphQL을 뺀 쓰기에만 스케줄러가 적용한다
+        client = clients[(token, base_url)] = Github(
+            auth=Auth.Token(token),
+            base_url=base_url,
+            retry=None,
+            seconds_between_requests=None,
+            seconds_between_writes=None,
+        )
+        # PyGithub에는 인스턴스별로 연결 클래스를 바꾸는 공개 API가 없다.
+        # (Requester.injectConnectionClasses는 전역이고 연결 재사용까지 꺼 버린다)
+        client.requester._Requester__connectionClass = _scheduled_connection_class(
+            base_url.startswith("https://")
+        )
+    return client
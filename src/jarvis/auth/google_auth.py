@@ -1,11 +1,27 @@
 """Google OAuth 2.0 인증 관리 모듈."""
 
+import functools
+import json
+import logging
 import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from functools import partial
 from pathlib import Path
 
-from google.auth.transport.requests import Request
+import httplib2
+from google.auth.exceptions import RefreshError, TransportError
+from google.auth.transport.requests import AuthorizedSession, Request
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import Resource, build_from_document
+from googleapiclient.errors import HttpError
+
+from jarvis.utils.ratelimit import get_scheduler, parse_retry_after
+
+logger = logging.getLogger(__name__)
 
 SCOPES = [
     "https://www.googleapis.com/auth/calendar",
@@ -17,28 +33,267 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 TOKENS_FILE = PROJECT_ROOT / "tokens.json"
 CREDENTIALS_FILE = PROJECT_ROOT / "credentials.json"
 
+# 고정된 discovery 문서 ({api}.{version}.json). 서비스 생성 시 네트워크/디스크 캐시를 쓰지 않는다.
+# 갱신: https://www.googleapis.com/discovery/v1/apis/{api}/{version}/rest 를 받아 교체한다.
+DISCOVERY_DIR = Path(__file__).parent / "discovery"
+
+# 만료 이 시간 전부터 미리 갱신한다
+REFRESH_MARGIN = timedelta(minutes=5)
+
+# 프로세스 전역 자격 증명과 (api, version)별 서비스 객체 레지스트리
+_lock = threading.RLock()
+_credentials: Credentials | None = None
+_services: dict[tuple[str, str], tuple[Credentials, Resource]] = {}
+
+# 토큰 갱신은 한 번에 하나만 진행한다
+_refresh_lock = threading.RLock()
+# 이 시간(초) 안에 갱신한 토큰은 아직 만료가 멀면 다시 갱신하지 않는다
+_RECENT_REFRESH = 30.0
+
+# 5xx 응답을 재시도해도 안전한 메서드
+_IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE"}
+_RETRYABLE_STATUS = {500, 502, 503, 504}
+# 403으로 오는 쿼터 초과 사유
+_RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+
+class _SharedCredentials(Credentials):
+    """여러 스레드가 공유하는 자격 증명.
+
+    get_credentials()뿐 아니라 AuthorizedHttp가 요청 직전/401 응답 후 스스로 갱신할 때도
+    갱신이 한 번만 일어나고(single-flight), 나머지 스레드는 그 결과를 기다렸다가 쓴다.
+    """
+
+    # 마지막 갱신 시각(time.monotonic)
+    _refreshed_at = float("-inf")
+
+    def refresh(self, request):
+        with _refresh_lock:
+            # 잠금을 얻기 전(만료를 확인한 뒤 언제든) 다른 스레드가 이미 갱신했다. 만료가 멀어도
+            # 오래된 토큰이면 401 응답(폐기된 토큰) 후 부른 것이므로 갱신한다.
+            if (
+                not _needs_refresh(self)
+                and time.monotonic() - self._refreshed_at < _RECENT_REFRESH
+            ):
+                return
+            super().refresh(request)
+            self._refreshed_at = time.monotonic()
+            _save_tokens(self)
+
+
+def _needs_refresh(creds) -> bool:
+    """만료되었거나 만료가 REFRESH_MARGIN 안으로 다가왔는지 확인한다."""
+    if creds.expired:
+        return True
+    expiry = getattr(creds, "expiry", None)
+    if expiry is None:
+        return False
+    # google-auth는 expiry를 naive UTC로 다룬다
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return expiry - REFRESH_MARGIN <= now
+
+
+def _shared(creds: Credentials) -> _SharedCredentials:
+    """OAuth 흐름 등에서 받은 자격 증명을 _SharedCredentials로 바꾼다."""
+    if isinstance(creds, _SharedCredentials):
+        return creds
+    return _SharedCredentials.from_authorized_user_info(json.loads(creds.to_json()), SCOPES)
+
+
+def _is_rate_limit_error(content) -> bool:
+    """403 응답 본문이 쿼터 초과 오류인지 확인한다."""
+    try:
+        error = json.loads(content)["error"]
+    except (ValueError, KeyError, TypeError):
+        return False
+    if not isinstance(error, dict):
+        return False
+    return any(e.get("reason") in _RATE_LIMIT_REASONS for e in error.get("errors", []))
+
+
+def _google_retry_after(method: str, result) -> float | None:
+    """재시도할 응답이면 Retry-After 대기 시간(없으면 0), 아니면 None."""
+    response, content = result
+    status = response.status
+    if (
+        status == 429
+        or (status == 403 and _is_rate_limit_error(content))
+        or (status in _RETRYABLE_STATUS and method in _IDEMPOTENT_METHODS)
+    ):
+        return parse_retry_after(response.get("retry-after")) or 0.0
+    return None
+
+
+def batch_part_retry_after(error: HttpError) -> float | None:
+    """배치 안 조회 요청 하나의 오류가 재시도할 오류면 Retry-After 대기 시간(없으면 0), 아니면 None.
+
+    배치 HTTP 요청 자체는 성공(200)하므로 스케줄러가 안쪽 응답의 429·쿼터 초과를 보지 못한다.
+    """
+    return _google_retry_after("GET", (error.resp, error.content))
+
+
+def _request_cost(uri: str, body) -> int:
+    """토큰 버킷에서 가져갈 토큰 수. 배치 요청은 안에 든 요청 수만큼 센다."""
+    if body and "/batch" in uri:
+        marker = b"application/http" if isinstance(body, bytes) else "application/http"
+        return max(1, body.count(marker))
+    return 1
+
+
+def _content_length(result) -> int:
+    """(응답, 본문) 튜플에서 받은 바이트 수를 구한다."""
+    return len(result[1] or b"")
+
+
+class _ThreadLocalHttp:
+    """스레드마다 별도의 AuthorizedHttp를 쓰는 프록시.
+
+    httplib2.Http는 스레드 안전하지 않으므로, 서비스 객체는 공유하되
+    실제 HTTP 연결은 스레드별로 분리한다.
+    모든 요청은 API별 스케줄러(속도·동시성 제한, 재시도)를 거친다.
+    """
+
+    def __init__(self, creds: Credentials, api: str):
+        self._creds = creds
+        self._local = threading.local()
+        self._scheduler = get_scheduler(api)
+
+    def _http(self) -> AuthorizedHttp:
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = AuthorizedHttp(self._creds, http=httplib2.Http())
+            self._local.http = http
+        return http
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        http = self._http()
+        return self._scheduler.call(
+            lambda: http.request(uri, method, body=body, headers=headers, **kwargs),
+            partial(_google_retry_after, method),
+            cost=_request_cost(uri, body),
+            size=_content_length,
+        )
+
+    def __getattr__(self, name):
+        return getattr(self._http(), name)
+
+
+class _StreamStatus:
+    """requests 응답을 _google_retry_after가 읽는 httplib2 응답처럼 보이게 한다."""
+
+    def __init__(self, response):
+        self.status = response.status_code
+        self._headers = response.headers
+
+    def get(self, name: str, default=None):
+        return self._headers.get(name, default)
+
+
+# 스레드별 (자격 증명, 스트리밍용 세션)
+_stream_local = threading.local()
+
+
+def _stream_session() -> AuthorizedSession:
+    creds = get_credentials()
+    cached = getattr(_stream_local, "session", None)
+    if cached is None or cached[0] is not creds:
+        cached = (creds, AuthorizedSession(creds))
+        _stream_local.session = cached
+    return cached[1]
+
+
+def open_stream(api: str, uri: str):
+    """본문을 읽지 않은 채로 GET 응답(requests.Response)을 연다.
+
+    httplib2는 응답 본문을 한 번에 메모리로 읽으므로, 첨부 파일처럼 큰 응답은 이 함수로 열어
+    iter_content()로 조각씩 읽는다. 요청은 API별 스케줄러를 거치고, 오류 응답은 본문까지 읽는다.
+    다 읽은 뒤에는 호출한 쪽이 응답을 닫는다.
+    """
+    session = _stream_session()
+
+    def _retry_after(response) -> float | None:
+        if response.status_code < 400:
+            return None
+        return _google_retry_after("GET", (_StreamStatus(response), response.content))
+
+    return get_scheduler(api).call(
+        lambda: session.get(uri, stream=True),
+        _retry_after,
+        size=lambda response: int(response.headers.get("content-length") or 0),
+    )
+
 
 def get_credentials() -> Credentials:
     """유효한 Google API 자격 증명을 반환한다.
 
-    저장된 토큰이 있으면 로드하고, 만료되었으면 갱신한다.
+    메모리에 캐시된 자격 증명을 우선 사용하고, 없으면 저장된 토큰을 로드한다.
+    만료가 가까우면 같은 객체를 그 자리에서 미리 갱신한다.
     토큰이 없으면 OAuth 인증 흐름을 실행한다.
     """
-    creds = None
+    global _credentials
 
-    if TOKENS_FILE.exists():
-        creds = Credentials.from_authorized_user_file(str(TOKENS_FILE), SCOPES)
+    creds = _credentials
+    if creds is None or not (creds.valid or creds.refresh_token):
+        with _lock:
+            if _credentials is None and TOKENS_FILE.exists():
+                _credentials = _SharedCredentials.from_authorized_user_file(
+                    str(TOKENS_FILE), SCOPES
+                )
+            if _credentials is None or not (_credentials.valid or _credentials.refresh_token):
+                _credentials = _shared(_run_auth_flow())
+                _save_tokens(_credentials)
+            creds = _credentials
 
-    if creds and creds.expired and creds.refresh_token:
+    if not _needs_refresh(creds):
+        return creds
+
+    if not creds.valid:
+        # 만료된 토큰은 쓸 수 없으므로 갱신이 끝날 때까지 기다린다
         creds.refresh(Request())
-        _save_tokens(creds)
-    elif not creds or not creds.valid:
-        creds = _run_auth_flow()
-        _save_tokens(creds)
+    elif _refresh_lock.acquire(blocking=False):
+        # 아직 쓸 수 있는 토큰이면 다른 스레드가 갱신 중일 때 기다리지 않는다
+        try:
+            creds.refresh(Request())
+        except (RefreshError, TransportError):
+            logger.warning("토큰 사전 갱신 실패, 만료 전까지 기존 토큰을 사용합니다.", exc_info=True)
+        finally:
+            _refresh_lock.release()
 
     return creds
 
 
+@functools.cache
+def _discovery_document(api: str, version: str) -> dict:
+    """번들된 discovery 문서를 읽는다. 프로세스당 한 번만 파싱한다."""
+    path = DISCOVERY_DIR / f"{api}.{version}.json"
+    if not path.exists():
+        raise ValueError(f"번들된 discovery 문서가 없습니다: {api} {version}")
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def get_service(api: str, version: str) -> Resource:
+    """Google API 서비스 객체를 반환한다.
+
+    번들된 discovery 문서로 빌드하므로 네트워크 요청이 없다.
+    서비스는 자격 증명당 한 번만 빌드해 재사용한다.
+    자격 증명이 교체되면(재인증 등) 새로 빌드한다.
+    HTTP 연결은 스레드별로 분리되므로 여러 스레드에서 동시에 써도 안전하다.
+    """
+    creds = get_credentials()
+    key = (api, version)
+
+    with _lock:
+        cached = _services.get(key)
+        if cached and cached[0] is creds:
+            return cached[1]
+
+        service = build_from_document(
+            _discovery_document(api, version), http=_ThreadLocalHttp(creds, api)
+        )
+        _services[key] = (creds, service)
+        return service
+
+
 def _get_credentials_file() -> Path:
     """credentials.json 파일 경로를 반환한다."""
     env_path = os.getenv("GOOGLE_CREDENTIALS_FILE")
@@ -60,14 +315,36 @@ def _run_auth_flow() -> Credentials:
             "자세한 방법: docs/05-설정가이드.md"
         )
 
+    # 최초 인증에만 필요하므로 이때 불러온다
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
     flow = InstalledAppFlow.from_client_secrets_file(str(credentials_file), SCOPES)
     creds = flow.run_local_server(port=0)
     return creds
 
 
 def _save_tokens(creds: Credentials) -> None:
-    """토큰을 파일에 저장한다."""
-    TOKENS_FILE.write_text(creds.to_json())
+    """토큰이 바뀌었을 때만 파일에 원자적으로 저장한다.
+
+    임시 파일에 쓴 뒤 교체하므로 저장 도중 종료되어도 기존 토큰 파일이 깨지지 않는다.
+    """
+    data = creds.to_json()
+    try:
+        if TOKENS_FILE.read_text() == data:
+            return
+    except FileNotFoundError:
+        pass
+
+    fd, tmp_path = tempfile.mkstemp(dir=TOKENS_FILE.parent, prefix=".tokens-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, TOKENS_FILE)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
 
 def authenticate():
@@ -8,15 +8,19 @@ load_dotenv(Path(__file__).resolve().parents[2] / ".env")
 
 from fastmcp import FastMCP
 
+from jarvis.tools.briefing import register_briefing_tools
 from jarvis.tools.calendar import register_calendar_tools
 from jarvis.tools.gmail import register_gmail_tools
 from jarvis.tools.github import register_github_tools
+from jarvis.tools.metrics import register_metrics_resources
 
 mcp = FastMCP("Jarvis")
 
 register_calendar_tools(mcp)
 register_gmail_tools(mcp)
 register_github_tools(mcp)
+register_briefing_tools(mcp)
+register_metrics_resources(mcp)
 
 
 def main():
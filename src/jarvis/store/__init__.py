@@ -0,0 +1 @@
+"""로컬 SQLite 저장소 모듈."""
@@ -0,0 +1,379 @@
+"""Google Calendar 로컬 이벤트 저장소.
+
+캘린더별로 최초 1회 전체 동기화(백그라운드 스레드) 후 events.list의 syncToken으로 변경분만 반영한다.
+반복 일정은 원본(recurrence)과 예외 회차만 저장하고, 조회 시 로컬에서 인스턴스로 전개한다.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from googleapiclient.errors import HttpError
+
+from jarvis.store.db import connect
+from jarvis.store.recurrence import event_timestamp, expand, recurrence_end
+from jarvis.utils.fields import EVENT_SYNC_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# 저장소가 이 시간(초) 안에 동기화되었으면 API를 호출하지 않는다
+STORE_TTL = float(os.getenv("JARVIS_CALENDAR_STORE_TTL", "60"))
+
+# events.list 페이지 크기 최대값
+_PAGE_SIZE = 2500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calendar_events (
+    calendar_id TEXT,
+    id TEXT,
+    status TEXT,
+    recurring INTEGER,          -- 1이면 recurrence를 가진 반복 일정 원본
+    recurring_event_id TEXT,    -- 예외 회차면 원본 ID
+    original_start_ts REAL,     -- 예외 회차의 원래 시작 시각
+    start_ts REAL,
+    end_ts REAL,                -- 반복 일정 원본은 마지막 회차 종료 시각, 끝이 없으면 NULL
+    data TEXT,
+    PRIMARY KEY (calendar_id, id)
+);
+CREATE INDEX IF NOT EXISTS calendar_events_start
+    ON calendar_events (calendar_id, start_ts);
+CREATE INDEX IF NOT EXISTS calendar_events_recurring
+    ON calendar_events (calendar_id, recurring_event_id);
+CREATE TABLE IF NOT EXISTS calendar_state (
+    calendar_id TEXT PRIMARY KEY,
+    sync_token TEXT,
+    time_zone TEXT,
+    synced_at REAL
+);
+"""
+
+
+def _zone(name: str | None) -> ZoneInfo:
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+def _matches(event: dict, terms: list[str]) -> bool:
+    """검색어가 모두 제목/설명/장소/참석자 중 어딘가에 있는지 확인한다."""
+    text = " ".join(
+        [
+            event.get("summary", ""),
+            event.get("description", ""),
+            event.get("location", ""),
+            *(a.get("email", "") for a in event.get("attendees", [])),
+        ]
+    ).lower()
+    return all(term in text for term in terms)
+
+
+class CalendarStore:
+    """캘린더 이벤트를 SQLite에 보관하는 저장소."""
+
+    def __init__(self, path=None):
+        self._conn = connect(path)
+        self._lock = threading.RLock()
+        # 캘린더별 동기화 잠금. 같은 캘린더의 동기화만 줄 세우고, 여러 캘린더는 동시에 동기화한다
+        self._sync_locks: dict[str, threading.Lock] = {}
+        self._sync_locks_guard = threading.Lock()
+        # 캘린더별 최초 전체 동기화 스레드
+        self._initial_syncs: dict[str, threading.Thread] = {}
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    # --- 상태 ---
+
+    def _state(self, calendar_id: str):
+        return self._conn.execute(
+            "SELECT * FROM calendar_state WHERE calendar_id = ?", (calendar_id,)
+        ).fetchone()
+
+    def sync_token(self, calendar_id: str) -> str | None:
+        with self._lock:
+            state = self._state(calendar_id)
+            return state["sync_token"] if state else None
+
+    def is_fresh(self, calendar_id: str) -> bool:
+        with self._lock:
+            state = self._state(calendar_id)
+        return (
+            state is not None
+            and state["sync_token"] is not None
+            and time.time() - state["synced_at"] < STORE_TTL
+        )
+
+    def invalidate(self, calendar_id: str) -> None:
+        """다음 조회 때 변경분 동기화를 강제한다."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE calendar_state SET synced_at = 0 WHERE calendar_id = ?", (calendar_id,)
+            )
+
+    # --- 쓰기 ---
+
+    def _upsert(self, calendar_id: str, event: dict, tz: ZoneInfo) -> None:
+        recurring = bool(event.get("recurrence"))
+        original = event.get("originalStartTime")
+        start_ts = end_ts = None
+        if "start" in event:
+            start_ts = event_timestamp(event["start"], tz)
+            if recurring:
+                end_ts = recurrence_end(event, tz)
+            else:
+                end_ts = event_timestamp(event["end"], tz)
+
+        self._conn.execute(
+            "INSERT OR REPLACE INTO calendar_events "
+            "(calendar_id, id, status, recurring, recurring_event_id, original_start_ts, "
+            " start_ts, end_ts, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                calendar_id,
+                event["id"],
+                event.get("status", "confirmed"),
+                int(recurring),
+                event.get("recurringEventId"),
+                event_timestamp(original, tz) if original else None,
+                start_ts,
+                end_ts,
+                json.dumps(event, ensure_ascii=False),
+            ),
+        )
+
+    def _delete(self, calendar_id: str, event_id: str) -> None:
+        # 반복 일정 원본이 지워지면 예외 회차도 함께 지운다
+        self._conn.execute(
+            "DELETE FROM calendar_events "
+            "WHERE calendar_id = ? AND (id = ? OR recurring_event_id = ?)",
+            (calendar_id, event_id, event_id),
+        )
+
+    def apply_changes(
+        self,
+        calendar_id: str,
+        events: list[dict],
+        sync_token: str,
+        time_zone: str | None,
+        full: bool = False,
+    ) -> None:
+        """events.list로 받은 변경분을 반영한다. full이면 기존 이벤트를 모두 교체한다."""
+        tz = _zone(time_zone)
+        with self._lock, self._conn:
+            if full:
+                self._conn.execute(
+                    "DELETE FROM calendar_events WHERE calendar_id = ?", (calendar_id,)
+                )
+            for event in events:
+                # 취소된 예외 회차는 해당 회차를 숨기기 위해 남겨 둔다
+                if event.get("status") == "cancelled" and not event.get("recurringEventId"):
+                    self._delete(calendar_id, event["id"])
+                    continue
+                try:
+                    self._upsert(calendar_id, event, tz)
+                except ValueError:
+                    # 해석할 수 없는 반복 규칙 하나 때문에 동기화 전체를 멈추지 않는다
+                    logger.warning(
+                        "Calendar 일정 %s의 반복 규칙을 해석할 수 없어 저장소에서 뺍니다: %s",
+                        event["id"],
+                        event.get("recurrence"),
+                        exc_info=True,
+                    )
+                    self._conn.execute(
+                        "DELETE FROM calendar_events WHERE calendar_id = ? AND id = ?",
+                        (calendar_id, event["id"]),
+                    )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO calendar_state "
+                "(calendar_id, sync_token, time_zone, synced_at) VALUES (?, ?, ?, ?)",
+                (calendar_id, sync_token, tz.key, time.time()),
+            )
+
+    def clear(self, calendar_id: str) -> None:
+        """캘린더의 이벤트와 syncToken을 지운다."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM calendar_events WHERE calendar_id = ?", (calendar_id,))
+            self._conn.execute("DELETE FROM calendar_state WHERE calendar_id = ?", (calendar_id,))
+
+    # --- 조회 ---
+
+    def list_events(
+        self,
+        calendar_id: str,
+        time_min: float,
+        time_max: float,
+        max_results: int,
+        query: str | None = None,
+        offset: int = 0,
+    ) -> list[dict] | None:
+        """기간과 겹치는 일정을 시작 시각 순으로 앞에서 offset개를 건너뛰고 반환한다. 동기화 전이면 None.
+
+        events.list(singleEvents=True, orderBy="startTime")와 같은 결과를 만든다.
+        """
+        terms = query.lower().split() if query else []
+
+        with self._lock:
+            state = self._state(calendar_id)
+            if state is None or state["sync_token"] is None:
+                return None
+            tz = _zone(state["time_zone"])
+
+            singles = self._conn.execute(
+                "SELECT start_ts, data FROM calendar_events "
+                "WHERE calendar_id = ? AND recurring = 0 AND status != 'cancelled' "
+                "AND start_ts < ? AND end_ts > ?",
+                (calendar_id, time_max, time_min),
+            ).fetchall()
+            masters = self._conn.execute(
+                "SELECT id, data FROM calendar_events "
+                "WHERE calendar_id = ? AND recurring = 1 AND status != 'cancelled' "
+                "AND start_ts < ? AND (end_ts IS NULL OR end_ts > ?)",
+                (calendar_id, time_max, time_min),
+            ).fetchall()
+            overrides: dict[str, set[float]] = {}
+            if masters:
+                placeholders = ", ".join("?" for _ in masters)
+                for row in self._conn.execute(
+                    "SELECT recurring_event_id, original_start_ts FROM calendar_events "
+                    f"WHERE calendar_id = ? AND recurring_event_id IN ({placeholders})",
+                    (calendar_id, *(m["id"] for m in masters)),
+                ):
+                    overrides.setdefault(row["recurring_event_id"], set()).add(
+                        row["original_start_ts"]
+                    )
+
+        events = []
+        for row in singles:
+            event = json.loads(row["data"])
+            if _matches(event, terms):
+                events.append((row["start_ts"], event))
+        for row in masters:
+            master = json.loads(row["data"])
+            # 인스턴스는 원본의 제목/설명을 그대로 가지므로 전개 전에 걸러낸다
+            if not _matches(master, terms):
+                continue
+            for instance in expand(master, tz, time_min, time_max, overrides.get(row["id"], set())):
+                events.append((event_timestamp(instance["start"], tz), instance))
+
+        events.sort(key=lambda item: item[0])
+        return [event for _, event in events[offset : offset + max_results]]
+
+    # --- 동기화 ---
+
+    def _sync_lock(self, calendar_id: str) -> threading.Lock:
+        with self._sync_locks_guard:
+            lock = self._sync_locks.get(calendar_id)
+            if lock is None:
+                lock = self._sync_locks[calendar_id] = threading.Lock()
+            return lock
+
+    def sync(self, service, calendar_id: str) -> None:
+        """변경분을 동기화한다. syncToken이 없거나 만료(410)되었으면 전체 동기화한다."""
+        with self._sync_lock(calendar_id):
+            sync_token = self.sync_token(calendar_id)
+            try:
+                self._sync(service, calendar_id, sync_token)
+            except HttpError as e:
+                if sync_token is None or e.resp.status != 410:
+                    raise
+                logger.info("Calendar syncToken 만료(%s), 전체 동기화를 수행합니다.", calendar_id)
+                self.clear(calendar_id)
+                self._sync(service, calendar_id, None)
+
+    def ensure_fresh(self, service, calendar_id: str) -> bool:
+        """필요하면 동기화하고, 저장소를 조회에 써도 되는지 반환한다.
+
+        아직 동기화하지 않은 캘린더는 전체 동기화를 백그라운드에서 시작하고, 끝날 때까지는 False를
+        반환해 API로 조회하게 한다. 변경분 동기화는 가벼우므로 호출한 스레드에서 한다.
+        """
+        if self.is_fresh(calendar_id):
+            return True
+        if self.sync_token(calendar_id) is None:
+            self._start_initial_sync(service, calendar_id)
+            return False
+        try:
+            self.sync(service, calendar_id)
+        except (HttpError, OSError, ValueError, sqlite3.Error):
+            logger.exception("Calendar 저장소 동기화 실패, API로 조회합니다.")
+            return False
+        return True
+
+    def _start_initial_sync(self, service, calendar_id: str) -> None:
+        """캘린더의 최초 전체 동기화 스레드를 띄운다. 이미 돌고 있으면 아무것도 하지 않는다."""
+        with self._sync_locks_guard:
+            thread = self._initial_syncs.get(calendar_id)
+            if thread is not None and thread.is_alive():
+                return
+            thread = self._initial_syncs[calendar_id] = threading.Thread(
+                target=self._run_initial_sync,
+                args=(service, calendar_id),
+                name=f"jarvis-calendar-store-{calendar_id}",
+                daemon=True,
+            )
+            thread.start()
+
+    def _run_initial_sync(self, service, calendar_id: str) -> None:
+        try:
+            self.sync(service, calendar_id)
+        except Exception:
+            # syncToken이 비어 있으므로 다음 조회 때 다시 시도한다
+            logger.exception(
+                "Calendar 저장소 최초 동기화 실패(%s), 다음 조회 때 다시 시도합니다.", calendar_id
+            )
+        else:
+            logger.info("Calendar 저장소 최초 동기화 완료(%s)", calendar_id)
+
+    def _sync(self, service, calendar_id: str, sync_token: str | None) -> None:
+        events: list[dict] = []
+        time_zone = None
+        page_token = None
+
+        while True:
+            params = {
+                "calendarId": calendar_id,
+                "singleEvents": False,
+                "maxResults": _PAGE_SIZE,
+                "pageToken": page_token,
+                "fields": EVENT_SYNC_FIELDS,
+            }
+            # syncToken은 timeMin 등 다른 필터와 함께 쓸 수 없다
+            if sync_token:
+                params["syncToken"] = sync_token
+            result = service.events().list(**params).execute()
+
+            events.extend(result.get("items", []))
+            time_zone = result.get("timeZone", time_zone)
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                break
+
+        # 변경분 응답에는 timeZone이 빠질 수 있으므로 저장된 값을 유지한다
+        if time_zone is None:
+            with self._lock:
+                state = self._state(calendar_id)
+            time_zone = state["time_zone"] if state else None
+
+        self.apply_changes(
+            calendar_id, events, result["nextSyncToken"], time_zone, full=sync_token is None
+        )
+
+
+_store: CalendarStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> CalendarStore | None:
+    """설정에서 저장소가 켜져 있으면 프로세스 전역 저장소를 반환한다."""
+    global _store
+
+    if os.getenv("JARVIS_CALENDAR_STORE", "").lower() not in ("1", "true", "yes"):
+        return None
+
+    with _store_lock:
+        if _store is None:
+            _store = CalendarStore()
+        return _store
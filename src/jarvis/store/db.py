@@ -0,0 +1,32 @@
+"""로컬 SQLite 데이터베이스 연결 관리."""
+
+import os
+import sqlite3
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+DB_FILE = PROJECT_ROOT / "jarvis.db"
+
+
+def get_db_path() -> Path:
+    """데이터베이스 파일 경로를 반환한다."""
+    env_path = os.getenv("JARVIS_DB_FILE")
+    if env_path:
+        path = Path(env_path)
+        if not path.is_absolute():
+            path = PROJECT_ROOT / path
+        return path
+    return DB_FILE
+
+
+def connect(path: Path | str | None = None) -> sqlite3.Connection:
+    """SQLite 연결을 연다.
+
+    도구가 스레드 풀에서 실행되므로 스레드 간 공유를 허용한다.
+    동시 접근은 각 저장소가 자체 락으로 직렬화한다.
+    """
+    conn = sqlite3.connect(str(path or get_db_path()), check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
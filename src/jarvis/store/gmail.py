@@ -0,0 +1,471 @@
+"""Gmail 로컬 미러.
+
+최초 1회 전체 동기화(백그라운드 스레드) 후 users.history.list로 변경분만 반영한다.
+목록 도구는 미러가 최신이면 API 대신 미러에서 바로 답한다.
+제목/보낸 사람/미리보기/본문은 FTS5로 색인해 검색도 로컬에서 처리한다.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+
+from googleapiclient.errors import HttpError
+
+from jarvis.store.db import connect
+from jarvis.store.gmail_query import GmailQuery, to_fts_match
+from jarvis.utils.mime import ParsedMessage
+
+logger = logging.getLogger(__name__)
+
+# 미러가 이 시간(초) 안에 동기화되었으면 API를 호출하지 않는다
+MIRROR_TTL = float(os.getenv("JARVIS_GMAIL_MIRROR_TTL", "60"))
+# 최초 동기화 시 가져올 최근 메일 수
+MIRROR_LIMIT = int(os.getenv("JARVIS_GMAIL_MIRROR_LIMIT", "2000"))
+
+# 전체 동기화는 스팸/휴지통을 제외하므로 이 라벨은 미러에서 답하지 않는다
+_UNMIRRORED_LABELS = {"SPAM", "TRASH"}
+# 나중에 휴지통/스팸으로 옮겨진 메일은 미러에 남지만, API(includeSpamTrash=false)처럼 결과에서 뺀다
+_NOT_SPAM_OR_TRASH = (
+    "NOT EXISTS (SELECT 1 FROM gmail_labels h "
+    "WHERE h.message_id = m.id AND h.label_id IN ('SPAM', 'TRASH'))"
+)
+
+# 색인할 본문 최대 크기(바이트). 이보다 뒤는 디코딩하지 않는다
+_BODY_INDEX_LIMIT = 64 * 1024
+
+# 스키마가 바뀌면 올린다. 버전이 다르면 미러를 비우고 전체 동기화한다.
+_SCHEMA_VERSION = "2"
+
+_HISTORY_TYPES = ["messageAdded", "messageDeleted", "labelAdded", "labelRemoved"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS gmail_messages (
+    id TEXT PRIMARY KEY,
+    thread_id TEXT,
+    internal_date INTEGER,
+    subject TEXT,
+    sender TEXT,
+    date TEXT,
+    snippet TEXT
+);
+CREATE INDEX IF NOT EXISTS gmail_messages_internal_date
+    ON gmail_messages (internal_date DESC);
+CREATE TABLE IF NOT EXISTS gmail_labels (
+    label_id TEXT,
+    message_id TEXT,
+    PRIMARY KEY (label_id, message_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS gmail_labels_message ON gmail_labels (message_id);
+CREATE TABLE IF NOT EXISTS gmail_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS gmail_fts USING fts5(
+    subject, sender, snippet, body,
+    tokenize = 'unicode61'
+);
+"""
+
+FetchMetadata = Callable[[list[str]], list[dict]]
+
+
+def _to_message(row) -> dict:
+    """미러 행을 format_message_list가 읽는 메타데이터 형태로 복원한다."""
+    return {
+        "id": row["id"],
+        "threadId": row["thread_id"],
+        "snippet": row["snippet"],
+        "payload": {
+            "headers": [
+                {"name": "Subject", "value": row["subject"]},
+                {"name": "From", "value": row["sender"]},
+                {"name": "Date", "value": row["date"]},
+            ]
+        },
+    }
+
+
+class GmailMirror:
+    """Gmail 메타데이터를 SQLite에 보관하는 미러."""
+
+    def __init__(self, path=None):
+        self._conn = connect(path)
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._background_sync: threading.Thread | None = None
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+            if self._get_state("schema_version") != _SCHEMA_VERSION:
+                self._conn.execute("DELETE FROM gmail_messages")
+                self._conn.execute("DELETE FROM gmail_labels")
+                self._conn.execute("DELETE FROM gmail_fts")
+                self._conn.execute("DELETE FROM gmail_state")
+                self._set_state("schema_version", _SCHEMA_VERSION)
+
+    # --- 상태 ---
+
+    def _get_state(self, key: str) -> str | None:
+        row = self._conn.execute(
+            "SELECT value FROM gmail_state WHERE key = ?", (key,)
+        ).fetchone()
+        return row["value"] if row else None
+
+    def _set_state(self, key: str, value) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO gmail_state (key, value) VALUES (?, ?)",
+            (key, str(value)),
+        )
+
+    @property
+    def history_id(self) -> str | None:
+        with self._lock:
+            return self._get_state("history_id")
+
+    @property
+    def synced_at(self) -> float:
+        with self._lock:
+            return float(self._get_state("synced_at") or 0)
+
+    @property
+    def complete(self) -> bool:
+        """최초 동기화에서 메일함 전체를 가져왔는지 여부."""
+        with self._lock:
+            return self._get_state("complete") == "1"
+
+    def is_fresh(self) -> bool:
+        return self.history_id is not None and time.time() - self.synced_at < MIRROR_TTL
+
+    def invalidate(self) -> None:
+        """다음 조회 때 변경분 동기화를 강제한다."""
+        with self._lock, self._conn:
+            self._set_state("synced_at", 0)
+
+    # --- 쓰기 ---
+
+    def _upsert(self, messages: list[dict]) -> None:
+        for msg in messages:
+            parsed = ParsedMessage(msg)
+            subject = parsed.header("Subject")
+            sender = parsed.header("From")
+            snippet = msg.get("snippet", "")
+            # rowid를 유지해야 FTS 행과 연결이 끊기지 않으므로 REPLACE 대신 UPSERT를 쓴다
+            self._conn.execute(
+                "INSERT INTO gmail_messages "
+                "(id, thread_id, internal_date, subject, sender, date, snippet) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET "
+                "thread_id = excluded.thread_id, internal_date = excluded.internal_date, "
+                "subject = excluded.subject, sender = excluded.sender, "
+                "date = excluded.date, snippet = excluded.snippet",
+                (
+                    msg["id"],
+                    msg.get("threadId", ""),
+                    int(msg.get("internalDate", 0)),
+                    subject,
+                    sender,
+                    parsed.header("Date"),
+                    snippet,
+                ),
+            )
+            (rowid,) = self._conn.execute(
+                "SELECT rowid FROM gmail_messages WHERE id = ?", (msg["id"],)
+            ).fetchone()
+            body = parsed.body(_BODY_INDEX_LIMIT)
+            self._conn.execute("DELETE FROM gmail_fts WHERE rowid = ?", (rowid,))
+            self._conn.execute(
+                "INSERT INTO gmail_fts (rowid, subject, sender, snippet, body) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (rowid, subject, sender, snippet, body),
+            )
+            self._set_labels(msg["id"], msg.get("labelIds", []))
+
+    def _set_labels(self, message_id: str, label_ids: list[str]) -> None:
+        self._conn.execute("DELETE FROM gmail_labels WHERE message_id = ?", (message_id,))
+        self._conn.executemany(
+            "INSERT INTO gmail_labels (label_id, message_id) VALUES (?, ?)",
+            [(label_id, message_id) for label_id in label_ids],
+        )
+
+    def _delete(self, message_ids) -> None:
+        for message_id in message_ids:
+            self._conn.execute(
+                "DELETE FROM gmail_fts WHERE rowid = "
+                "(SELECT rowid FROM gmail_messages WHERE id = ?)",
+                (message_id,),
+            )
+            self._conn.execute("DELETE FROM gmail_messages WHERE id = ?", (message_id,))
+            self._conn.execute("DELETE FROM gmail_labels WHERE message_id = ?", (message_id,))
+
+    def replace_all(self, messages: list[dict], history_id: str, complete: bool) -> None:
+        """전체 동기화 결과로 미러를 교체한다."""
+        # 일부만 가져왔다면 가장 오래된 메일 이후 구간만 빠짐없이 담고 있다
+        floor = 0
+        if messages and not complete:
+            floor = min(int(m.get("internalDate", 0)) for m in messages)
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM gmail_messages")
+            self._conn.execute("DELETE FROM gmail_labels")
+            self._conn.execute("DELETE FROM gmail_fts")
+            self._upsert(messages)
+            self._set_state("history_id", history_id)
+            self._set_state("complete", "1" if complete else "0")
+            self._set_state("floor", floor)
+            self._set_state("synced_at", time.time())
+
+    def apply_changes(
+        self,
+        added: list[dict],
+        deleted: set[str],
+        labels: dict[str, list[str]],
+        history_id: str,
+    ) -> None:
+        """history.list로 받은 변경분을 반영한다."""
+        with self._lock, self._conn:
+            self._upsert(added)
+            self._delete(deleted)
+            for message_id, label_ids in labels.items():
+                exists = self._conn.execute(
+                    "SELECT 1 FROM gmail_messages WHERE id = ?", (message_id,)
+                ).fetchone()
+                # 미러 범위 밖의 오래된 메일은 무시한다
+                if exists:
+                    self._set_labels(message_id, label_ids)
+            self._set_state("history_id", history_id)
+            self._set_state("synced_at", time.time())
+
+    # --- 조회 ---
+
+    def list_messages(
+        self, label_ids: list[str], max_results: int, offset: int = 0
+    ) -> list[dict] | None:
+        """라벨을 모두 가진 최근 메일을 앞에서 offset개를 건너뛰고 반환한다. 미러로 답할 수 없으면 None."""
+        if _UNMIRRORED_LABELS.intersection(label_ids):
+            return None
+
+        placeholders = ", ".join("?" for _ in label_ids)
+        with self._lock:
+            complete = self.complete
+            floor = int(self._get_state("floor") or 0)
+            # 동기화 구간 밖에서 따로 추가된 메일은 목록에 섞지 않는다
+            rows = self._conn.execute(
+                "SELECT m.* FROM gmail_messages m WHERE m.internal_date >= ? AND m.id IN ("
+                f"  SELECT message_id FROM gmail_labels WHERE label_id IN ({placeholders})"
+                "   GROUP BY message_id HAVING COUNT(*) = ?"
+                f") AND {_NOT_SPAM_OR_TRASH} ORDER BY m.internal_date DESC LIMIT ? OFFSET ?",
+                (floor, *label_ids, len(set(label_ids)), max_results, offset),
+            ).fetchall()
+
+        # 미러가 최근 일부만 담고 있으면 부족한 결과를 API로 보충해야 한다
+        if len(rows) < max_results and not complete:
+            return None
+
+        return [_to_message(row) for row in rows]
+
+    def search(self, query: GmailQuery, max_results: int, offset: int = 0) -> list[dict] | None:
+        """검색 조건에 맞는 최근 메일을 앞에서 offset개를 건너뛰고 반환한다. 미러로 답할 수 없으면 None."""
+        # in:trash / in:spam 검색은 파서가 API로 넘기므로 여기서는 항상 뺀다
+        conditions = ["m.internal_date >= ?", _NOT_SPAM_OR_TRASH]
+        params: list = []
+
+        match = to_fts_match(query)
+        if match:
+            conditions.append("m.rowid IN (SELECT rowid FROM gmail_fts WHERE gmail_fts MATCH ?)")
+            params.append(match)
+        if query.after is not None:
+            conditions.append("m.internal_date >= ?")
+            params.append(query.after)
+        if query.before is not None:
+            conditions.append("m.internal_date < ?")
+            params.append(query.before)
+        if query.unread:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM gmail_labels l "
+                "WHERE l.label_id = 'UNREAD' AND l.message_id = m.id)"
+            )
+
+        with self._lock:
+            complete = self.complete
+            floor = int(self._get_state("floor") or 0)
+            rows = self._conn.execute(
+                f"SELECT m.* FROM gmail_messages m WHERE {' AND '.join(conditions)} "
+                "ORDER BY m.internal_date DESC LIMIT ? OFFSET ?",
+                (floor, *params, max_results, offset),
+            ).fetchall()
+
+        # 미러 범위 밖에 더 최근이 아닌 결과가 남아 있을 수 있다
+        if len(rows) < max_results and not complete:
+            return None
+
+        return [_to_message(row) for row in rows]
+
+    def get_messages(self, message_ids: list[str]) -> dict[str, dict]:
+        """미러에 있는 메일만 ID → 메타데이터로 반환한다."""
+        if not message_ids:
+            return {}
+        placeholders = ", ".join("?" for _ in message_ids)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM gmail_messages WHERE id IN ({placeholders})",
+                message_ids,
+            ).fetchall()
+        return {row["id"]: _to_message(row) for row in rows}
+
+    def add_messages(self, messages: list[dict]) -> None:
+        """API에서 받은 메타데이터를 미러에 추가한다."""
+        with self._lock, self._conn:
+            self._upsert(messages)
+
+    # --- 동기화 ---
+
+    def sync(self, service, fetch_metadata: FetchMetadata) -> None:
+        """변경분을 동기화한다. historyId가 없으면 전체 동기화한다.
+
+        historyId가 만료되었으면 historyId를 지우고 전체 동기화를 백그라운드에서 시작한다.
+        """
+        with self._sync_lock:
+            # 잠금을 기다리는 동안 다른 스레드가 이미 동기화했다
+            if self.is_fresh():
+                return
+            history_id = self.history_id
+            if history_id is None:
+                self._full_sync(service, fetch_metadata)
+                return
+            try:
+                self._incremental_sync(service, fetch_metadata, history_id)
+            except HttpError as e:
+                # startHistoryId가 너무 오래되면 404가 온다
+                if e.resp.status != 404:
+                    raise
+                logger.info("Gmail historyId 만료, 전체 동기화를 백그라운드에서 다시 합니다.")
+                with self._lock, self._conn:
+                    self._conn.execute("DELETE FROM gmail_state WHERE key = 'history_id'")
+                self._start_background_sync(service, fetch_metadata)
+
+    def ensure_fresh(self, service, fetch_metadata: FetchMetadata) -> bool:
+        """필요하면 동기화하고, 미러를 조회에 써도 되는지 반환한다.
+
+        아직 한 번도 동기화하지 않았거나 historyId가 만료되었으면 전체 동기화를 백그라운드에서
+        시작하고, 끝날 때까지는 False를 반환해 API로 조회하게 한다. 변경분 동기화는 가벼우므로
+        호출한 스레드에서 한다.
+        """
+        if self.is_fresh():
+            return True
+        if self.history_id is None:
+            self._start_background_sync(service, fetch_metadata)
+            return False
+        try:
+            self.sync(service, fetch_metadata)
+        except (HttpError, OSError):
+            logger.exception("Gmail 미러 동기화 실패, API로 조회합니다.")
+            return False
+        # historyId가 만료되어 전체 동기화를 다시 시작했으면 끝날 때까지 API로 조회한다
+        return self.history_id is not None
+
+    def _start_background_sync(self, service, fetch_metadata: FetchMetadata) -> None:
+        """전체 동기화 스레드를 띄운다. 이미 돌고 있으면 아무것도 하지 않는다."""
+        with self._lock:
+            if self._background_sync is not None and self._background_sync.is_alive():
+                return
+            self._background_sync = threading.Thread(
+                target=self._run_background_sync,
+                args=(service, fetch_metadata),
+                name="jarvis-gmail-mirror",
+                daemon=True,
+            )
+            self._background_sync.start()
+
+    def _run_background_sync(self, service, fetch_metadata: FetchMetadata) -> None:
+        try:
+            self.sync(service, fetch_metadata)
+        except Exception:
+            # history_id가 비어 있으므로 다음 조회 때 다시 시도한다
+            logger.exception("Gmail 미러 전체 동기화 실패, 다음 조회 때 다시 시도합니다.")
+        else:
+            logger.info("Gmail 미러 전체 동기화 완료")
+
+    def _full_sync(self, service, fetch_metadata: FetchMetadata) -> None:
+        # 목록 조회 중 도착한 변경분도 다음 동기화에서 반영되도록 historyId를 먼저 기록한다
+        profile = service.users().getProfile(userId="me").execute()
+
+        message_ids: list[str] = []
+        page_token = None
+        while len(message_ids) < MIRROR_LIMIT:
+            result = (
+                service.users()
+                .messages()
+                .list(
+                    userId="me",
+                    maxResults=min(500, MIRROR_LIMIT - len(message_ids)),
+                    pageToken=page_token,
+                    fields="messages/id,nextPageToken",
+                )
+                .execute()
+            )
+            message_ids.extend(m["id"] for m in result.get("messages", []))
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                break
+
+        messages = fetch_metadata(message_ids)
+        self.replace_all(messages, profile["historyId"], complete=page_token is None)
+
+    def _incremental_sync(self, service, fetch_metadata: FetchMetadata, history_id: str) -> None:
+        added: set[str] = set()
+        deleted: set[str] = set()
+        labels: dict[str, list[str]] = {}
+        latest = history_id
+        page_token = None
+
+        while True:
+            result = (
+                service.users()
+                .history()
+                .list(
+                    userId="me",
+                    startHistoryId=history_id,
+                    historyTypes=_HISTORY_TYPES,
+                    pageToken=page_token,
+                )
+                .execute()
+            )
+            for record in result.get("history", []):
+                for item in record.get("messagesAdded", []):
+                    added.add(item["message"]["id"])
+                    deleted.discard(item["message"]["id"])
+                for item in record.get("messagesDeleted", []):
+                    deleted.add(item["message"]["id"])
+                    added.discard(item["message"]["id"])
+                for key in ("labelsAdded", "labelsRemoved"):
+                    for item in record.get(key, []):
+                        message = item["message"]
+                        labels[message["id"]] = message.get("labelIds", [])
+
+            latest = result.get("historyId", latest)
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                break
+
+        new_messages = fetch_metadata(sorted(added)) if added else []
+        for message_id in added:
+            labels.pop(message_id, None)
+        self.apply_changes(new_messages, deleted, labels, latest)
+
+
+_mirror: GmailMirror | None = None
+_mirror_lock = threading.Lock()
+
+
+def get_mirror() -> GmailMirror | None:
+    """설정에서 미러가 켜져 있으면 프로세스 전역 미러를 반환한다."""
+    global _mirror
+
+    if os.getenv("JARVIS_GMAIL_MIRROR", "").lower() not in ("1", "true", "yes"):
+        return None
+
+    with _mirror_lock:
+        if _mirror is None:
+            _mirror = GmailMirror()
+        return _mirror
@@ -0,0 +1,86 @@
+"""Gmail 검색 문법의 로컬 처리 가능한 부분집합 파서.
+
+지원: from:, subject:, after:, before:, is:unread, 자유 텍스트("구문" 포함).
+그 밖의 연산자(OR, 괄호, 부정, label: 등)가 있으면 None을 반환해 API로 넘긴다.
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+
+_TOKEN = re.compile(r'(\w+):("[^"]*"|\S+)|"([^"]*)"|(\S+)')
+
+
+@dataclass
+class GmailQuery:
+    """로컬 인덱스로 실행할 수 있는 검색 조건."""
+
+    text: list[str] = field(default_factory=list)
+    sender: list[str] = field(default_factory=list)
+    subject: list[str] = field(default_factory=list)
+    after: int | None = None  # internalDate(ms) 하한, 포함
+    before: int | None = None  # internalDate(ms) 상한, 미포함
+    unread: bool = False
+
+
+def _parse_date(value: str) -> int | None:
+    """after:/before: 값을 ms 타임스탬프로 바꾼다. 날짜는 로컬 시간 자정 기준."""
+    if value.isdigit():
+        return int(value) * 1000
+    for fmt in ("%Y/%m/%d", "%Y-%m-%d"):
+        try:
+            return int(datetime.strptime(value, fmt).timestamp() * 1000)
+        except ValueError:
+            continue
+    return None
+
+
+def parse_gmail_query(query: str) -> GmailQuery | None:
+    """Gmail 검색어를 파싱한다. 로컬에서 처리할 수 없으면 None."""
+    parsed = GmailQuery()
+
+    for match in _TOKEN.finditer(query):
+        operator, value, phrase, word = match.groups()
+
+        if operator is not None:
+            operator = operator.lower()
+            value = value.strip('"')
+            if operator == "from":
+                parsed.sender.append(value)
+            elif operator == "subject":
+                parsed.subject.append(value)
+            elif operator in ("after", "before"):
+                timestamp = _parse_date(value)
+                if timestamp is None:
+                    return None
+                setattr(parsed, operator, timestamp)
+            elif operator == "is" and value.lower() == "unread":
+                parsed.unread = True
+            else:
+                return None
+        elif phrase is not None:
+            if phrase:
+                parsed.text.append(phrase)
+        else:
+            if word.upper() in ("OR", "AND") or word[0] in "-+({}" or word.endswith(")"):
+                return None
+            parsed.text.append(word)
+
+    if not (parsed.text or parsed.sender or parsed.subject or parsed.unread):
+        if parsed.after is None and parsed.before is None:
+            return None
+
+    return parsed
+
+
+def _fts_phrase(term: str) -> str:
+    """검색어를 FTS5 접두사 구문으로 바꾼다. 한국어 조사가 붙은 단어도 찾도록 접두사로 검색한다."""
+    return '"' + term.replace('"', '""') + '"*'
+
+
+def to_fts_match(query: GmailQuery) -> str | None:
+    """GmailQuery의 텍스트 조건을 FTS5 MATCH 식으로 바꾼다. 텍스트 조건이 없으면 None."""
+    clauses = [_fts_phrase(t) for t in query.text]
+    clauses += [f"sender : {_fts_phrase(t)}" for t in query.sender]
+    clauses += [f"subject : {_fts_phrase(t)}" for t in query.subject]
+    return " AND ".join(clauses) if clauses else None
@@ -0,0 +1,147 @@
+"""Google Calendar 반복 일정 전개.
+
+events.list(singleEvents=True)가 서버에서 하는 인스턴스 전개를 로컬에서 수행한다.
+"""
+
+import re
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from dateutil.rrule import rrulestr
+
+
+def event_timestamp(when: dict, tz: ZoneInfo) -> float:
+    """이벤트의 start/end/originalStartTime 값을 UTC 타임스탬프로 바꾼다.
+
+    종일 일정(date)은 캘린더 시간대의 자정으로 해석한다.
+    """
+    if "dateTime" in when:
+        return datetime.fromisoformat(when["dateTime"]).timestamp()
+    return datetime.fromisoformat(when["date"]).replace(tzinfo=tz).timestamp()
+
+
+# UNTIL 값. 날짜만(20250214), 시간대 없는 시각(20250214T090000), UTC 시각(...Z)이 모두 올 수 있다
+_UNTIL = re.compile(r"UNTIL=(\d{8})(T\d{6})?(Z)?(?=;|$)")
+
+
+def _until_like_dtstart(line: str, tz) -> str:
+    """UNTIL을 DTSTART와 같은 형식(시간대 유무)으로 맞춘다.
+
+    dateutil은 DTSTART에 시간대가 있으면 UTC UNTIL만, 없으면 시간대 없는 UNTIL만 받는다.
+    시간대가 있으면 날짜만 적힌 UNTIL은 그날 끝 시각으로, 시간대 없는 시각은 일정 시간대 시각으로
+    보고 UTC로 바꾼다. 시간대가 없는 종일 일정은 날짜가 벽시계 기준이므로 UTC 표시만 뗀다.
+    """
+
+    def _convert(match: re.Match) -> str:
+        day, clock, utc = match.groups()
+        if tz is None:
+            return f"UNTIL={day}{clock or ''}"
+        if utc:
+            return match.group(0)
+        if clock:
+            local = datetime.strptime(day + clock, "%Y%m%dT%H%M%S").replace(tzinfo=tz)
+        else:
+            # API는 날짜만 적힌 UNTIL을 그날 시작하는 회차까지 포함하는 뜻으로 받는다
+            local = datetime.strptime(day, "%Y%m%d").replace(tzinfo=tz)
+            local += timedelta(days=1, seconds=-1)
+        return f"UNTIL={local.astimezone(timezone.utc):%Y%m%dT%H%M%SZ}"
+
+    return _UNTIL.sub(_convert, line)
+
+
+def _rule(master: dict, dtstart: datetime):
+    lines = [_until_like_dtstart(line, dtstart.tzinfo) for line in master["recurrence"]]
+    return rrulestr("\n".join(lines), dtstart=dtstart, forceset=True)
+
+
+def _event_zone(master: dict, calendar_tz: ZoneInfo) -> ZoneInfo:
+    name = master["start"].get("timeZone")
+    return ZoneInfo(name) if name else calendar_tz
+
+
+def recurrence_end(master: dict, calendar_tz: ZoneInfo) -> float | None:
+    """반복 일정의 마지막 회차 종료 시각을 반환한다. 끝이 없으면 None."""
+    rules = " ".join(master["recurrence"])
+    if "COUNT=" not in rules and "UNTIL=" not in rules:
+        return None
+
+    start, end = master["start"], master["end"]
+    if "dateTime" in start:
+        tz = _event_zone(master, calendar_tz)
+        dtstart = datetime.fromisoformat(start["dateTime"]).astimezone(tz)
+        duration = datetime.fromisoformat(end["dateTime"]) - datetime.fromisoformat(
+            start["dateTime"]
+        )
+    else:
+        tz = calendar_tz
+        dtstart = datetime.fromisoformat(start["date"])
+        duration = date.fromisoformat(end["date"]) - date.fromisoformat(start["date"])
+
+    last = None
+    for last in _rule(master, dtstart):
+        pass
+    if last is None:
+        return None
+    if last.tzinfo is None:
+        last = last.replace(tzinfo=tz)
+    return (last + duration).timestamp()
+
+
+def expand(
+    master: dict,
+    calendar_tz: ZoneInfo,
+    time_min: float,
+    time_max: float,
+    overridden: set[float] = frozenset(),
+) -> list[dict]:
+    """[time_min, time_max)과 겹치는 반복 일정 인스턴스를 만든다.
+
+    overridden에 있는 원래 시작 시각(수정·취소된 회차)은 건너뛴다.
+    인스턴스 ID는 API와 같은 {원본ID}_{원래 시작 시각} 형식이다.
+    """
+    start, end = master["start"], master["end"]
+    timed = "dateTime" in start
+
+    if timed:
+        tz = _event_zone(master, calendar_tz)
+        dtstart = datetime.fromisoformat(start["dateTime"]).astimezone(tz)
+        duration = datetime.fromisoformat(end["dateTime"]) - datetime.fromisoformat(
+            start["dateTime"]
+        )
+        window_start = datetime.fromtimestamp(time_min, tz) - duration
+        window_end = datetime.fromtimestamp(time_max, tz)
+    else:
+        tz = calendar_tz
+        dtstart = datetime.fromisoformat(start["date"])
+        duration = date.fromisoformat(end["date"]) - date.fromisoformat(start["date"])
+        window_start = datetime.fromtimestamp(time_min, tz).replace(tzinfo=None) - duration
+        window_end = datetime.fromtimestamp(time_max, tz).replace(tzinfo=None)
+
+    base = {k: v for k, v in master.items() if k != "recurrence"}
+    instances = []
+    for occurrence in _rule(master, dtstart).between(window_start, window_end):
+        if timed:
+            if occurrence.timestamp() in overridden:
+                continue
+            suffix = occurrence.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+            occ_start = {"dateTime": occurrence.isoformat(), "timeZone": tz.key}
+            occ_end = {"dateTime": (occurrence + duration).isoformat(), "timeZone": tz.key}
+        else:
+            if occurrence.replace(tzinfo=tz).timestamp() in overridden:
+                continue
+            suffix = occurrence.strftime("%Y%m%d")
+            occ_start = {"date": occurrence.date().isoformat()}
+            occ_end = {"date": (occurrence.date() + timedelta(days=duration.days)).isoformat()}
+
+        instances.append(
+            {
+                **base,
+                "id": f"{master['id']}_{suffix}",
+                "recurringEventId": master["id"],
+                "originalStartTime": occ_start,
+                "start": occ_start,
+                "end": occ_end,
+            }
+        )
+
+    return instances
@@ -0,0 +1,113 @@
+"""여러 서비스를 한 번에 묶어 보는 MCP 도구.
+
+daily_briefing은 오늘 일정, 안 읽은 메일, GitHub 알림을 도구 풀에서 동시에 조회하고 마감 시간
+하나까지만 기다린다. 응답 시간은 세 조회의 합이 아니라 가장 느린 조회(길어야 마감 시간)로 정해지고,
+마감까지 끝나지 않았거나 실패한 영역은 사유만 적고 나머지로 요약을 만든다.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime
+
+from fastmcp import FastMCP
+
+from jarvis.auth.github_auth import get_github_client
+from jarvis.tools.calendar import get_calendar_service, target_calendars, timeline_page
+from jarvis.tools.github import list_conditional
+from jarvis.tools.gmail import get_gmail_service, message_page
+from jarvis.utils.concurrency import run_blocking
+from jarvis.utils.formatting import format_briefing
+from jarvis.utils.metrics import tool_call
+
+logger = logging.getLogger(__name__)
+
+# 호출에서 timeout을 생략했을 때 기다리는 시간(초)
+BRIEFING_TIMEOUT = float(os.getenv("JARVIS_BRIEFING_TIMEOUT", "10"))
+
+
+def _today_events(day: str, calendar_id: str, max_results: int) -> tuple[list[dict], bool]:
+    service = get_calendar_service()
+    events, positions = timeline_page(
+        service,
+        target_calendars(service, calendar_id),
+        f"{day}T00:00:00Z",
+        f"{day}T23:59:59Z",
+        max_results,
+    )
+    return events, bool(positions)
+
+
+def _unread_messages(max_results: int) -> tuple[list[dict], bool]:
+    service = get_gmail_service()
+    messages, position = message_page(service, max_results, None, label_ids=["INBOX", "UNREAD"])
+    return messages, position is not None
+
+
+def _unread_notifications(max_results: int) -> tuple[list, bool]:
+    from github.Notification import Notification
+
+    params = {"all": "false", "participating": "false"}
+    notifications, position = list_conditional(
+        get_github_client(), Notification, "/notifications", params, max_results
+    )
+    return notifications, position is not None
+
+
+async def _gather_sections(calls: dict, timeout: float) -> dict:
+    """영역별 조회를 도구 풀에서 동시에 실행하고 timeout초까지 기다린다.
+
+    끝난 영역은 결과를, 실패했거나 늦은 영역은 사유 문자열을 돌려준다. 이미 시작된 늦은 조회는
+    스레드를 멈출 수 없으므로 끝까지 돌지만 결과는 버린다.
+    """
+    tasks = {name: asyncio.ensure_future(run_blocking(*call)) for name, call in calls.items()}
+    done, _ = await asyncio.wait(tasks.values(), timeout=timeout)
+
+    sections = {}
+    for name, task in tasks.items():
+        if task not in done:
+            # 아직 풀에서 기다리는 조회는 시작하지 않게 한다
+            task.cancel()
+            sections[name] = f"시간 초과 ({timeout:g}초 안에 응답 없음)"
+        elif task.exception() is not None:
+            logger.warning("브리핑 %s 조회 실패", name, exc_info=task.exception())
+            sections[name] = f"오류 - {task.exception()}"
+        else:
+            sections[name] = task.result()
+    return sections
+
+
+def register_briefing_tools(mcp: FastMCP) -> None:
+    """서비스를 가로지르는 요약 도구를 MCP 서버에 등록한다."""
+
+    @mcp.tool()
+    async def daily_briefing(
+        date: str | None = None,
+        calendar_id: str = "primary",
+        max_results: int = 5,
+        timeout: float | None = None,
+    ) -> str:
+        """하루 일정, 안 읽은 메일, 읽지 않은 GitHub 알림을 한 번에 조회해 요약한다.
+
+        세 서비스를 동시에 조회하고 timeout초(기본 JARVIS_BRIEFING_TIMEOUT)까지만 기다린다.
+        늦거나 실패한 영역은 사유만 표시하고 나머지 결과를 돌려준다.
+
+        Args:
+            date: 일정을 볼 날짜 (YYYY-MM-DD, 기본: 오늘)
+            calendar_id: 일정을 볼 캘린더. "all"이면 모든 캘린더
+            max_results: 영역별 최대 항목 수. 더 있으면 개수 뒤에 +를 붙인다
+            timeout: 기다릴 최대 시간(초)
+        """
+        day = date or datetime.now().strftime("%Y-%m-%d")
+        timeout = BRIEFING_TIMEOUT if timeout is None else timeout
+
+        with tool_call("daily_briefing"):
+            sections = await _gather_sections(
+                {
+                    "events": (_today_events, day, calendar_id, max_results),
+                    "messages": (_unread_messages, max_results),
+                    "notifications": (_unread_notifications, max_results),
+                },
+                timeout,
+            )
+            return format_briefing(day, **sections)
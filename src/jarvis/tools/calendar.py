@@ -1,68 +1,388 @@
 """Google Calendar MCP 도구."""
 
-from datetime import datetime, timedelta
+import heapq
+import logging
+from collections.abc import Iterator
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+from operator import itemgetter
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from fastmcp import FastMCP
-from googleapiclient.discovery import build
+from fastmcp.tools import ToolResult
+from googleapiclient.errors import HttpError
+
+from jarvis.store.calendar import get_store
+from jarvis.store.recurrence import event_timestamp
+from jarvis.utils.fields import (
+    CALENDAR_IDS_FIELDS,
+    CALENDAR_LIST_FIELDS,
+    EVENT_FIELDS,
+    EVENT_PAGE_FIELDS,
+    FREEBUSY_FIELDS,
+)
+from jarvis.utils.coalesce import coalesced, invalidates
+from jarvis.utils.concurrency import submit, threaded
+from jarvis.utils.cursor import (
+    INVALID_CURSOR,
+    PageStream,
+    Position,
+    decode_cursor,
+    encode_cursor,
+    with_cursor,
+)
+from jarvis.utils.metrics import record_cache
+from jarvis.utils.formatting import (
+    format_calendar_list,
+    format_event,
+    format_event_list,
+    format_free_slots,
+)
+from jarvis.utils.slots import Interval, free_slots, merge_busy, working_windows
+from jarvis.utils.tables import CALENDARS, EVENTS, INVALID_OUTPUT, format_table, output_format
+
+
+logger = logging.getLogger(__name__)
+
+# calendar_id에 이 값을 주면 모든 캘린더를 합쳐 조회한다
+ALL_CALENDARS = "all"
+# 기본 캘린더의 별칭. 실제 ID는 소유자 이메일이다
+PRIMARY = "primary"
+
+# freebusy.query 한 번에 조회할 수 있는 캘린더 수
+_FREEBUSY_BATCH = 50
+
+# events.list 한 페이지 최대 크기
+_EVENTS_PAGE_MAX = 2500
+
+# "primary"가 가리키는 실제 캘린더 ID. 캘린더 목록을 받거나 쓰기 후 처음 필요할 때 알아낸다
+_primary_id: str | None = None
+
+
+def get_calendar_service():
+    """Google Calendar API 서비스 객체를 반환한다."""
+    # google-api-python-client/google-auth는 무거우므로 처음 쓸 때 불러온다
+    from jarvis.auth.google_auth import get_service
 
-from jarvis.auth.google_auth import get_credentials
-from jarvis.utils.formatting import format_event, format_event_list, format_calendar_list
+    return get_service("calendar", "v3")
 
 
-def _get_calendar_service():
-    """Google Calendar API 서비스 객체를 반환한다."""
-    creds = get_credentials()
-    return build("calendar", "v3", credentials=creds)
+def _store_fetch(service, calendar_id: str, time_min: str, time_max: str, query: str | None):
+    """로컬 저장소로 일정 목록/검색에 답하는 fetch. 저장소를 쓸 수 없으면 None.
+
+    저장소에서는 앞에서부터의 오프셋을 페이지 키로 쓴다.
+    """
+    store = get_store()
+    if store is None:
+        return None
+    if not store.ensure_fresh(service, calendar_id):
+        record_cache("calendar_store", misses=1)
+        return None
+    record_cache("calendar_store", hits=1)
+
+    ts_min = datetime.fromisoformat(time_min).timestamp()
+    ts_max = datetime.fromisoformat(time_max).timestamp()
+
+    def _fetch(offset: int | None, size: int) -> tuple[list[dict], int | None]:
+        offset = offset or 0
+        events = store.list_events(calendar_id, ts_min, ts_max, size, query, offset) or []
+        return events, offset + len(events) if len(events) == size else None
+
+    return _fetch
+
+
+def _readable_calendars(service) -> list[dict]:
+    """일정을 읽을 수 있는 캘린더 목록을 기본 캘린더가 앞에 오도록 반환한다."""
+    calendars: list[dict] = []
+    page_token = None
+    while True:
+        result = (
+            service.calendarList()
+            .list(minAccessRole="reader", pageToken=page_token, fields=CALENDAR_IDS_FIELDS)
+            .execute()
+        )
+        calendars.extend(result.get("items", []))
+        page_token = result.get("nextPageToken")
+        if not page_token:
+            break
+    calendars.sort(key=lambda c: not c.get("primary"))
+    if calendars and calendars[0].get("primary"):
+        global _primary_id
+        _primary_id = calendars[0]["id"]
+    return calendars
+
+
+def _resolve_primary(service) -> None:
+    """기본 캘린더("primary")의 실제 ID를 아직 모르면 한 번 조회해 둔다."""
+    global _primary_id
+    if _primary_id is not None:
+        return
+    try:
+        _primary_id = service.calendars().get(calendarId=PRIMARY, fields="id").execute()["id"]
+    except HttpError:
+        logger.warning("기본 캘린더 ID를 확인하지 못했습니다.", exc_info=True)
+
+
+def _calendar_aliases(calendar_id: str) -> set[str]:
+    """같은 캘린더를 가리키는 ID들. 기본 캘린더는 "primary"와 실제 ID 둘 다다.
+
+    "all" 조회는 기본 캘린더를 실제 ID로 저장·캐시하므로, 쓰기 후에는 두 이름을 모두 지워야 한다.
+    """
+    if calendar_id in (PRIMARY, _primary_id):
+        return {PRIMARY, _primary_id} - {None}
+    return {calendar_id}
+
+
+def _open_calendar(
+    service,
+    calendar_id: str,
+    time_min: str,
+    time_max: str,
+    want: int,
+    query: str | None,
+    position: Position | None,
+) -> PageStream:
+    """캘린더 하나의 일정 스트림을 열고 첫 페이지(또는 로컬 저장소 조회)를 받아 둔다.
+
+    다음 페이지는 읽는 쪽이 필요로 할 때 받는다. 위치의 페이지 키가 pageToken(문자열)이면
+    API로, 오프셋이면 저장소로 이어 읽는다. 저장소를 쓸 수 없으면 그 오프셋만큼 API 결과를 건너뛴다.
+    """
+    page = position[0] if position else None
+    if not isinstance(page, str):
+        fetch = _store_fetch(service, calendar_id, time_min, time_max, query)
+        if fetch is not None:
+            return PageStream(fetch, want, position).open()
+        if position:
+            position = [None, (page or 0) + position[1]]
+
+    params = {
+        "calendarId": calendar_id,
+        "timeMin": time_min,
+        "timeMax": time_max,
+        "singleEvents": True,
+        "orderBy": "startTime",
+        "fields": EVENT_PAGE_FIELDS,
+    }
+    if query:
+        params["q"] = query
+
+    def _fetch(page_token: str | None, size: int) -> tuple[list[dict], str | None]:
+        result = (
+            service.events()
+            .list(**params, maxResults=min(size, _EVENTS_PAGE_MAX), pageToken=page_token)
+            .execute()
+        )
+        return result.get("items", []), result.get("nextPageToken")
+
+    return PageStream(_fetch, want, position).open()
+
+
+def target_calendars(service, calendar_id: str) -> list[dict]:
+    """조회할 캘린더 목록. "all"이면 읽을 수 있는 모든 캘린더다."""
+    if calendar_id == ALL_CALENDARS:
+        return _readable_calendars(service)
+    return [{"id": calendar_id}]
+
+
+def _calendar_zone(calendar: dict) -> ZoneInfo:
+    """종일 일정의 시작 시각을 정할 캘린더 시간대."""
+    try:
+        return ZoneInfo(calendar.get("timeZone") or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+def _timeline(index: int, events: PageStream, tz: ZoneInfo) -> Iterator[tuple[float, int, dict]]:
+    for event in events:
+        yield event_timestamp(event["start"], tz), index, event
+
+
+def timeline_page(
+    service,
+    calendars: list[dict],
+    time_min: str,
+    time_max: str,
+    max_results: int,
+    query: str | None = None,
+    positions: dict[str, Position] | None = None,
+) -> tuple[list[dict], dict[str, Position]]:
+    """캘린더들을 동시에 조회해 시작 시각 순 타임라인에서 max_results개를 꺼낸다.
+
+    positions는 캘린더 ID → 이어 읽을 위치다(None이면 처음부터, 없는 캘린더는 이미 다 읽음).
+    다음 페이지를 위한 위치를 같은 형태로 함께 반환하며, 다 읽었으면 빈 dict다.
+    """
+    if positions is not None:
+        calendars = [c for c in calendars if c["id"] in positions]
+    futures = [
+        submit(
+            _open_calendar,
+            service,
+            calendar["id"],
+            time_min,
+            time_max,
+            max_results,
+            query,
+            positions and positions[calendar["id"]],
+        )
+        for calendar in calendars
+    ]
+    streams = [future.result() for future in futures]
+
+    # 각 스트림이 이미 정렬되어 있으므로 힙 병합으로 앞에서부터 max_results개만 꺼낸다
+    merged = heapq.merge(
+        *(_timeline(i, s, _calendar_zone(c)) for i, (c, s) in enumerate(zip(calendars, streams))),
+        key=itemgetter(0),
+    )
+    consumed = [0] * len(streams)
+    events = []
+    for _, index, event in islice(merged, max_results):
+        consumed[index] += 1
+        events.append(event)
+
+    next_positions = {}
+    for calendar, stream, count in zip(calendars, streams, consumed):
+        position = stream.position(count)
+        if position is not None:
+            next_positions[calendar["id"]] = position
+    return events, next_positions
+
+
+def _query_busy(
+    service, calendar_ids: list[str], time_min: str, time_max: str
+) -> tuple[list[Interval], dict[str, str]]:
+    """freebusy.query로 캘린더들의 바쁜 구간을 모은다.
+
+    캘린더가 많으면 한도만큼 나누어 동시에 요청한다.
+    반환: (바쁜 구간 목록, 조회하지 못한 캘린더 → 사유)
+    """
+
+    def _query(chunk: list[str]) -> dict:
+        body = {
+            "timeMin": time_min,
+            "timeMax": time_max,
+            "items": [{"id": calendar_id} for calendar_id in chunk],
+        }
+        return service.freebusy().query(body=body, fields=FREEBUSY_FIELDS).execute()
+
+    futures = [
+        submit(_query, calendar_ids[i : i + _FREEBUSY_BATCH])
+        for i in range(0, len(calendar_ids), _FREEBUSY_BATCH)
+    ]
+
+    busy: list[Interval] = []
+    unavailable: dict[str, str] = {}
+    for future in futures:
+        for calendar_id, info in future.result().get("calendars", {}).items():
+            errors = info.get("errors")
+            if errors:
+                unavailable[calendar_id] = errors[0].get("reason", "unknown")
+                continue
+            busy.extend(
+                (
+                    datetime.fromisoformat(interval["start"]).timestamp(),
+                    datetime.fromisoformat(interval["end"]).timestamp(),
+                )
+                for interval in info.get("busy", [])
+            )
+    return busy, unavailable
+
+
+def _invalidate_store(service, calendar_id: str) -> None:
+    """쓰기 작업 후 다음 조회에서 변경분을 동기화하도록 표시한다.
+
+    이어서 지울 결과 캐시 태그도 별칭을 따르므로 기본 캘린더의 실제 ID를 먼저 알아 둔다.
+    """
+    _resolve_primary(service)
+    store = get_store()
+    if store is not None:
+        for alias in _calendar_aliases(calendar_id):
+            store.invalidate(alias)
+
+
+def _calendar_tags(args: dict) -> list[tuple]:
+    """목록·검색 결과는 해당 캘린더에 쓰기가 있으면 지운다."""
+    return [("calendar", args["calendar_id"])]
+
+
+def _calendar_write_tags(args: dict) -> list[tuple]:
+    """쓰기 후 지울 결과: 그 캘린더(별칭 포함)와 모든 캘린더 조회, 바뀐 일정의 상세 조회."""
+    tags = [("calendar", ALL_CALENDARS)]
+    for calendar_id in _calendar_aliases(args["calendar_id"]):
+        tags.append(("calendar", calendar_id))
+        if "event_id" in args:
+            tags.append(("event", calendar_id, args["event_id"]))
+    return tags
 
 
 def register_calendar_tools(mcp: FastMCP) -> None:
     """Calendar 관련 MCP 도구를 서버에 등록한다."""
 
     @mcp.tool()
+    @coalesced(_calendar_tags)
+    @threaded
     def list_events(
         start_date: str | None = None,
         end_date: str | None = None,
         max_results: int = 10,
         calendar_id: str = "primary",
-    ) -> str:
-        """일정 목록을 조회한다. 날짜 형식: YYYY-MM-DD"""
-        service = _get_calendar_service()
+        cursor: str | None = None,
+        output: str | None = None,
+    ) -> str | ToolResult:
+        """일정 목록을 조회한다. 날짜 형식: YYYY-MM-DD
+
+        calendar_id에 "all"을 주면 모든 캘린더의 일정을 시간순으로 합쳐 보여준다.
+        결과가 더 있으면 응답 끝의 cursor를 넘겨 다음 페이지를 조회한다.
+        output에 "json"이나 "tsv"를 주면 머리글을 한 번만 쓰는 간결한 표로 받는다.
+        """
+        service = get_calendar_service()
 
         if not start_date:
             start_date = datetime.now().strftime("%Y-%m-%d")
         if not end_date:
             end_date = start_date
 
-        time_min = f"{start_date}T00:00:00Z"
-        time_max = f"{end_date}T23:59:59Z"
-
-        result = (
-            service.events()
-            .list(
-                calendarId=calendar_id,
-                timeMin=time_min,
-                timeMax=time_max,
-                maxResults=max_results,
-                singleEvents=True,
-                orderBy="startTime",
-            )
-            .execute()
+        filters = {"start_date": start_date, "end_date": end_date, "calendar_id": calendar_id}
+        try:
+            positions = decode_cursor(cursor, "list_events", filters)
+        except ValueError:
+            return INVALID_CURSOR
+        try:
+            output = output_format(output)
+        except ValueError:
+            return INVALID_OUTPUT
+
+        events, positions = timeline_page(
+            service,
+            target_calendars(service, calendar_id),
+            f"{start_date}T00:00:00Z",
+            f"{end_date}T23:59:59Z",
+            max_results,
+            positions=positions,
         )
-
-        events = result.get("items", [])
+        next_cursor = encode_cursor("list_events", filters, positions) if positions else None
+        if output != "text":
+            return format_table(EVENTS, events, output, next_cursor)
         if not events:
             return f"{start_date} ~ {end_date} 기간에 일정이 없습니다."
 
-        return format_event_list(events)
+        return with_cursor(format_event_list(events), next_cursor)
 
     @mcp.tool()
+    @coalesced(lambda args: [("event", args["calendar_id"], args["event_id"])], detail=True)
+    @threaded
     def get_event(event_id: str, calendar_id: str = "primary") -> str:
         """특정 일정의 상세 정보를 조회한다."""
-        service = _get_calendar_service()
-        event = service.events().get(calendarId=calendar_id, eventId=event_id).execute()
+        service = get_calendar_service()
+        event = (
+            service.events()
+            .get(calendarId=calendar_id, eventId=event_id, fields=EVENT_FIELDS)
+            .execute()
+        )
         return format_event(event, detailed=True)
 
     @mcp.tool()
+    @invalidates(_calendar_write_tags)
+    @threaded
     def create_event(
         summary: str,
         start_time: str,
@@ -73,7 +393,7 @@ def register_calendar_tools(mcp: FastMCP) -> None:
         calendar_id: str = "primary",
     ) -> str:
         """새 일정을 생성한다. 시간 형식: ISO 8601 (예: 2025-02-12T15:00:00+09:00)"""
-        service = _get_calendar_service()
+        service = get_calendar_service()
 
         event_body = {
             "summary": summary,
@@ -91,10 +411,13 @@ def register_calendar_tools(mcp: FastMCP) -> None:
         event = (
             service.events().insert(calendarId=calendar_id, body=event_body).execute()
         )
+        _invalidate_store(service, calendar_id)
 
         return f"일정 생성 완료: {event['summary']}\nID: {event['id']}\n링크: {event.get('htmlLink', '')}"
 
     @mcp.tool()
+    @invalidates(_calendar_write_tags)
+    @threaded
     def update_event(
         event_id: str,
         summary: str | None = None,
@@ -105,7 +428,7 @@ def register_calendar_tools(mcp: FastMCP) -> None:
         calendar_id: str = "primary",
     ) -> str:
         """기존 일정을 수정한다."""
-        service = _get_calendar_service()
+        service = get_calendar_service()
 
         event = service.events().get(calendarId=calendar_id, eventId=event_id).execute()
 
@@ -125,58 +448,136 @@ def register_calendar_tools(mcp: FastMCP) -> None:
             .update(calendarId=calendar_id, eventId=event_id, body=event)
             .execute()
         )
+        _invalidate_store(service, calendar_id)
 
         return f"일정 수정 완료: {updated['summary']}"
 
     @mcp.tool()
+    @invalidates(_calendar_write_tags)
+    @threaded
     def delete_event(event_id: str, calendar_id: str = "primary") -> str:
         """일정을 삭제한다."""
-        service = _get_calendar_service()
+        service = get_calendar_service()
         service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
+        _invalidate_store(service, calendar_id)
         return "일정이 삭제되었습니다."
 
     @mcp.tool()
-    def list_calendars() -> str:
-        """사용 가능한 캘린더 목록을 조회한다."""
-        service = _get_calendar_service()
-        result = service.calendarList().list().execute()
+    @coalesced(lambda args: [("calendars",)], detail=True)
+    @threaded
+    def list_calendars(output: str | None = None) -> str | ToolResult:
+        """사용 가능한 캘린더 목록을 조회한다. output: text(기본), json, tsv"""
+        try:
+            output = output_format(output)
+        except ValueError:
+            return INVALID_OUTPUT
+
+        service = get_calendar_service()
+        result = service.calendarList().list(fields=CALENDAR_LIST_FIELDS).execute()
         calendars = result.get("items", [])
+        if output != "text":
+            return format_table(CALENDARS, calendars, output)
         return format_calendar_list(calendars)
 
     @mcp.tool()
+    @coalesced(lambda args: [("calendar", ALL_CALENDARS)])
+    @threaded
+    def find_free_slots(
+        attendees: list[str] | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        duration_minutes: int = 30,
+        work_start: str = "09:00",
+        work_end: str = "18:00",
+        time_zone: str = "Asia/Seoul",
+        include_weekends: bool = False,
+        max_results: int = 10,
+    ) -> str:
+        """참석자 모두가 비어 있는 시간을 찾는다. 날짜 형식: YYYY-MM-DD, 시간 형식: HH:MM
+
+        attendees는 참석자 이메일(캘린더 ID) 목록이며, 내 기본 캘린더는 항상 포함된다.
+        """
+        service = get_calendar_service()
+        tz = ZoneInfo(time_zone)
+
+        first_day = date.fromisoformat(start_date) if start_date else datetime.now(tz).date()
+        last_day = date.fromisoformat(end_date) if end_date else first_day + timedelta(days=6)
+
+        windows = working_windows(
+            first_day,
+            last_day,
+            time.fromisoformat(work_start),
+            time.fromisoformat(work_end),
+            tz,
+            include_weekends,
+        )
+        # 이미 지난 시간은 후보에서 뺀다
+        now = datetime.now(tz).timestamp()
+        windows = [(max(start, now), end) for start, end in windows if end > now]
+
+        calendar_ids = list(dict.fromkeys(["primary", *(attendees or [])]))
+        busy, unavailable = _query_busy(
+            service,
+            calendar_ids,
+            datetime.combine(first_day, time.min, tz).isoformat(),
+            datetime.combine(last_day + timedelta(days=1), time.min, tz).isoformat(),
+        )
+
+        slots = free_slots(merge_busy(busy), windows, duration_minutes * 60)
+        return format_free_slots(slots[:max_results], tz, unavailable)
+
+    @mcp.tool()
+    @coalesced(_calendar_tags)
+    @threaded
     def search_events(
         query: str,
         start_date: str | None = None,
         end_date: str | None = None,
         max_results: int = 10,
-    ) -> str:
-        """키워드로 일정을 검색한다."""
-        service = _get_calendar_service()
+        calendar_id: str = "primary",
+        cursor: str | None = None,
+        output: str | None = None,
+    ) -> str | ToolResult:
+        """키워드로 일정을 검색한다. calendar_id에 "all"을 주면 모든 캘린더에서 찾는다.
+
+        결과가 더 있으면 응답 끝의 cursor를 넘겨 다음 페이지를 조회한다.
+        output에 "json"이나 "tsv"를 주면 머리글을 한 번만 쓰는 간결한 표로 받는다.
+        """
+        service = get_calendar_service()
 
         if not start_date:
             start_date = datetime.now().strftime("%Y-%m-%d")
         if not end_date:
             end_date = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
 
-        time_min = f"{start_date}T00:00:00Z"
-        time_max = f"{end_date}T23:59:59Z"
-
-        result = (
-            service.events()
-            .list(
-                calendarId="primary",
-                timeMin=time_min,
-                timeMax=time_max,
-                maxResults=max_results,
-                singleEvents=True,
-                orderBy="startTime",
-                q=query,
-            )
-            .execute()
+        filters = {
+            "query": query,
+            "start_date": start_date,
+            "end_date": end_date,
+            "calendar_id": calendar_id,
+        }
+        try:
+            positions = decode_cursor(cursor, "search_events", filters)
+        except ValueError:
+            return INVALID_CURSOR
+        try:
+            output = output_format(output)
+        except ValueError:
+            return INVALID_OUTPUT
+
+        events, positions = timeline_page(
+            service,
+            target_calendars(service, calendar_id),
+            f"{start_date}T00:00:00Z",
+            f"{end_date}T23:59:59Z",
+            max_results,
+            query,
+            positions,
         )
-
-        events = result.get("items", [])
+        next_cursor = encode_cursor("search_events", filters, positions) if positions else None
+        if output != "text":
+            return format_table(EVENTS, events, output, next_cursor)
         if not events:
             return f"'{query}' 검색 결과가 없습니다."
 
-        return format_event_list(events)
+        return with_cursor(format_event_list(events), next_cursor)
@@ -1,8 +1,30 @@
 """GitHub MCP 도구."""
 
+import logging
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from functools import partial
+from types import SimpleNamespace
+
 from fastmcp import FastMCP
+from fastmcp.tools import ToolResult
 
 from jarvis.auth.github_auth import get_github_client
+from jarvis.utils.coalesce import coalesced, invalidates
+from jarvis.utils.concurrency import threaded
+from jarvis.utils.cursor import (
+    INVALID_CURSOR,
+    PageStream,
+    Position,
+    decode_cursor,
+    encode_cursor,
+    take_page,
+    with_cursor,
+)
+from jarvis.utils.metrics import record_cache
+from jarvis.utils.ratelimit import low_quota
 from jarvis.utils.formatting import (
     format_repo,
     format_repo_list,
@@ -12,44 +34,292 @@ from jarvis.utils.formatting import (
     format_pull_request_list,
     format_notification_list,
 )
+from jarvis.utils.tables import (
+    INVALID_OUTPUT,
+    ISSUES,
+    NOTIFICATIONS,
+    PULL_REQUESTS,
+    REPOS,
+    format_table,
+    output_format,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# (토큰, URL, 파라미터) → (ETag, Last-Modified, 응답 헤더, 응답 본문)
+_ETAG_CACHE_SIZE = 256
+_etag_lock = threading.Lock()
+_etag_cache: OrderedDict[tuple, tuple[str | None, str | None, dict, object]] = OrderedDict()
+
+_NEXT_LINK = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+
+def _conditional_get(g, url: str, parameters: dict) -> tuple[dict, object]:
+    """ETag/Last-Modified 조건부 GET을 보낸다.
+
+    304 응답은 GitHub rate limit에 포함되지 않으며, 캐시된 응답을 그대로 돌려준다.
+    """
+    requester = g.requester
+    # 클라이언트는 스레드별로 다르므로 토큰 기준으로 캐시를 공유한다
+    key = (getattr(requester.auth, "token", None), url, tuple(sorted(parameters.items())))
+
+    with _etag_lock:
+        cached = _etag_cache.get(key)
+        if cached:
+            _etag_cache.move_to_end(key)
+
+    request_headers = {}
+    if cached:
+        etag, last_modified, _, _ = cached
+        if etag:
+            request_headers["If-None-Match"] = etag
+        if last_modified:
+            request_headers["If-Modified-Since"] = last_modified
+
+    headers, data = requester.requestJsonAndCheck(
+        "GET", url, parameters=parameters, headers=request_headers
+    )
+
+    # 304 Not Modified는 본문이 비어 있다
+    if data is None and cached:
+        record_cache("github_etag", hits=1)
+        return cached[2], cached[3]
+    record_cache("github_etag", misses=1)
+
+    etag = headers.get("etag")
+    last_modified = headers.get("last-modified")
+    if etag or last_modified:
+        with _etag_lock:
+            _etag_cache[key] = (etag, last_modified, headers, data)
+            _etag_cache.move_to_end(key)
+            while len(_etag_cache) > _ETAG_CACHE_SIZE:
+                _etag_cache.popitem(last=False)
+
+    return headers, data
 
 
-def _take(paginated_list, max_results: int) -> list:
-    """PaginatedList에서 최대 max_results개를 안전하게 가져온다."""
-    items = []
-    for item in paginated_list:
-        items.append(item)
-        if len(items) >= max_results:
-            break
-    return items
+def list_conditional(
+    g, klass, url: str, parameters: dict, max_results: int, position: Position | None = None
+) -> tuple[list, Position | None]:
+    """REST 목록 API를 조건부 요청으로 페이지를 넘기며 최대 max_results개와 다음 위치를 가져온다.
+
+    위치의 페이지 키는 Link 헤더의 next URL이다.
+    """
+
+    def _fetch(page_url: str | None, size: int) -> tuple[list, str | None]:
+        if page_url is None:
+            headers, data = _conditional_get(
+                g, url, {**parameters, "per_page": min(max(size, 1), 100)}
+            )
+        else:
+            # next 링크에는 쿼리 파라미터가 이미 포함되어 있다
+            headers, data = _conditional_get(g, page_url, {})
+        items = [klass(g.requester, headers, element, completed=False) for element in data]
+        match = _NEXT_LINK.search(headers.get("link", ""))
+        return items, match.group(1) if match else None
+
+    return take_page(PageStream(_fetch, max_results, position), max_results)
+
+
+_ISSUES_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $after: String,
+      $states: [IssueState!], $labels: [String!]) {
+  repository(owner: $owner, name: $name) {
+    issues(first: $first, after: $after, states: $states, labels: $labels,
+           orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number title state createdAt url body
+        author { login }
+        labels(first: 20) { nodes { name } }
+        assignees(first: 20) { nodes { login } }
+      }
+    }
+  }
+}
+"""
+
+_PULL_REQUESTS_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $after: String,
+      $states: [PullRequestState!], $orderBy: IssueOrder) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: $first, after: $after, states: $states, orderBy: $orderBy) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number title state merged createdAt url body
+        headRefName baseRefName
+        author { login }
+        labels(first: 20) { nodes { name } }
+      }
+    }
+  }
+}
+"""
+
+_ISSUE_STATES = {"open": ["OPEN"], "closed": ["CLOSED"], "all": None}
+_PULL_REQUEST_STATES = {"open": ["OPEN"], "closed": ["CLOSED", "MERGED"], "all": None}
+_PULL_REQUEST_ORDER = {
+    "created": {"field": "CREATED_AT", "direction": "DESC"},
+    "updated": {"field": "UPDATED_AT", "direction": "DESC"},
+    "popularity": {"field": "COMMENTS", "direction": "DESC"},
+    "long-running": {"field": "CREATED_AT", "direction": "ASC"},
+}
+
+
+def _graphql_nodes(
+    g,
+    query: str,
+    variables: dict,
+    connection: str,
+    max_results: int,
+    keep=None,
+    position: Position | None = None,
+) -> tuple[list[dict], Position | None]:
+    """GraphQL connection을 커서로 넘기며 조건에 맞는 노드를 최대 max_results개와 다음 위치를 가져온다.
+
+    위치의 페이지 키는 GraphQL endCursor다.
+    """
+
+    def _fetch(after: str | None, size: int) -> tuple[list[dict], str | None]:
+        # 클라이언트 측 필터가 있으면 몇 개가 남을지 모르므로 최대 페이지로 가져온다
+        first = 100 if keep else min(size, 100)
+        _, data = g.requester.graphql_query(query, {**variables, "first": first, "after": after})
+        page = data["data"]["repository"][connection]
+        info = page["pageInfo"]
+        return page["nodes"], info["endCursor"] if info["hasNextPage"] else None
+
+    def _quota_left() -> bool:
+        # 필터 때문에 페이지를 계속 넘겨야 하는데 쿼터가 바닥나면 찾은 만큼만 돌려주고 나머지는 커서로 넘긴다
+        if low_quota("github", "graphql"):
+            logger.warning("GitHub GraphQL 쿼터 부족, 찾은 결과까지만 반환합니다.")
+            return False
+        return True
+
+    stream = PageStream(_fetch, max_results, position, _quota_left if keep else None)
+    return take_page(stream, max_results, keep)
+
+
+def _has_all_labels(names: set[str], node: dict) -> bool:
+    """노드가 주어진 라벨을 모두 가졌는지 확인한다."""
+    return names.issubset(l["name"] for l in node["labels"]["nodes"])
+
+
+def _login(actor: dict | None) -> SimpleNamespace:
+    """삭제된 계정은 author가 null로 오므로 ghost로 표시한다."""
+    return SimpleNamespace(login=actor["login"] if actor else "ghost")
+
+
+def _issue_from_node(node: dict) -> SimpleNamespace:
+    """GraphQL Issue 노드를 format_issue가 읽는 형태로 변환한다."""
+    return SimpleNamespace(
+        number=node["number"],
+        title=node["title"],
+        state=node["state"].lower(),
+        user=_login(node["author"]),
+        created_at=datetime.fromisoformat(node["createdAt"]),
+        labels=[SimpleNamespace(name=l["name"]) for l in node["labels"]["nodes"]],
+        assignees=[_login(a) for a in node["assignees"]["nodes"]],
+        html_url=node["url"],
+        body=node["body"],
+    )
+
+
+def _pull_request_from_node(node: dict) -> SimpleNamespace:
+    """GraphQL PullRequest 노드를 format_pull_request가 읽는 형태로 변환한다."""
+    return SimpleNamespace(
+        number=node["number"],
+        title=node["title"],
+        # REST와 같이 머지된 PR은 closed + merged로 표현한다
+        state="open" if node["state"] == "OPEN" else "closed",
+        merged=node["merged"],
+        user=_login(node["author"]),
+        head=SimpleNamespace(ref=node["headRefName"]),
+        base=SimpleNamespace(ref=node["baseRefName"]),
+        created_at=datetime.fromisoformat(node["createdAt"]),
+        labels=[SimpleNamespace(name=l["name"]) for l in node["labels"]["nodes"]],
+        html_url=node["url"],
+        body=node["body"],
+    )
+
+
+def _repo_tag(kind: str, args: dict, number: str | None = None) -> tuple:
+    """저장소 단위 결과 태그. GitHub 저장소 이름은 대소문자를 구분하지 않는다."""
+    tag = (kind, args["owner_repo"].lower())
+    return tag + (args[number],) if number else tag
+
+
+def _issue_write_tags(args: dict) -> list[tuple]:
+    """이슈를 바꾼 뒤 지울 결과: 이슈 목록과 그 이슈의 상세 조회.
+
+    PR도 이슈 번호를 쓰고 이슈 API로 상태·제목·라벨을 바꿀 수 있으므로, 같은 번호의 PR 상세 조회와
+    PR 목록도 지운다.
+    """
+    number = args["issue_number"]
+    return [
+        _repo_tag("issues", args),
+        _repo_tag("issue", args) + (number,),
+        _repo_tag("pulls", args),
+        _repo_tag("pull", args) + (number,),
+    ]
+
+
+def _pull_write_tags(args: dict) -> list[tuple]:
+    """PR을 바꾼 뒤 지울 결과: PR 목록과 그 PR(같은 번호의 이슈 조회 포함)의 상세 조회."""
+    number = args["pr_number"]
+    return [_repo_tag("pulls", args), _repo_tag("pull", args) + (number,), _repo_tag("issue", args) + (number,)]
 
 
 def register_github_tools(mcp: FastMCP) -> None:
     """GitHub 관련 MCP 도구를 서버에 등록한다."""
 
     @mcp.tool()
+    @coalesced(lambda args: [("repos",)])
+    @threaded
     def list_repos(
         type: str = "owner",
         sort: str = "updated",
         max_results: int = 30,
-    ) -> str:
+        cursor: str | None = None,
+        output: str | None = None,
+    ) -> str | ToolResult:
         """내 GitHub 저장소 목록을 조회한다.
 
         Args:
             type: 저장소 유형 (owner, all, public, private, member)
             sort: 정렬 기준 (created, updated, pushed, full_name)
-            max_results: 최대 결과 수
+            max_results: 최대 결과 수 (한 페이지)
+            cursor: 이전 응답 끝의 다음 페이지 cursor
+            output: 출력 형식 (text, json, tsv). json/tsv는 머리글을 한 번만 쓰는 간결한 표
         """
+        from github.Repository import Repository
+
+        filters = {"type": type, "sort": sort}
+        try:
+            position = decode_cursor(cursor, "list_repos", filters)
+        except ValueError:
+            return INVALID_CURSOR
+        try:
+            output = output_format(output)
+        except ValueError:
+            return INVALID_OUTPUT
+
         g = get_github_client()
-        user = g.get_user()
-        repos = _take(user.get_repos(type=type, sort=sort), max_results)
+        repos, position = list_conditional(
+            g, Repository, "/user/repos", filters, max_results, position
+        )
+        next_cursor = encode_cursor("list_repos", filters, position) if position else None
+        if output != "text":
+            return format_table(REPOS, repos, output, next_cursor)
 
         if not repos:
             return "저장소가 없습니다."
 
-        return format_repo_list(repos)
+        return with_cursor(format_repo_list(repos), next_cursor)
 
     @mcp.tool()
+    @coalesced(lambda args: [_repo_tag("repo", args)], detail=True)
+    @threaded
     def get_repo(owner_repo: str) -> str:
         """저장소 상세 정보를 조회한다.
 
@@ -61,38 +331,64 @@ def register_github_tools(mcp: FastMCP) -> None:
         return format_repo(repo)
 
     @mcp.tool()
+    @coalesced(lambda args: [_repo_tag("issues", args)])
+    @threaded
     def list_issues(
         owner_repo: str,
         state: str = "open",
         labels: str | None = None,
         max_results: int = 30,
-    ) -> str:
+        cursor: str | None = None,
+        output: str | None = None,
+    ) -> str | ToolResult:
         """이슈 목록을 조회한다.
 
         Args:
             owner_repo: 저장소 전체 이름 (예: owner/repo)
             state: 상태 필터 (open, closed, all)
             labels: 라벨 필터 (쉼표 구분)
-            max_results: 최대 결과 수
+            max_results: 최대 결과 수 (한 페이지)
+            cursor: 이전 응답 끝의 다음 페이지 cursor
+            output: 출력 형식 (text, json, tsv). json/tsv는 머리글을 한 번만 쓰는 간결한 표
         """
+        filters = {"owner_repo": owner_repo.lower(), "state": state, "labels": labels}
+        try:
+            position = decode_cursor(cursor, "list_issues", filters)
+        except ValueError:
+            return INVALID_CURSOR
+        try:
+            output = output_format(output)
+        except ValueError:
+            return INVALID_OUTPUT
+
         g = get_github_client()
-        repo = g.get_repo(owner_repo)
+        owner, name = owner_repo.split("/", 1)
 
-        kwargs = {"state": state}
+        variables = {"owner": owner, "name": name, "states": _ISSUE_STATES.get(state)}
+        keep = None
         if labels:
             label_list = [l.strip() for l in labels.split(",")]
-            kwargs["labels"] = [repo.get_label(name) for name in label_list]
+            variables["labels"] = label_list
+            # GraphQL labels 필터는 OR 조건이므로 REST처럼 모든 라벨을 가진 이슈만 남긴다
+            keep = partial(_has_all_labels, set(label_list))
 
-        issues = _take(repo.get_issues(**kwargs), max_results)
-        # PR은 제외 (GitHub API는 이슈에 PR도 포함)
-        issues = [i for i in issues if not i.pull_request]
+        nodes, position = _graphql_nodes(
+            g, _ISSUES_QUERY, variables, "issues", max_results, keep, position
+        )
+        issues = [_issue_from_node(n) for n in nodes]
+        next_cursor = encode_cursor("list_issues", filters, position) if position else None
+        if output != "text":
+            return format_table(ISSUES, issues, output, next_cursor)
 
         if not issues:
-            return f"{owner_repo}에 {state} 상태의 이슈가 없습니다."
+            # 쿼터가 바닥나 필터에 맞는 이슈를 아직 못 찾았을 수도 있다
+            return with_cursor(f"{owner_repo}에 {state} 상태의 이슈가 없습니다.", next_cursor)
 
-        return format_issue_list(issues)
+        return with_cursor(format_issue_list(issues), next_cursor)
 
     @mcp.tool()
+    @coalesced(lambda args: [_repo_tag("issue", args, "issue_number")], detail=True)
+    @threaded
     def get_issue(owner_repo: str, issue_number: int) -> str:
         """이슈 상세 정보를 조회한다.
 
@@ -106,6 +402,8 @@ def register_github_tools(mcp: FastMCP) -> None:
         return format_issue(issue, detailed=True)
 
     @mcp.tool()
+    @invalidates(lambda args: [_repo_tag("issues", args)])
+    @threaded
     def create_issue(
         owner_repo: str,
         title: str,
@@ -137,6 +435,8 @@ def register_github_tools(mcp: FastMCP) -> None:
         return f"이슈 생성 완료: #{issue.number} {issue.title}\nURL: {issue.html_url}"
 
     @mcp.tool()
+    @invalidates(_issue_write_tags)
+    @threaded
     def update_issue(
         owner_repo: str,
         issue_number: int,
@@ -177,30 +477,61 @@ def register_github_tools(mcp: FastMCP) -> None:
         return f"이슈 수정 완료: #{issue.number} {issue.title}"
 
     @mcp.tool()
+    @coalesced(lambda args: [_repo_tag("pulls", args)])
+    @threaded
     def list_pull_requests(
         owner_repo: str,
         state: str = "open",
         sort: str = "created",
         max_results: int = 30,
-    ) -> str:
+        cursor: str | None = None,
+        output: str | None = None,
+    ) -> str | ToolResult:
         """PR 목록을 조회한다.
 
         Args:
             owner_repo: 저장소 전체 이름 (예: owner/repo)
             state: 상태 필터 (open, closed, all)
             sort: 정렬 기준 (created, updated, popularity, long-running)
-            max_results: 최대 결과 수
+            max_results: 최대 결과 수 (한 페이지)
+            cursor: 이전 응답 끝의 다음 페이지 cursor
+            output: 출력 형식 (text, json, tsv). json/tsv는 머리글을 한 번만 쓰는 간결한 표
         """
+        filters = {"owner_repo": owner_repo.lower(), "state": state, "sort": sort}
+        try:
+            position = decode_cursor(cursor, "list_pull_requests", filters)
+        except ValueError:
+            return INVALID_CURSOR
+        try:
+            output = output_format(output)
+        except ValueError:
+            return INVALID_OUTPUT
+
         g = get_github_client()
-        repo = g.get_repo(owner_repo)
-        prs = _take(repo.get_pulls(state=state, sort=sort), max_results)
+        owner, name = owner_repo.split("/", 1)
+
+        variables = {
+            "owner": owner,
+            "name": name,
+            "states": _PULL_REQUEST_STATES.get(state),
+            "orderBy": _PULL_REQUEST_ORDER.get(sort, _PULL_REQUEST_ORDER["created"]),
+        }
+        nodes, position = _graphql_nodes(
+            g, _PULL_REQUESTS_QUERY, variables, "pullRequests", max_results, position=position
+        )
+        prs = [_pull_request_from_node(n) for n in nodes]
+        next_cursor = encode_cursor("list_pull_requests", filters, position) if position else None
+        if output != "text":
+            return format_table(PULL_REQUESTS, prs, output, next_cursor)
 
         if not prs:
             return f"{owner_repo}에 {state} 상태의 PR이 없습니다."
 
-        return format_pull_request_list(prs)
+        return with_cursor(format_pull_request_list(prs), next_cursor)
 
     @mcp.tool()
+    @coalesced(lambda args: [_repo_tag("pull", args, "pr_number")], detail=True)
+    @threaded
     def get_pull_request(owner_repo: str, pr_number: int) -> str:
         """PR 상세 정보를 조회한다.
 
@@ -214,6 +545,8 @@ def register_github_tools(mcp: FastMCP) -> None:
         return format_pull_request(pr, detailed=True)
 
     @mcp.tool()
+    @invalidates(lambda args: [_repo_tag("pulls", args)])
+    @threaded
     def create_pull_request(
         owner_repo: str,
         title: str,
@@ -241,6 +574,8 @@ def register_github_tools(mcp: FastMCP) -> None:
         return f"PR 생성 완료: #{pr.number} {pr.title}\nURL: {pr.html_url}"
 
     @mcp.tool()
+    @invalidates(_pull_write_tags)
+    @threaded
     def merge_pull_request(
         owner_repo: str,
         pr_number: int,
@@ -271,27 +606,52 @@ def register_github_tools(mcp: FastMCP) -> None:
             return f"PR #{pr_number} 머지 실패: {result.message}"
 
     @mcp.tool()
+    @coalesced(lambda args: [("notifications",)])
+    @threaded
     def list_notifications(
         all: bool = False,
         participating: bool = False,
         max_results: int = 30,
-    ) -> str:
+        cursor: str | None = None,
+        output: str | None = None,
+    ) -> str | ToolResult:
         """GitHub 알림을 조회한다.
 
         Args:
             all: 읽은 알림도 포함할지 여부
             participating: 참여 중인 알림만 조회할지 여부
-            max_results: 최대 결과 수
+            max_results: 최대 결과 수 (한 페이지)
+            cursor: 이전 응답 끝의 다음 페이지 cursor
+            output: 출력 형식 (text, json, tsv). json/tsv는 머리글을 한 번만 쓰는 간결한 표
         """
+        from github.Notification import Notification
+
+        params = {
+            "all": "true" if all else "false",
+            "participating": "true" if participating else "false",
+        }
+        try:
+            position = decode_cursor(cursor, "list_notifications", params)
+        except ValueError:
+            return INVALID_CURSOR
+        try:
+            output = output_format(output)
+        except ValueError:
+            return INVALID_OUTPUT
+
         g = get_github_client()
-        user = g.get_user()
-        notifications = _take(
-            user.get_notifications(all=all, participating=participating), max_results
+        notifications, position = list_conditional(
+            g, Notification, "/notifications", params, max_results, position
         )
 
-        return format_notification_list(notifications)
+        next_cursor = encode_cursor("list_notifications", params, position) if position else None
+        if output != "text":
+            return format_table(NOTIFICATIONS, notifications, output, next_cursor)
+        return with_cursor(format_notification_list(notifications), next_cursor)
 
     @mcp.tool()
+    @invalidates(lambda args: [("notifications",)])
+    @threaded
     def mark_notifications_read() -> str:
         """모든 알림을 읽음 처리한다."""
         g = get_github_client()
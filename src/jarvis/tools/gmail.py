@@ -1,105 +1,527 @@
 """Gmail MCP 도구."""
 
 import base64
+import logging
+import time
 from email.mime.text import MIMEText
+from functools import partial
+from pathlib import Path
 
 from fastmcp import FastMCP
-from googleapiclient.discovery import build
-
-from jarvis.auth.google_auth import get_credentials
+from fastmcp.tools import ToolResult
+from googleapiclient.errors import HttpError
+
+from jarvis.store.gmail import get_mirror
+from jarvis.store.gmail_query import parse_gmail_query
+from jarvis.utils.attachments import (
+    CHUNK_SIZE,
+    decode_data_field,
+    get_attachment_dir,
+    safe_filename,
+    save_stream,
+)
+from jarvis.utils.fields import (
+    ATTACHMENT_DATA_FIELDS,
+    ATTACHMENT_FIELDS,
+    LABEL_LIST_FIELDS,
+    MESSAGE_FIELDS,
+    MESSAGE_ID_PAGE_FIELDS,
+    MESSAGE_LIST_FIELDS,
+    MESSAGE_LIST_HEADERS,
+    MIRROR_MESSAGE_FIELDS,
+    MIRROR_METADATA_FIELDS,
+)
+from jarvis.utils.coalesce import coalesced, invalidates
+from jarvis.utils.concurrency import threaded
+from jarvis.utils.cursor import (
+    INVALID_CURSOR,
+    PageStream,
+    Position,
+    decode_cursor,
+    encode_cursor,
+    take_page,
+    with_cursor,
+)
+from jarvis.utils.metrics import record_cache
+from jarvis.utils.mime import ParsedMessage
+from jarvis.utils.ratelimit import MAX_RETRIES, MAX_RETRY_WAIT, backoff_delay
 from jarvis.utils.formatting import (
     format_message,
     format_message_list,
     format_label_list,
 )
+from jarvis.utils.tables import INVALID_OUTPUT, LABELS, MESSAGES, format_table, output_format
+
+logger = logging.getLogger(__name__)
 
+# reply_message가 원본 메일에서 읽는 헤더
+_REPLY_HEADERS = ["From", "Subject", "Message-Id", "Cc"]
 
-def _get_gmail_service():
+# Gmail 배치 요청 한도는 100개지만, 50개를 넘기면 rateLimitExceeded가 잦아진다.
+_BATCH_SIZE = 50
+
+# messages.batchModify 한 번에 보낼 수 있는 최대 ID 수
+_BATCH_MODIFY_MAX = 1000
+# messages.list 한 페이지 최대 크기
+_LIST_PAGE_MAX = 500
+# 실패 보고에 보여 줄 메일 ID 수
+_FAILED_IDS_SHOWN = 5
+
+
+def get_gmail_service():
     """Gmail API 서비스 객체를 반환한다."""
-    creds = get_credentials()
-    return build("gmail", "v1", credentials=creds)
+    # google-api-python-client/google-auth는 무거우므로 처음 쓸 때 불러온다
+    from jarvis.auth.google_auth import get_service
+
+    return get_service("gmail", "v1")
+
+
+def _batch_get_messages(
+    service,
+    message_ids: list[str],
+    fields: str = MESSAGE_LIST_FIELDS,
+    format: str = "metadata",
+) -> list[dict]:
+    """메일을 배치 요청으로 조회한다. 결과는 입력 순서를 유지한다.
+
+    조회 사이에 삭제된 메일(404)은 결과에서 빠진다. 배치 안에서 429·쿼터 초과로 실패한 메일만
+    백오프(Retry-After 준수) 후 다시 묶어 보내고, 재시도를 다 쓰면 그 오류를 던진다.
+    """
+    from jarvis.auth.google_auth import batch_part_retry_after
+
+    params = {"userId": "me", "format": format, "fields": fields}
+    if format == "metadata":
+        params["metadataHeaders"] = MESSAGE_LIST_HEADERS
+
+    results: list[dict | None] = [None] * len(message_ids)
+    pending = list(range(len(message_ids)))
+    attempt = 0
+
+    while True:
+        errors: list[Exception] = []
+        # 색인 → (오류, 서버가 요청한 대기 시간)
+        throttled: dict[int, tuple[HttpError, float]] = {}
+
+        def _callback(request_id, response, exception):
+            if exception is None:
+                results[int(request_id)] = response
+                return
+            if isinstance(exception, HttpError):
+                if exception.resp.status == 404:
+                    return
+                wait = batch_part_retry_after(exception)
+                if wait is not None:
+                    throttled[int(request_id)] = (exception, wait)
+                    return
+            errors.append(exception)
+
+        for start in range(0, len(pending), _BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=_callback)
+            for index in pending[start : start + _BATCH_SIZE]:
+                batch.add(
+                    service.users().messages().get(id=message_ids[index], **params),
+                    request_id=str(index),
+                )
+            batch.execute()
+
+        if errors:
+            raise errors[0]
+        if not throttled:
+            break
+
+        wait = max(w for _, w in throttled.values())
+        if attempt >= MAX_RETRIES or wait > MAX_RETRY_WAIT:
+            raise next(iter(throttled.values()))[0]
+        delay = backoff_delay(attempt, wait)
+        logger.info(
+            "Gmail 배치 중 %d건 요청 제한, %.1f초 후 다시 보냅니다 (%d회째).",
+            len(throttled), delay, attempt + 1,
+        )
+        time.sleep(delay)
+        attempt += 1
+        pending = sorted(throttled)
+
+    return [r for r in results if r is not None]
+
+
+def _mirror_fetch(service):
+    """미러에 저장할 메일(본문 색인 포함)을 가져오는 함수를 반환한다."""
+    return partial(
+        _batch_get_messages, service, fields=MIRROR_MESSAGE_FIELDS, format="full"
+    )
+
+
+def _get_message_metadata(service, message_ids: list[str]) -> list[dict]:
+    """메일 메타데이터를 조회한다. 미러에 이미 있는 메일은 다시 받지 않는다."""
+    mirror = get_mirror()
+    if mirror is None:
+        return _batch_get_messages(service, message_ids)
+
+    known = mirror.get_messages(message_ids)
+    missing = [mid for mid in message_ids if mid not in known]
+    record_cache("gmail_mirror", hits=len(known), misses=len(missing))
+    if missing:
+        # 본문까지 받는 format=full은 느리므로 헤더만 받는다. 새 메일이면 다음 변경분 동기화가
+        # 본문과 함께 다시 받아 색인을 채운다.
+        fetched = _batch_get_messages(service, missing, fields=MIRROR_METADATA_FIELDS)
+        mirror.add_messages(fetched)
+        known.update((m["id"], m) for m in fetched)
+
+    return [known[mid] for mid in message_ids if mid in known]
+
+
+class _MirrorMiss(Exception):
+    """미러가 요청한 구간을 담고 있지 않다."""
+
+
+def _mirror_fetch_page(service, label_ids: list[str] | None, query: str | None):
+    """미러로 목록/검색에 답하는 fetch. 미러를 쓸 수 없으면 None.
+
+    미러에서는 앞에서부터의 오프셋을 페이지 키로 쓴다. 미러 범위를 벗어나면 _MirrorMiss를 던진다.
+    """
+    mirror = get_mirror()
+    if mirror is None:
+        return None
+
+    parsed = None
+    if query is not None:
+        # 미러 색인으로 처리할 수 없는 검색어는 API로 보낸다
+        parsed = parse_gmail_query(query)
+        if parsed is None:
+            return None
+
+    if not mirror.ensure_fresh(service, _mirror_fetch(service)):
+        record_cache("gmail_mirror", misses=1)
+        return None
+    record_cache("gmail_mirror", hits=1)
+
+    def _fetch(offset: int | None, size: int) -> tuple[list[dict], int | None]:
+        offset = offset or 0
+        if parsed is not None:
+            rows = mirror.search(parsed, size, offset)
+        else:
+            rows = mirror.list_messages(label_ids, size, offset)
+        if rows is None:
+            raise _MirrorMiss
+        return rows, offset + len(rows) if len(rows) == size else None
+
+    return _fetch
+
+
+def message_page(
+    service,
+    max_results: int,
+    position: Position | None,
+    label_ids: list[str] | None = None,
+    query: str | None = None,
+) -> tuple[list[dict], Position | None]:
+    """메일 목록/검색 한 페이지(메타데이터)와 다음 위치를 반환한다.
+
+    위치의 페이지 키가 pageToken(문자열)이면 API로, 오프셋이면 미러로 이어 읽는다.
+    미러가 답할 수 없으면 그 오프셋만큼 API 결과를 건너뛴다.
+    """
+    page = position[0] if position else None
+    if not isinstance(page, str):
+        fetch = _mirror_fetch_page(service, label_ids, query)
+        if fetch is not None:
+            try:
+                return take_page(PageStream(fetch, max_results, position), max_results)
+            except _MirrorMiss:
+                pass
+        if position:
+            position = [None, (page or 0) + position[1]]
+
+    def _fetch(page_token: str | None, size: int) -> tuple[list[dict], str | None]:
+        result = (
+            service.users()
+            .messages()
+            .list(
+                userId="me",
+                labelIds=label_ids,
+                q=query,
+                maxResults=min(size, _LIST_PAGE_MAX),
+                pageToken=page_token,
+                fields=MESSAGE_ID_PAGE_FIELDS,
+            )
+            .execute()
+        )
+        return result.get("messages", []), result.get("nextPageToken")
+
+    messages, position = take_page(PageStream(_fetch, max_results, position), max_results)
+    if not messages:
+        return [], position
+    return _get_message_metadata(service, [m["id"] for m in messages]), position
+
+
+def _invalidate_mirror() -> None:
+    """메일 상태를 바꾼 뒤 다음 조회에서 미러가 변경분을 받아오게 한다."""
+    mirror = get_mirror()
+    if mirror is not None:
+        mirror.invalidate()
+
+
+def _has_one_target(message_ids: list[str] | None, query: str | None) -> bool:
+    """일괄 작업 대상으로 message_ids와 query 중 정확히 하나를 지정했는지 확인한다."""
+    # 빈 검색어는 메일함 전체를 고르므로 지정하지 않은 것으로 본다
+    if query is not None and not query.strip():
+        return False
+    return (message_ids is None) != (query is None)
+
+
+def _resolve_message_ids(
+    service, message_ids: list[str] | None, query: str | None, limit: int
+) -> tuple[list[str], bool]:
+    """일괄 작업 대상 ID와 limit 때문에 빠진 메일이 있는지 여부를 반환한다.
+
+    query가 있으면 messages.list를 페이지 단위로 따라가며 ID를 모은다.
+    """
+    if message_ids is not None:
+        # 같은 ID가 여러 번 와도 한 번만 보낸다
+        ids = list(dict.fromkeys(message_ids))
+        return ids[:limit], len(ids) > limit
+
+    ids: list[str] = []
+    page_token = None
+    while len(ids) < limit:
+        result = (
+            service.users()
+            .messages()
+            .list(
+                userId="me",
+                q=query,
+                maxResults=min(limit - len(ids), _LIST_PAGE_MAX),
+                pageToken=page_token,
+                fields=MESSAGE_ID_PAGE_FIELDS,
+            )
+            .execute()
+        )
+        ids.extend(m["id"] for m in result.get("messages", []))
+        page_token = result.get("nextPageToken")
+        if not page_token:
+            return ids, False
+    return ids, True
+
+
+def _batch_modify(
+    service, message_ids: list[str], add_labels: list[str], remove_labels: list[str]
+) -> list[tuple[list[str], HttpError]]:
+    """batchModify로 ID를 한도만큼씩 나눠 라벨을 바꾼다.
+
+    batchModify는 묶음 단위로 성공하거나 실패하므로, 실패한 묶음과 오류를 모아 반환한다.
+    """
+    failures = []
+    for start in range(0, len(message_ids), _BATCH_MODIFY_MAX):
+        chunk = message_ids[start : start + _BATCH_MODIFY_MAX]
+        body = {"ids": chunk, "addLabelIds": add_labels, "removeLabelIds": remove_labels}
+        try:
+            service.users().messages().batchModify(userId="me", body=body).execute()
+        except HttpError as e:
+            failures.append((chunk, e))
+    return failures
+
+
+def _format_bulk_result(action: str, total: int, failures: list, truncated: bool) -> str:
+    """일괄 작업 결과. 실패한 묶음은 오류와 앞부분 ID를 함께 보여 준다."""
+    failed = sum(len(chunk) for chunk, _ in failures)
+    lines = [f"{action} 완료: {total - failed}개 성공" + (f", {failed}개 실패" if failed else "")]
+    for chunk, error in failures:
+        shown = ", ".join(chunk[:_FAILED_IDS_SHOWN])
+        more = f" 외 {len(chunk) - _FAILED_IDS_SHOWN}개" if len(chunk) > _FAILED_IDS_SHOWN else ""
+        lines.append(f"  - 실패 {len(chunk)}개 ({error.resp.status} {error.reason}): {shown}{more}")
+    if truncated:
+        lines.append(f"  (대상이 더 있지만 max_messages({total}개)까지만 처리했습니다.)")
+    return "\n".join(lines)
+
+
+# 메일 목록·검색 결과 태그. 메일을 보내거나 라벨을 바꾸면 지운다.
+_MAILBOX = ("mailbox",)
+# 모든 메일 상세 조회 결과 태그. 검색어로 일괄 작업하면 어떤 메일이 바뀌었는지 미리 알 수 없다.
+_MESSAGES = ("messages",)
+
+
+def _message_write_tags(args: dict) -> list[tuple]:
+    """메일 하나를 바꾼 뒤 지울 결과: 목록·검색과 그 메일의 상세 조회."""
+    return [_MAILBOX, ("message", args["message_id"])]
+
+
+def _bulk_write_tags(args: dict) -> list[tuple]:
+    """일괄 작업 뒤 지울 결과: 목록·검색과 대상 메일(검색어면 모든 메일)의 상세 조회."""
+    if args["message_ids"] is None:
+        return [_MAILBOX, _MESSAGES]
+    return [_MAILBOX, *(("message", mid) for mid in args["message_ids"])]
+
+
+def _mask_dropped_attachments(message: dict) -> bool:
+    """ATTACHMENT_FIELDS 마스크 때문에 첨부를 못 봤을 수 있는지 확인한다.
+
+    마스크 깊이에서 잘려 하위 파트가 빠진 multipart 파트나, 내용이 body.data에 든(attachmentId가
+    없는) 첨부가 있으면 True.
+    """
+    for part in ParsedMessage(message).walk():
+        if part.get("mimeType", "").startswith("multipart/") and not part.get("parts"):
+            return True
+        body = part.get("body", {})
+        if part.get("filename") and body.get("size") and not body.get("attachmentId"):
+            return True
+    return False
+
+
+def _attachment_parts(service, message_id: str) -> list[dict]:
+    """메일의 첨부 파트 메타데이터(이름, attachmentId, 크기)만 조회한다.
+
+    마스크로 다 볼 수 없는 메일(깊은 MIME 트리, body.data에 든 첨부)은 파트 전체를 다시 받는다.
+    """
+    messages = service.users().messages()
+    message = messages.get(
+        userId="me", id=message_id, format="full", fields=ATTACHMENT_FIELDS
+    ).execute()
+    if _mask_dropped_attachments(message):
+        logger.info("메일 %s의 첨부를 마스크 없이 다시 조회합니다.", message_id)
+        message = messages.get(
+            userId="me", id=message_id, format="full", fields=MESSAGE_FIELDS
+        ).execute()
+    return list(ParsedMessage(message).attachments())
+
+
+def _save_attachment(service, message_id: str, part: dict, path: Path) -> tuple[int, str]:
+    """첨부 하나를 messages.attachments.get으로 받아 path에 스트리밍 저장한다. (크기, sha256)."""
+    data = part["body"].get("data")
+    if data is not None and not part["body"].get("attachmentId"):
+        # 내용이 메일에 바로 든 첨부는 이미 받았으므로 그대로 쓴다
+        return save_stream([base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))], path)
+
+    # google-auth/requests는 무거우므로 처음 쓸 때 불러온다
+    from jarvis.auth.google_auth import open_stream
+
+    request = (
+        service.users()
+        .messages()
+        .attachments()
+        .get(
+            userId="me",
+            messageId=message_id,
+            id=part["body"]["attachmentId"],
+            fields=ATTACHMENT_DATA_FIELDS,
+        )
+    )
+    with open_stream("gmail", request.uri) as response:
+        response.raise_for_status()
+        return save_stream(decode_data_field(response.iter_content(CHUNK_SIZE)), path)
+
+
+def _save_attachments(service, message_id: str, parts: list[dict]) -> str:
+    """첨부를 하나씩 받아 저장 디렉터리/메일 ID/ 아래에 쓰고 경로·크기·해시를 포맷팅한다."""
+    directory = get_attachment_dir() / safe_filename(message_id, "message")
+    lines = [f"첨부 파일 {len(parts)}개 저장:"]
+    used: set[str] = set()
+    for part in parts:
+        part_id = part.get("partId", "")
+        name = safe_filename(part["filename"], f"attachment-{part_id}")
+        if name in used:
+            # 같은 이름의 첨부가 여러 개면 파트 번호로 구분한다
+            stem, dot, suffix = name.rpartition(".")
+            name = f"{stem}-{part_id}.{suffix}" if dot else f"{name}-{part_id}"
+        used.add(name)
+
+        path = directory / name
+        size, sha256 = _save_attachment(service, message_id, part, path)
+        lines.append(f"  - {path} ({size:,}바이트, sha256 {sha256})")
+    return "\n".join(lines)
 
 
 def register_gmail_tools(mcp: FastMCP) -> None:
     """Gmail 관련 MCP 도구를 서버에 등록한다."""
 
     @mcp.tool()
+    @coalesced(lambda args: [_MAILBOX])
+    @threaded
     def list_messages(
         max_results: int = 10,
         label: str = "INBOX",
         unread_only: bool = False,
-    ) -> str:
-        """받은편지함의 메일 목록을 조회한다."""
-        service = _get_gmail_service()
+        cursor: str | None = None,
+        output: str | None = None,
+    ) -> str | ToolResult:
+        """받은편지함의 메일 목록을 조회한다. 결과가 더 있으면 응답 끝의 cursor로 다음 페이지를 조회한다.
+
+        output에 "json"이나 "tsv"를 주면 머리글을 한 번만 쓰는 간결한 표로 받는다.
+        """
+        filters = {"label": label, "unread_only": unread_only}
+        try:
+            position = decode_cursor(cursor, "list_messages", filters)
+        except ValueError:
+            return INVALID_CURSOR
+        try:
+            output = output_format(output)
+        except ValueError:
+            return INVALID_OUTPUT
+
+        service = get_gmail_service()
 
         label_ids = [label]
         if unread_only:
             label_ids.append("UNREAD")
 
-        result = (
-            service.users()
-            .messages()
-            .list(userId="me", labelIds=label_ids, maxResults=max_results)
-            .execute()
-        )
-
-        messages = result.get("messages", [])
+        messages, position = message_page(service, max_results, position, label_ids=label_ids)
+        next_cursor = encode_cursor("list_messages", filters, position) if position else None
+        if output != "text":
+            return format_table(MESSAGES, messages, output, next_cursor)
         if not messages:
             return "메일이 없습니다."
 
-        detailed = []
-        for msg in messages:
-            detail = (
-                service.users()
-                .messages()
-                .get(userId="me", id=msg["id"], format="metadata")
-                .execute()
-            )
-            detailed.append(detail)
-
-        return format_message_list(detailed)
+        return with_cursor(format_message_list(messages), next_cursor)
 
     @mcp.tool()
+    @coalesced(lambda args: [("message", args["message_id"]), _MESSAGES], detail=True)
+    @threaded
     def get_message(message_id: str) -> str:
         """특정 메일의 전체 내용을 조회한다."""
-        service = _get_gmail_service()
+        service = get_gmail_service()
         message = (
             service.users()
             .messages()
-            .get(userId="me", id=message_id, format="full")
+            .get(userId="me", id=message_id, format="full", fields=MESSAGE_FIELDS)
             .execute()
         )
         return format_message(message)
 
     @mcp.tool()
-    def search_messages(query: str, max_results: int = 10) -> str:
-        """Gmail 검색 문법으로 메일을 검색한다."""
-        service = _get_gmail_service()
-
-        result = (
-            service.users()
-            .messages()
-            .list(userId="me", q=query, maxResults=max_results)
-            .execute()
-        )
-
-        messages = result.get("messages", [])
+    @coalesced(lambda args: [_MAILBOX])
+    @threaded
+    def search_messages(
+        query: str,
+        max_results: int = 10,
+        cursor: str | None = None,
+        output: str | None = None,
+    ) -> str | ToolResult:
+        """Gmail 검색 문법으로 메일을 검색한다. 결과가 더 있으면 응답 끝의 cursor로 다음 페이지를 조회한다.
+
+        output에 "json"이나 "tsv"를 주면 머리글을 한 번만 쓰는 간결한 표로 받는다.
+        """
+        filters = {"query": query}
+        try:
+            position = decode_cursor(cursor, "search_messages", filters)
+        except ValueError:
+            return INVALID_CURSOR
+        try:
+            output = output_format(output)
+        except ValueError:
+            return INVALID_OUTPUT
+
+        service = get_gmail_service()
+
+        messages, position = message_page(service, max_results, position, query=query)
+        next_cursor = encode_cursor("search_messages", filters, position) if position else None
+        if output != "text":
+            return format_table(MESSAGES, messages, output, next_cursor)
         if not messages:
             return f"'{query}' 검색 결과가 없습니다."
 
-        detailed = []
-        for msg in messages:
-            detail = (
-                service.users()
-                .messages()
-                .get(userId="me", id=msg["id"], format="metadata")
-                .execute()
-            )
-            detailed.append(detail)
-
-        return format_message_list(detailed)
+        return with_cursor(format_message_list(messages), next_cursor)
 
     @mcp.tool()
+    @invalidates(lambda args: [_MAILBOX])
+    @threaded
     def send_message(
         to: str,
         subject: str,
@@ -108,7 +530,7 @@ def register_gmail_tools(mcp: FastMCP) -> None:
         bcc: str | None = None,
     ) -> str:
         """새 이메일을 발송한다."""
-        service = _get_gmail_service()
+        service = get_gmail_service()
 
         message = MIMEText(body)
         message["to"] = to
@@ -131,18 +553,26 @@ def register_gmail_tools(mcp: FastMCP) -> None:
         return f"메일 발송 완료\nID: {result['id']}\n스레드 ID: {result['threadId']}"
 
     @mcp.tool()
+    @invalidates(lambda args: [_MAILBOX])
+    @threaded
     def reply_message(
         message_id: str,
         body: str,
         reply_all: bool = False,
     ) -> str:
         """기존 메일에 답장한다."""
-        service = _get_gmail_service()
+        service = get_gmail_service()
 
         original = (
             service.users()
             .messages()
-            .get(userId="me", id=message_id, format="metadata")
+            .get(
+                userId="me",
+                id=message_id,
+                format="metadata",
+                metadataHeaders=_REPLY_HEADERS,
+                fields="threadId,payload/headers",
+            )
             .execute()
         )
 
@@ -179,13 +609,15 @@ def register_gmail_tools(mcp: FastMCP) -> None:
         return f"답장 발송 완료\nID: {result['id']}"
 
     @mcp.tool()
+    @invalidates(_message_write_tags)
+    @threaded
     def modify_labels(
         message_id: str,
         add_labels: list[str] | None = None,
         remove_labels: list[str] | None = None,
     ) -> str:
         """메일의 라벨을 추가하거나 제거한다."""
-        service = _get_gmail_service()
+        service = get_gmail_service()
 
         body = {
             "addLabelIds": add_labels or [],
@@ -195,6 +627,7 @@ def register_gmail_tools(mcp: FastMCP) -> None:
         service.users().messages().modify(
             userId="me", id=message_id, body=body
         ).execute()
+        _invalidate_mirror()
 
         actions = []
         if add_labels:
@@ -205,16 +638,102 @@ def register_gmail_tools(mcp: FastMCP) -> None:
         return f"라벨 수정 완료 ({'; '.join(actions)})"
 
     @mcp.tool()
-    def list_labels() -> str:
-        """사용 가능한 라벨 목록을 조회한다."""
-        service = _get_gmail_service()
-        result = service.users().labels().list(userId="me").execute()
+    @coalesced(lambda args: [("labels",)], detail=True)
+    @threaded
+    def list_labels(output: str | None = None) -> str | ToolResult:
+        """사용 가능한 라벨 목록을 조회한다. output: text(기본), json, tsv"""
+        try:
+            output = output_format(output)
+        except ValueError:
+            return INVALID_OUTPUT
+
+        service = get_gmail_service()
+        result = (
+            service.users().labels().list(userId="me", fields=LABEL_LIST_FIELDS).execute()
+        )
         labels = result.get("labels", [])
+        if output != "text":
+            return format_table(LABELS, labels, output)
         return format_label_list(labels)
 
     @mcp.tool()
+    @invalidates(_message_write_tags)
+    @threaded
     def trash_message(message_id: str) -> str:
         """메일을 휴지통으로 이동한다."""
-        service = _get_gmail_service()
+        service = get_gmail_service()
         service.users().messages().trash(userId="me", id=message_id).execute()
+        _invalidate_mirror()
         return "메일이 휴지통으로 이동되었습니다."
+
+    @mcp.tool()
+    @threaded
+    def save_attachments(message_id: str) -> str:
+        """메일의 첨부 파일을 모두 저장 디렉터리에 내려받는다. 파일 경로, 크기, SHA-256만 반환한다.
+
+        첨부는 하나씩 받아 조각 단위로 디코딩하며 바로 디스크에 쓴다.
+        """
+        service = get_gmail_service()
+        parts = _attachment_parts(service, message_id)
+        if not parts:
+            return "첨부 파일이 없습니다."
+        return _save_attachments(service, message_id, parts)
+
+    @mcp.tool()
+    @threaded
+    def download_attachment(message_id: str, filename: str) -> str:
+        """메일의 첨부 파일 하나를 이름으로 골라 저장 디렉터리에 내려받는다. 경로, 크기, SHA-256만 반환한다."""
+        service = get_gmail_service()
+        parts = _attachment_parts(service, message_id)
+        matched = [part for part in parts if part["filename"] == filename]
+        if not matched:
+            names = ", ".join(part["filename"] for part in parts) or "없음"
+            return f"'{filename}' 첨부 파일이 없습니다. (첨부: {names})"
+        return _save_attachments(service, message_id, matched[:1])
+
+    @mcp.tool()
+    @invalidates(_bulk_write_tags)
+    @threaded
+    def bulk_modify_labels(
+        message_ids: list[str] | None = None,
+        query: str | None = None,
+        add_labels: list[str] | None = None,
+        remove_labels: list[str] | None = None,
+        max_messages: int = 1000,
+    ) -> str:
+        """여러 메일의 라벨을 한 번에 추가하거나 제거한다. 메일 ID 목록이나 Gmail 검색어로 대상을 고른다."""
+        if not _has_one_target(message_ids, query):
+            return "message_ids와 query 중 하나만 지정하세요."
+        if not add_labels and not remove_labels:
+            return "추가하거나 제거할 라벨을 지정하세요."
+
+        service = get_gmail_service()
+        ids, truncated = _resolve_message_ids(service, message_ids, query, max_messages)
+        if not ids:
+            return "대상 메일이 없습니다."
+
+        failures = _batch_modify(service, ids, add_labels or [], remove_labels or [])
+        _invalidate_mirror()
+        return _format_bulk_result("라벨 수정", len(ids), failures, truncated)
+
+    @mcp.tool()
+    @invalidates(_bulk_write_tags)
+    @threaded
+    def bulk_trash_messages(
+        message_ids: list[str] | None = None,
+        query: str | None = None,
+        max_messages: int = 1000,
+    ) -> str:
+        """여러 메일을 한 번에 휴지통으로 이동한다. 메일 ID 목록이나 Gmail 검색어로 대상을 고른다."""
+        if not _has_one_target(message_ids, query):
+            return "message_ids와 query 중 하나만 지정하세요."
+
+        service = get_gmail_service()
+        ids, truncated = _resolve_message_ids(service, message_ids, query, max_messages)
+        if not ids:
+            return "대상 메일이 없습니다."
+
+        # 휴지통 이동은 TRASH 라벨을 붙이는 것과 같다 (messages.trash는 한 번에 하나씩만 된다)
+        failures = _batch_modify(service, ids, ["TRASH"], [])
+        _invalidate_mirror()
+        return _format_bulk_result("휴지통 이동", len(ids), failures, truncated)
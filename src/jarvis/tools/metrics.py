@@ -0,0 +1,24 @@
+"""서버 지표 MCP 리소스."""
+
+import json
+
+from fastmcp import FastMCP
+
+from jarvis.utils.coalesce import cache_stats
+from jarvis.utils.metrics import prometheus_text, snapshot
+from jarvis.utils.ratelimit import quota_status
+
+
+def register_metrics_resources(mcp: FastMCP):
+    """지표 리소스를 MCP 서버에 등록한다."""
+
+    @mcp.resource("jarvis://metrics", mime_type="application/json")
+    def metrics() -> str:
+        """도구별 지연 시간·업스트림 요청·캐시 적중 히스토그램, API별 쿼터 상태, 결과 캐시 상태."""
+        data = {**snapshot(), "schedulers": quota_status(), "result_cache": cache_stats()}
+        return json.dumps(data, ensure_ascii=False)
+
+    @mcp.resource("jarvis://metrics/prometheus", mime_type="text/plain")
+    def metrics_prometheus() -> str:
+        """같은 지표를 Prometheus 텍스트 형식으로 반환한다."""
+        return prometheus_text()
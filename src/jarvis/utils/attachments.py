@@ -0,0 +1,97 @@
+"""첨부 파일을 디스크로 스트리밍 저장.
+
+messages.attachments.get 응답은 {"data": "<base64url>"} 형태의 JSON이다. 응답을 조각 단위로
+읽으면서 data 문자열을 찾아 4글자 단위로 디코딩해 바로 파일에 쓰므로, 첨부가 수십 MB여도
+base64 문자열 전체나 디코딩한 사본 전체가 메모리에 올라오지 않는다.
+"""
+
+import base64
+import hashlib
+import os
+import re
+from collections.abc import Iterable, Iterator
+from itertools import chain
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+ATTACHMENT_DIR = PROJECT_ROOT / "attachments"
+
+# 응답에서 읽는 조각 크기(바이트)
+CHUNK_SIZE = 256 * 1024
+
+_DATA_FIELD = re.compile(rb'"data"\s*:\s*"')
+# data 필드를 찾는 동안 다음 조각과 이어 볼 꼬리 길이
+_FIELD_TAIL = 32
+# 파일 이름에 쓸 수 없는 문자
+_UNSAFE = re.compile(r'[\x00-\x1f<>:"/\\|?*]')
+
+
+def get_attachment_dir() -> Path:
+    """첨부 파일을 저장할 디렉터리. JARVIS_ATTACHMENT_DIR이 상대 경로면 프로젝트 루트 기준."""
+    env_path = os.getenv("JARVIS_ATTACHMENT_DIR")
+    if env_path:
+        path = Path(env_path)
+        if not path.is_absolute():
+            path = PROJECT_ROOT / path
+        return path
+    return ATTACHMENT_DIR
+
+
+def safe_filename(name: str, fallback: str) -> str:
+    """메일에 적힌 파일 이름을 저장 디렉터리 밖을 가리킬 수 없는 이름으로 바꾼다."""
+    name = _UNSAFE.sub("_", name.replace("\\", "/").rsplit("/", 1)[-1]).strip(" .")
+    return name[:200] or fallback
+
+
+def decode_data_field(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """JSON 응답 조각에서 "data" 문자열(base64url)을 찾아 디코딩한 바이트를 조각씩 내보낸다."""
+    chunks = iter(chunks)
+    head = b""
+    for chunk in chunks:
+        head += chunk
+        match = _DATA_FIELD.search(head)
+        if match:
+            rest = head[match.end() :]
+            break
+        head = head[-_FIELD_TAIL:]
+    else:
+        raise ValueError("응답에 data 필드가 없습니다.")
+
+    pending = b""
+    for piece in chain([rest], chunks):
+        end = piece.find(b'"')
+        pending += piece if end < 0 else piece[:end]
+        # base64 4글자 = 3바이트 단위로만 디코딩하고 나머지는 다음 조각과 잇는다
+        usable = len(pending) - len(pending) % 4
+        if usable:
+            yield base64.urlsafe_b64decode(pending[:usable])
+            pending = pending[usable:]
+        if end >= 0:
+            break
+    else:
+        raise ValueError("첨부 파일 응답이 중간에 끊겼습니다.")
+
+    if pending:
+        yield base64.urlsafe_b64decode(pending + b"=" * (-len(pending) % 4))
+
+
+def save_stream(pieces: Iterable[bytes], path: Path) -> tuple[int, str]:
+    """조각을 path에 이어 쓰고 (크기, sha256 hex)를 반환한다.
+
+    임시 파일에 다 쓴 뒤 교체하므로 도중에 실패해도 반쯤 쓴 파일이 남지 않는다.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            for piece in pieces:
+                f.write(piece)
+                digest.update(piece)
+                size += len(piece)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return size, digest.hexdigest()
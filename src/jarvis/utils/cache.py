@@ -0,0 +1,126 @@
+"""크기 상한이 있는 LRU + TTL 캐시.
+
+항목마다 만료 시각, 태그, 크기(바이트)를 함께 두고, 개수나 전체 크기가 상한을 넘으면
+가장 오래 쓰지 않은 항목부터 버린다. 쓰기 쪽에서 태그로 관련 항목만 지울 수 있다.
+잠금이 없으므로 한 스레드(이벤트 루프)에서만 쓴다.
+"""
+
+import json
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+
+
+def sizeof(value: object) -> int:
+    """캐시 항목의 대략적인 크기(바이트). 도구 결과는 대부분 문자열이다."""
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, bytes):
+        return len(value)
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "tags", "size")
+
+    def __init__(self, value: object, expires_at: float, tags: frozenset, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.tags = tags
+        self.size = size
+
+
+class TTLCache:
+    """LRU + TTL 캐시. max_bytes와 max_entries 중 먼저 닿는 쪽에서 내보낸다."""
+
+    def __init__(self, max_bytes: int, max_entries: int | None = None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: object = None) -> object:
+        """살아 있는 항목이면 값을 돌려주고 최근 사용으로 옮긴다."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def put(self, key: Hashable, value: object, ttl: float, tags: Iterable[Hashable] = ()) -> bool:
+        """항목을 넣는다. 한 항목이 상한보다 크면 넣지 않고 False를 반환한다."""
+        size = sizeof(value)
+        if self._entries.get(key) is not None:
+            self._remove(key)
+        if ttl <= 0 or size > self.max_bytes:
+            return False
+        self._entries[key] = _Entry(value, time.monotonic() + ttl, frozenset(tags), size)
+        self.bytes += size
+        self._shrink()
+        return True
+
+    def invalidate(self, tags: Iterable[Hashable]) -> int:
+        """태그가 하나라도 겹치는 항목을 지우고 지운 개수를 반환한다."""
+        targets = set(tags)
+        keys = [key for key, entry in self._entries.items() if entry.tags & targets]
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        self.bytes -= self._entries.pop(key).size
+
+    def _shrink(self) -> None:
+        """상한 안으로 들어올 때까지 만료된 항목, 그다음 가장 오래된 항목을 버린다."""
+        if not self._over():
+            return
+        now = time.monotonic()
+        for key in [key for key, entry in self._entries.items() if entry.expires_at <= now]:
+            self._remove(key)
+            self.expirations += 1
+        while self._over():
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _over(self) -> bool:
+        if self.bytes > self.max_bytes:
+            return True
+        return self.max_entries is not None and len(self._entries) > self.max_entries
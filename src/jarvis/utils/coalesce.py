@@ -0,0 +1,150 @@
+"""동일한 도구 호출 합치기와 짧은 결과 캐시.
+
+읽기 도구에서 (도구 이름, 정규화한 인자)가 같은 호출이 동시에 들어오면 업스트림 요청 하나를
+함께 기다리고, 끝난 결과는 RESULT_TTL초(단건·설정성 조회는 DETAIL_TTL초) 동안 재사용한다.
+결과마다 태그(바뀌면 결과가 달라지는 대상)를 붙여 두고, 쓰기 도구가 끝나면 자기가 바꾼 대상의
+태그가 붙은 결과만 지운다. 캐시 전체 크기는 RESULT_CACHE_BYTES를 넘지 않는다.
+
+캐시 적중과 합류는 실제 실행(@threaded)을 거치지 않으므로 여기서 도구 호출로 따로 계측한다.
+
+모든 상태는 이벤트 루프 스레드에서만 다루므로 잠금이 필요 없다.
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+import os
+from collections.abc import Callable, Iterable
+
+from jarvis.utils.cache import TTLCache
+from jarvis.utils.metrics import record_cache, tool_call
+
+# 0이면 결과를 캐시하지 않고 동시에 들어온 호출만 합친다
+RESULT_TTL = float(os.getenv("JARVIS_RESULT_TTL", "10"))
+# 쓰기 도구가 정확히 지워 주는 단건 조회(get_*)와 거의 바뀌지 않는 목록(라벨, 캘린더)
+DETAIL_TTL = float(os.getenv("JARVIS_DETAIL_TTL", "300"))
+RESULT_CACHE_BYTES = int(float(os.getenv("JARVIS_RESULT_CACHE_MB", "16")) * 1024 * 1024)
+MAX_ENTRIES = 1024
+
+Tag = tuple
+TagFunc = Callable[[dict], Iterable[Tag]]
+
+
+class _Flight:
+    """진행 중인 호출 하나. 끝나기 전에 관련 쓰기가 있으면 결과를 캐시하지 않는다."""
+
+    __slots__ = ("task", "tags", "cacheable")
+
+    def __init__(self, task: asyncio.Future, tags: frozenset[Tag]):
+        self.task = task
+        self.tags = tags
+        self.cacheable = True
+
+
+_inflight: dict[tuple, _Flight] = {}
+_results = TTLCache(RESULT_CACHE_BYTES, MAX_ENTRIES)
+_MISSING = object()
+
+
+def _arguments(signature: inspect.Signature, args, kwargs) -> dict:
+    """기본값까지 채운 인자. 인자를 생략한 호출과 기본값을 명시한 호출을 같게 본다."""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return dict(bound.arguments)
+
+
+def _key(name: str, arguments: dict) -> tuple:
+    return name, json.dumps(arguments, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _land(key: tuple, flight: _Flight, detail: bool, task: asyncio.Future) -> None:
+    """호출이 끝나면 진행 목록에서 빼고, 성공했으면 결과를 캐시한다."""
+    if _inflight.get(key) is flight:
+        del _inflight[key]
+    if task.cancelled() or task.exception() is not None:
+        return
+    if flight.cacheable:
+        # RESULT_TTL이 0이면 단건 조회도 캐시하지 않는다
+        ttl = DETAIL_TTL if detail and RESULT_TTL > 0 else RESULT_TTL
+        _results.put(key, task.result(), ttl, flight.tags)
+
+
+def coalesced(tags: TagFunc, detail: bool = False):
+    """읽기 도구를 감싼다. tags(인자)는 결과를 무효화할 태그 목록을 반환한다.
+
+    detail이면 DETAIL_TTL 동안 캐시한다. 관련 쓰기 도구가 모두 태그를 지우는 조회에만 쓴다.
+    @mcp.tool()과 @threaded 사이에 붙여 쓴다.
+    """
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            arguments = _arguments(signature, args, kwargs)
+            key = _key(fn.__name__, arguments)
+
+            result = _results.get(key, _MISSING)
+            if result is not _MISSING:
+                with tool_call(fn.__name__, outcome="hit"):
+                    record_cache("tool_results", hits=1)
+                return result
+
+            flight = _inflight.get(key)
+            if flight is not None:
+                with tool_call(fn.__name__, outcome="joined"):
+                    record_cache("tool_inflight", hits=1)
+                    # 먼저 온 호출이 취소되어도 같이 기다리는 호출은 결과를 받는다
+                    return await asyncio.shield(flight.task)
+
+            # 실행 계측은 감싼 도구(@threaded)가 한다
+            record_cache("tool_results", misses=1)
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            flight = _inflight[key] = _Flight(task, frozenset(tags(arguments)))
+            task.add_done_callback(functools.partial(_land, key, flight, detail))
+            return await asyncio.shield(flight.task)
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate(*tags: Tag) -> None:
+    """태그가 하나라도 겹치는 캐시 결과를 지우고, 진행 중인 호출은 캐시하지 않게 한다."""
+    targets = set(tags)
+    _results.invalidate(targets)
+    for key, flight in list(_inflight.items()):
+        if flight.tags & targets:
+            flight.cacheable = False
+            # 쓰기 이후에 들어오는 호출은 쓰기 전에 시작한 요청에 합류하지 않는다
+            del _inflight[key]
+
+
+def invalidates(tags: TagFunc):
+    """쓰기 도구를 감싼다. 실행이 끝나면(실패해도) tags(인자)에 해당하는 결과를 지운다."""
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            arguments = _arguments(signature, args, kwargs)
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                invalidate(*tags(arguments))
+
+        return wrapper
+
+    return decorator
+
+
+def clear() -> None:
+    """캐시된 결과를 모두 지운다."""
+    _results.clear()
+
+
+def cache_stats() -> dict:
+    """결과 캐시의 항목 수, 크기, 적중/실패, 내보낸 수."""
+    return _results.stats()
@@ -0,0 +1,50 @@
+"""블로킹 I/O 도구를 이벤트 루프 밖에서 실행하는 유틸리티.
+
+httplib2/requests 기반 도구를 크기가 제한된 스레드 풀에서 실행해
+동시에 들어온 도구 호출이 서로를 기다리지 않게 한다.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from jarvis.utils.metrics import tool_call
+
+MAX_WORKERS = int(os.getenv("JARVIS_MAX_WORKERS", "8"))
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="jarvis")
+
+# 도구 안에서 보내는 하위 요청용 풀. 도구 풀을 같이 쓰면 도구가 모든 워커를 차지한 채
+# 자기 하위 요청을 기다리다 멈출 수 있다.
+_fanout_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="jarvis-fanout")
+
+
+async def run_blocking(fn, /, *args, **kwargs):
+    """블로킹 함수를 스레드 풀에서 실행하고 결과를 기다린다."""
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, fn, *args, **kwargs)
+    return await loop.run_in_executor(_executor, call)
+
+
+def submit(fn, /, *args, **kwargs) -> Future:
+    """도구 안에서 하위 요청을 병렬로 실행한다."""
+    ctx = contextvars.copy_context()
+    return _fanout_executor.submit(ctx.run, fn, *args, **kwargs)
+
+
+def threaded(fn):
+    """동기 도구 함수를 스레드 풀에서 실행되는 async 함수로 감싼다.
+
+    시그니처와 docstring은 그대로 유지되므로 @mcp.tool() 아래에 붙여 쓴다.
+    호출마다 대기 시간을 포함한 전체 시간과 업스트림 요청 등을 계측한다.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        with tool_call(fn.__name__):
+            return await run_blocking(fn, *args, **kwargs)
+
+    return wrapper
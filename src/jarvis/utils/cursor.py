@@ -0,0 +1,135 @@
+"""목록 도구의 이어보기 커서.
+
+목록 도구는 max_results개씩 한 페이지만 돌려주고, 뒤에 더 있으면 커서를 함께 준다.
+커서는 (도구 이름, 조회 조건 지문, 업스트림 위치)를 담은 불투명 문자열이며, 위치는 도구마다
+다르다(pageToken, GraphQL endCursor, REST next 링크, 로컬 저장소 오프셋). 호스트는 커서를
+해석하지 않고 다음 호출에 그대로 넘기기만 하면 되고, 서버는 페이지 하나 분량만 메모리에 둔다.
+"""
+
+import base64
+import hashlib
+import json
+from collections.abc import Callable, Iterator
+from typing import Any
+
+INVALID_CURSOR = "cursor가 이 조회 조건과 맞지 않습니다. cursor 없이 처음부터 다시 조회하세요."
+
+# 스트림 위치: [페이지 키, 그 페이지에서 건너뛸 항목 수]. 페이지 키 None은 첫 페이지다.
+Position = list
+
+# fetch(페이지 키, 요청할 개수) → (항목 목록, 다음 페이지 키 또는 None)
+Fetch = Callable[[Any, int], tuple[list, Any]]
+
+
+def _fingerprint(filters: dict) -> str:
+    data = json.dumps(filters, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()[:12]
+
+
+def encode_cursor(tool: str, filters: dict, state: object) -> str:
+    """다음 페이지 위치를 커서 문자열로 만든다."""
+    data = json.dumps([tool, _fingerprint(filters), state], separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None, tool: str, filters: dict) -> object | None:
+    """커서에서 위치를 꺼낸다. 커서가 없으면 None.
+
+    다른 도구나 다른 조회 조건으로 만든 커서, 깨진 커서는 ValueError를 던진다.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        name, fingerprint, state = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise ValueError("잘못된 cursor") from e
+    if name != tool or fingerprint != _fingerprint(filters):
+        raise ValueError("다른 조회의 cursor")
+    return state
+
+
+def with_cursor(text: str, cursor: str | None) -> str:
+    """포맷된 목록 뒤에 다음 페이지 커서 안내를 붙인다."""
+    if cursor is None:
+        return text
+    return f"{text}\n\n(다음 페이지가 있습니다. cursor=\"{cursor}\"로 이어서 조회하세요.)"
+
+
+class PageStream:
+    """페이지로 나뉜 목록을 항목 하나씩 읽는 스트림.
+
+    필요할 때만 다음 페이지를 받고, 앞에서부터 몇 개를 썼는지 알려 주면 이어서 읽을 위치를
+    돌려준다. 위치에 건너뛸 수가 페이지보다 크면 다음 페이지로 넘겨 계속 건너뛴다.
+    """
+
+    def __init__(
+        self,
+        fetch: Fetch,
+        want: int,
+        position: Position | None = None,
+        more: Callable[[], bool] | None = None,
+    ):
+        self._fetch = fetch
+        self._want = want
+        self._page, self._skip = position or (None, 0)
+        # 다음 페이지를 받기 전에 확인한다. False면 남은 페이지는 다음 커서로 미룬다.
+        self._more = more
+        # (시작 번호, 페이지 키, 건너뛴 수, 항목 수, 다음 페이지 키)
+        self._pages: list[tuple[int, Any, int, int, Any]] = []
+        self._fetched = 0
+        self._first: list | None = None
+
+    def _load(self, page, skip: int) -> list:
+        while True:
+            items, next_page = self._fetch(page, skip + max(self._want - self._fetched, 1))
+            if skip < len(items) or next_page is None:
+                break
+            skip -= len(items)
+            page = next_page
+        items = items[skip:]
+        self._pages.append((self._fetched, page, skip, len(items), next_page))
+        self._fetched += len(items)
+        return items
+
+    def open(self) -> "PageStream":
+        """첫 페이지를 받아 둔다. 여러 스트림을 동시에 열 때 스레드에서 부른다."""
+        if self._first is None:
+            self._first = self._load(self._page, self._skip)
+        return self
+
+    def __iter__(self) -> Iterator:
+        self.open()
+        items = self._first
+        while True:
+            yield from items
+            next_page = self._pages[-1][4]
+            if next_page is None or (self._more is not None and not self._more()):
+                return
+            items = self._load(next_page, 0)
+
+    def position(self, consumed: int) -> Position | None:
+        """앞에서부터 consumed개를 쓴 뒤 이어서 읽을 위치. 더 읽을 것이 없으면 None."""
+        for start, page, skip, count, _ in self._pages:
+            if consumed < start + count:
+                return [page, skip + consumed - start]
+        next_page = self._pages[-1][4] if self._pages else None
+        return None if next_page is None else [next_page, 0]
+
+
+def take_page(
+    stream: PageStream, max_results: int, keep: Callable[[Any], bool] | None = None
+) -> tuple[list, Position | None]:
+    """스트림에서 조건에 맞는 항목을 최대 max_results개 꺼내고 다음 위치를 함께 반환한다."""
+    items = []
+    consumed = 0
+    if max_results > 0:
+        for item in stream:
+            consumed += 1
+            if keep is None or keep(item):
+                items.append(item)
+                if len(items) >= max_results:
+                    break
+    else:
+        stream.open()
+    return items, stream.position(consumed)
@@ -0,0 +1,109 @@
+"""Google API partial response(fields=) 마스크.
+
+각 마스크는 formatting 모듈의 포맷터가 실제로 읽는 필드만 담는다.
+포맷터가 새 필드를 읽기 시작하면 여기 마스크도 함께 갱신해야 한다.
+"""
+
+# 일정 목록·검색 (format_event_list + 페이지 이어받기)
+EVENT_PAGE_FIELDS = "nextPageToken,items(summary,start,end,location)"
+
+# format_event (detailed=True)
+EVENT_FIELDS = "id,summary,start,end,location,description,attendees/email,htmlLink"
+
+# Calendar 로컬 저장소 동기화 (format_event detailed + 반복 일정 전개/삭제 반영에 필요한 필드)
+EVENT_SYNC_FIELDS = (
+    "nextPageToken,nextSyncToken,timeZone,"
+    "items(id,status,summary,start,end,location,description,attendees/email,htmlLink,"
+    "recurrence,recurringEventId,originalStartTime)"
+)
+
+# find_free_slots (캘린더별 바쁜 구간 + 조회 오류)
+FREEBUSY_FIELDS = "calendars"
+
+# format_calendar_list
+CALENDAR_LIST_FIELDS = "items(id,summary,primary)"
+
+# 여러 캘린더 병합 조회 시 대상 캘린더 (종일 일정 정렬에 캘린더 시간대가 필요하다)
+CALENDAR_IDS_FIELDS = "nextPageToken,items(id,primary,timeZone)"
+
+# messages().list 결과에서는 메일 ID와 다음 페이지 토큰만 사용한다
+MESSAGE_ID_PAGE_FIELDS = "nextPageToken,messages/id"
+
+# format_message_list
+MESSAGE_LIST_FIELDS = "id,snippet,payload/headers"
+MESSAGE_LIST_HEADERS = ["Subject", "From", "Date"]
+
+# Gmail 로컬 미러에 저장하는 필드 (format_message_list + 라벨/정렬 정보 + 색인할 본문)
+MIRROR_MESSAGE_FIELDS = "id,threadId,labelIds,snippet,internalDate,payload"
+
+# 목록 조회 중 미러에 없던 메일을 채울 때 (format=metadata라 본문은 색인하지 않는다)
+MIRROR_METADATA_FIELDS = "id,threadId,labelIds,snippet,internalDate,payload/headers"
+
+# format_message
+MESSAGE_FIELDS = "id,threadId,payload"
+
+# save_attachments / download_attachment: 첨부 파트의 이름·ID·크기만 받고 본문 data는 받지 않는다.
+# fields에는 재귀 표현이 없으므로 MIME 트리 깊이만큼 parts(...)를 중첩한다. 이보다 깊은 메일이나
+# 내용이 body.data에 든 첨부는 MESSAGE_FIELDS로 다시 받는다.
+_ATTACHMENT_PART_FIELDS = "partId,filename,mimeType,body(attachmentId,size)"
+_ATTACHMENT_DEPTH = 6
+ATTACHMENT_FIELDS = _ATTACHMENT_PART_FIELDS
+for _ in range(_ATTACHMENT_DEPTH):
+    ATTACHMENT_FIELDS = f"{_ATTACHMENT_PART_FIELDS},parts({ATTACHMENT_FIELDS})"
+ATTACHMENT_FIELDS = f"id,payload({ATTACHMENT_FIELDS})"
+
+# messages.attachments.get
+ATTACHMENT_DATA_FIELDS = "data"
+
+# format_label_list
+LABEL_LIST_FIELDS = "labels(id,name,type)"
+
+
+def parse_field_mask(mask: str) -> dict:
+    """fields 마스크 문자열을 중첩 dict 트리로 변환한다.
+
+    빈 dict는 해당 필드 전체를 의미한다.
+    예: "items(id,start/dateTime)" → {"items": {"id": {}, "start": {"dateTime": {}}}}
+    """
+    tree, _ = _parse_fields(mask.replace(" ", ""), 0)
+    return tree
+
+
+def _parse_fields(mask: str, pos: int) -> tuple[dict, int]:
+    """pos부터 닫는 괄호 또는 문자열 끝까지의 필드 목록을 파싱한다."""
+    tree: dict = {}
+    while pos < len(mask):
+        end = pos
+        while end < len(mask) and mask[end] not in ",()":
+            end += 1
+
+        node = tree
+        for name in mask[pos:end].split("/"):
+            node = node.setdefault(name, {})
+        pos = end
+
+        if pos < len(mask) and mask[pos] == "(":
+            sub, pos = _parse_fields(mask, pos + 1)
+            node.update(sub)
+        if pos < len(mask) and mask[pos] == ")":
+            return tree, pos + 1
+        if pos < len(mask) and mask[pos] == ",":
+            pos += 1
+
+    return tree, pos
+
+
+def project(resource, mask: str | dict):
+    """API 서버가 하듯 리소스에서 마스크에 포함된 필드만 남긴다."""
+    tree = parse_field_mask(mask) if isinstance(mask, str) else mask
+    if not tree:
+        return resource
+    if isinstance(resource, list):
+        return [project(item, tree) for item in resource]
+    if isinstance(resource, dict):
+        return {
+            key: project(resource[key], subtree)
+            for key, subtree in tree.items()
+            if key in resource
+        }
+    return resource
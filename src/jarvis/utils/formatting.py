@@ -1,8 +1,12 @@
 """응답 포맷팅 유틸리티."""
 
-import base64
+from datetime import datetime
 
+from jarvis.utils.metrics import timed_formatting
+from jarvis.utils.mime import ParsedMessage
 
+
+@timed_formatting
 def format_event(event: dict, detailed: bool = False) -> str:
     """캘린더 이벤트를 포맷팅한다."""
     summary = event.get("summary", "(제목 없음)")
@@ -37,12 +41,14 @@ def format_event(event: dict, detailed: bool = False) -> str:
     return "\n".join(lines)
 
 
+@timed_formatting
 def format_event_list(events: list[dict]) -> str:
     """이벤트 목록을 포맷팅한다."""
     formatted = [format_event(e) for e in events]
     return f"총 {len(events)}개 일정:\n\n" + "\n\n".join(formatted)
 
 
+@timed_formatting
 def format_calendar_list(calendars: list[dict]) -> str:
     """캘린더 목록을 포맷팅한다."""
     lines = [f"총 {len(calendars)}개 캘린더:"]
@@ -54,21 +60,45 @@ def format_calendar_list(calendars: list[dict]) -> str:
     return "\n".join(lines)
 
 
+_WEEKDAYS = "월화수목금토일"
+
+
+@timed_formatting
+def format_free_slots(slots: list[tuple[float, float]], tz, unavailable: dict[str, str]) -> str:
+    """빈 시간 후보를 포맷팅한다. unavailable은 바쁜 시간을 확인하지 못한 캘린더 → 사유."""
+    if slots:
+        lines = [f"빈 시간 {len(slots)}개 ({tz.key}):"]
+    else:
+        lines = ["조건에 맞는 빈 시간이 없습니다."]
+    for start, end in slots:
+        start_dt = datetime.fromtimestamp(start, tz)
+        end_dt = datetime.fromtimestamp(end, tz)
+        minutes = int((end - start) // 60)
+        lines.append(
+            f"  - {start_dt:%Y-%m-%d} ({_WEEKDAYS[start_dt.weekday()]}) "
+            f"{start_dt:%H:%M} ~ {end_dt:%H:%M} ({minutes}분)"
+        )
+    if unavailable:
+        lines.append("")
+        lines.append("⚠️ 일정을 확인하지 못한 캘린더 (결과에 반영되지 않음):")
+        for calendar_id, reason in unavailable.items():
+            lines.append(f"  - {calendar_id}: {reason}")
+    return "\n".join(lines)
+
+
 def _get_header(message: dict, name: str) -> str:
-    """메일 헤더에서 특정 필드를 추출한다."""
-    headers = message.get("payload", {}).get("headers", [])
-    for header in headers:
-        if header["name"].lower() == name.lower():
-            return header["value"]
-    return ""
+    """메일 헤더에서 특정 필드를 추출한다. 여러 필드를 읽을 때는 ParsedMessage를 쓴다."""
+    return ParsedMessage(message).header(name)
 
 
+@timed_formatting
 def format_message(message: dict) -> str:
     """메일을 상세 포맷팅한다."""
-    subject = _get_header(message, "Subject") or "(제목 없음)"
-    from_addr = _get_header(message, "From")
-    to_addr = _get_header(message, "To")
-    date = _get_header(message, "Date")
+    parsed = ParsedMessage(message)
+    subject = parsed.header("Subject") or "(제목 없음)"
+    from_addr = parsed.header("From")
+    to_addr = parsed.header("To")
+    date = parsed.header("Date")
 
     lines = [
         f"📧 {subject}",
@@ -79,20 +109,28 @@ def format_message(message: dict) -> str:
         f"  스레드 ID: {message.get('threadId', '')}",
     ]
 
-    body = _extract_body(message)
+    attachments = [
+        f"{part['filename']} ({part['body'].get('size', 0):,}바이트)" for part in parsed.attachments()
+    ]
+    if attachments:
+        lines.append(f"  첨부: {', '.join(attachments)}")
+
+    body = parsed.body()
     if body:
         lines.append(f"\n--- 본문 ---\n{body}")
 
     return "\n".join(lines)
 
 
+@timed_formatting
 def format_message_list(messages: list[dict]) -> str:
     """메일 목록을 포맷팅한다."""
     lines = [f"총 {len(messages)}개 메일:"]
     for msg in messages:
-        subject = _get_header(msg, "Subject") or "(제목 없음)"
-        from_addr = _get_header(msg, "From")
-        date = _get_header(msg, "Date")
+        parsed = ParsedMessage(msg)
+        subject = parsed.header("Subject") or "(제목 없음)"
+        from_addr = parsed.header("From")
+        date = parsed.header("Date")
         snippet = msg.get("snippet", "")
         msg_id = msg.get("id", "")
 
@@ -105,6 +143,7 @@ def format_message_list(messages: list[dict]) -> str:
     return "\n".join(lines)
 
 
+@timed_formatting
 def format_label_list(labels: list[dict]) -> str:
     """라벨 목록을 포맷팅한다."""
     system_labels = []
@@ -132,6 +171,7 @@ def format_label_list(labels: list[dict]) -> str:
     return "\n".join(lines)
 
 
+@timed_formatting
 def format_repo(repo) -> str:
     """GitHub 저장소를 포맷팅한다."""
     lines = [
@@ -146,12 +186,14 @@ def format_repo(repo) -> str:
     return "\n".join(lines)
 
 
+@timed_formatting
 def format_repo_list(repos: list) -> str:
     """저장소 목록을 포맷팅한다."""
     formatted = [format_repo(r) for r in repos]
     return f"총 {len(repos)}개 저장소:\n\n" + "\n\n".join(formatted)
 
 
+@timed_formatting
 def format_issue(issue, detailed: bool = False) -> str:
     """GitHub 이슈를 포맷팅한다."""
     state_icon = "🟢" if issue.state == "open" else "🔴"
@@ -178,12 +220,14 @@ def format_issue(issue, detailed: bool = False) -> str:
     return "\n".join(lines)
 
 
+@timed_formatting
 def format_issue_list(issues: list) -> str:
     """이슈 목록을 포맷팅한다."""
     formatted = [format_issue(i) for i in issues]
     return f"총 {len(issues)}개 이슈:\n\n" + "\n\n".join(formatted)
 
 
+@timed_formatting
 def format_pull_request(pr, detailed: bool = False) -> str:
     """GitHub PR을 포맷팅한다."""
     state_icon = "🟢" if pr.state == "open" else ("🟣" if pr.merged else "🔴")
@@ -208,12 +252,14 @@ def format_pull_request(pr, detailed: bool = False) -> str:
     return "\n".join(lines)
 
 
+@timed_formatting
 def format_pull_request_list(prs: list) -> str:
     """PR 목록을 포맷팅한다."""
     formatted = [format_pull_request(p) for p in prs]
     return f"총 {len(prs)}개 PR:\n\n" + "\n\n".join(formatted)
 
 
+@timed_formatting
 def format_notification_list(notifications: list) -> str:
     """알림 목록을 포맷팅한다."""
     if not notifications:
@@ -233,24 +279,55 @@ def format_notification_list(notifications: list) -> str:
     return "\n".join(lines)
 
 
-def _extract_body(message: dict) -> str:
-    """메일 본문을 추출한다."""
-    payload = message.get("payload", {})
+def _extract_body(message: dict, limit: int | None = None) -> str:
+    """메일 본문을 추출한다. limit(바이트)을 주면 그만큼만 디코딩한다."""
+    return ParsedMessage(message).body(limit)
+
 
-    if "body" in payload and payload["body"].get("data"):
-        return base64.urlsafe_b64decode(payload["body"]["data"]).decode("utf-8")
+def _clock(when: dict) -> str:
+    """시작/종료 시각의 HH:MM. 종일 일정(date만 있음)이면 빈 문자열."""
+    return when.get("dateTime", "")[11:16]
 
-    parts = payload.get("parts", [])
-    for part in parts:
-        if part.get("mimeType") == "text/plain":
-            data = part.get("body", {}).get("data", "")
-            if data:
-                return base64.urlsafe_b64decode(data).decode("utf-8")
 
-    for part in parts:
-        if part.get("mimeType") == "text/html":
-            data = part.get("body", {}).get("data", "")
-            if data:
-                return base64.urlsafe_b64decode(data).decode("utf-8")
+def _briefing_section(title: str, section, line) -> list[str]:
+    """브리핑 영역 하나. section은 (항목, 더 있는지) 또는 가져오지 못한 사유다."""
+    if isinstance(section, str):
+        return [f"{title}: {section}"]
+    items, more = section
+    if not items:
+        return [f"{title} 없음"]
+    lines = [f"{title} {len(items)}개{'+' if more else ''}"]
+    lines.extend(f"  - {line(item)}" for item in items)
+    return lines
 
-    return ""
+
+def _briefing_event(event: dict) -> str:
+    start = _clock(event.get("start", {}))
+    end = _clock(event.get("end", {}))
+    when = f"{start}~{end}" if start else "종일"
+    location = event.get("location")
+    place = f" @{location}" if location else ""
+    return f"{when} {event.get('summary', '(제목 없음)')}{place}"
+
+
+def _briefing_message(message: dict) -> str:
+    parsed = ParsedMessage(message)
+    subject = parsed.header("Subject") or "(제목 없음)"
+    return f"{parsed.header('From')}: {subject} [{message.get('id', '')}]"
+
+
+def _briefing_notification(n) -> str:
+    return f"[{n.repository.full_name}] {n.subject.title} ({n.reason})"
+
+
+@timed_formatting
+def format_briefing(day: str, events, messages, notifications) -> str:
+    """일정·안 읽은 메일·알림을 항목당 한 줄로 합친 브리핑을 포맷팅한다.
+
+    각 영역은 (항목 목록, 더 있는지) 또는 가져오지 못한 사유 문자열이다.
+    """
+    lines = [f"📋 {day} 브리핑", ""]
+    lines += _briefing_section("📅 일정", events, _briefing_event)
+    lines += _briefing_section("📧 안 읽은 메일", messages, _briefing_message)
+    lines += _briefing_section("🔔 GitHub 알림", notifications, _briefing_notification)
+    return "\n".join(lines)
@@ -0,0 +1,283 @@
+"""도구 호출 계측.
+
+도구 호출마다 전체 시간, 업스트림 요청 수, 받은 바이트, 캐시 적중, 포맷팅 시간을 모아
+고정 버킷 히스토그램에 쌓고, 호출이 실제로 실행됐는지(run) 결과 캐시에서 답했는지(hit)
+진행 중인 같은 호출에 합류했는지(joined)를 결과별로 센다. API별 업스트림 요청과 캐시별 적중률도 함께 센다.
+jarvis://metrics 리소스(JSON)와 jarvis://metrics/prometheus(텍스트)로 조회한다.
+"""
+
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# 버킷 상한. 마지막 버킷(+Inf)은 자동으로 붙는다.
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500)
+BYTES_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+
+_INF = "+Inf"
+
+
+class Histogram:
+    """상한이 고정된 버킷 히스토그램. 값 v는 v <= 상한인 첫 버킷에 들어간다."""
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float | str | None:
+        """q 분위수가 들어 있는 버킷의 상한. 관측값이 없으면 None."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return _INF
+
+    def cumulative(self) -> list[tuple[float | str, int]]:
+        """(상한, 상한 이하 누적 개수) 목록. Prometheus 버킷 형식이다."""
+        result = []
+        seen = 0
+        for bound, count in zip((*self.bounds, _INF), self.counts):
+            seen += count
+            result.append((bound, seen))
+        return result
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": {str(bound): count for bound, count in self.cumulative()},
+        }
+
+
+# 도구 호출 하나에서 측정하는 값: (이름, 버킷)
+_TOOL_SERIES = {
+    "duration_ms": LATENCY_BUCKETS_MS,
+    "upstream_requests": COUNT_BUCKETS,
+    "bytes_received": BYTES_BUCKETS,
+    "cache_hits": COUNT_BUCKETS,
+    "formatting_ms": LATENCY_BUCKETS_MS,
+}
+
+_lock = threading.Lock()
+_tools: dict[str, dict[str, Histogram]] = {}
+_tool_errors: dict[str, int] = {}
+_tool_outcomes: dict[str, dict[str, int]] = {}
+_upstream: dict[str, dict] = {}
+_caches: dict[str, dict[str, int]] = {}
+
+
+class _CallStats:
+    """진행 중인 도구 호출 하나의 집계. 하위 요청 스레드와 공유한다."""
+
+    __slots__ = ("lock", "upstream_requests", "bytes_received", "cache_hits", "formatting_ms")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.upstream_requests = 0
+        self.bytes_received = 0
+        self.cache_hits = 0
+        self.formatting_ms = 0.0
+
+
+# submit()/run_blocking()은 컨텍스트를 복사하므로 하위 요청 스레드에서도 같은 집계가 보인다
+_current: contextvars.ContextVar[_CallStats | None] = contextvars.ContextVar(
+    "jarvis_tool_call", default=None
+)
+_formatting: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "jarvis_formatting", default=False
+)
+
+
+@contextmanager
+def tool_call(name: str, outcome: str = "run"):
+    """도구 호출 하나를 측정한다. 안에서 일어난 업스트림 요청·캐시 적중이 이 호출에 더해진다.
+
+    outcome은 호출이 어떻게 처리됐는지(run / hit / joined)를 나타낸다.
+    """
+    stats = _CallStats()
+    token = _current.set(stats)
+    started = time.perf_counter()
+    failed = False
+    try:
+        yield stats
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        _current.reset(token)
+        duration_ms = (time.perf_counter() - started) * 1000
+        with _lock:
+            series = _tools.get(name)
+            if series is None:
+                series = _tools[name] = {k: Histogram(b) for k, b in _TOOL_SERIES.items()}
+            series["duration_ms"].observe(duration_ms)
+            series["upstream_requests"].observe(stats.upstream_requests)
+            series["bytes_received"].observe(stats.bytes_received)
+            series["cache_hits"].observe(stats.cache_hits)
+            series["formatting_ms"].observe(stats.formatting_ms)
+            outcomes = _tool_outcomes.setdefault(name, {})
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            if failed:
+                _tool_errors[name] = _tool_errors.get(name, 0) + 1
+
+
+def record_upstream(api: str, seconds: float, nbytes: int, retried: bool = False) -> None:
+    """업스트림 HTTP 요청 하나(재시도 포함 각 시도)를 기록한다."""
+    with _lock:
+        entry = _upstream.get(api)
+        if entry is None:
+            entry = _upstream[api] = {
+                "requests": 0,
+                "retried": 0,
+                "bytes": 0,
+                "duration_ms": Histogram(LATENCY_BUCKETS_MS),
+            }
+        entry["requests"] += 1
+        entry["retried"] += retried
+        entry["bytes"] += nbytes
+        entry["duration_ms"].observe(seconds * 1000)
+
+    stats = _current.get()
+    if stats is not None:
+        with stats.lock:
+            stats.upstream_requests += 1
+            stats.bytes_received += nbytes
+
+
+def record_cache(name: str, hits: int = 0, misses: int = 0) -> None:
+    """캐시 적중/실패를 기록한다."""
+    with _lock:
+        entry = _caches.setdefault(name, {"hits": 0, "misses": 0})
+        entry["hits"] += hits
+        entry["misses"] += misses
+
+    stats = _current.get()
+    if stats is not None and hits:
+        with stats.lock:
+            stats.cache_hits += hits
+
+
+def timed_formatting(fn):
+    """포맷팅 함수에 걸린 시간을 진행 중인 도구 호출에 더한다. 중첩 호출은 바깥만 센다."""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        stats = _current.get()
+        if stats is None or _formatting.get():
+            return fn(*args, **kwargs)
+
+        token = _formatting.set(True)
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            _formatting.reset(token)
+            with stats.lock:
+                stats.formatting_ms += elapsed_ms
+
+    return wrapper
+
+
+def snapshot() -> dict:
+    """모든 지표를 JSON으로 직렬화할 수 있는 dict로 반환한다."""
+    with _lock:
+        return {
+            "tools": {
+                name: {
+                    "errors": _tool_errors.get(name, 0),
+                    "outcomes": dict(sorted(_tool_outcomes.get(name, {}).items())),
+                    **{key: h.snapshot() for key, h in series.items()},
+                }
+                for name, series in sorted(_tools.items())
+            },
+            "upstream": {
+                api: {
+                    "requests": entry["requests"],
+                    "retried": entry["retried"],
+                    "bytes": entry["bytes"],
+                    "duration_ms": entry["duration_ms"].snapshot(),
+                }
+                for api, entry in sorted(_upstream.items())
+            },
+            "caches": {name: dict(entry) for name, entry in sorted(_caches.items())},
+        }
+
+
+def _histogram_lines(metric: str, labels: str, histogram: Histogram) -> list[str]:
+    lines = [
+        f'{metric}_bucket{{{labels},le="{bound}"}} {count}'
+        for bound, count in histogram.cumulative()
+    ]
+    lines.append(f"{metric}_sum{{{labels}}} {histogram.sum:g}")
+    lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+    return lines
+
+
+def prometheus_text() -> str:
+    """Prometheus 텍스트 노출 형식으로 지표를 반환한다."""
+    lines = []
+    with _lock:
+        for key in _TOOL_SERIES:
+            metric = f"jarvis_tool_{key}"
+            lines.append(f"# TYPE {metric} histogram")
+            for name, series in sorted(_tools.items()):
+                lines.extend(_histogram_lines(metric, f'tool="{name}"', series[key]))
+
+        lines.append("# TYPE jarvis_tool_calls_total counter")
+        for name, outcomes in sorted(_tool_outcomes.items()):
+            for outcome, count in sorted(outcomes.items()):
+                lines.append(
+                    f'jarvis_tool_calls_total{{tool="{name}",outcome="{outcome}"}} {count}'
+                )
+
+        lines.append("# TYPE jarvis_tool_errors_total counter")
+        for name, errors in sorted(_tool_errors.items()):
+            lines.append(f'jarvis_tool_errors_total{{tool="{name}"}} {errors}')
+
+        lines.append("# TYPE jarvis_upstream_duration_ms histogram")
+        for api, entry in sorted(_upstream.items()):
+            lines.extend(
+                _histogram_lines("jarvis_upstream_duration_ms", f'api="{api}"', entry["duration_ms"])
+            )
+        for key in ("requests", "retried", "bytes"):
+            metric = f"jarvis_upstream_{key}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for api, entry in sorted(_upstream.items()):
+                lines.append(f'{metric}{{api="{api}"}} {entry[key]}')
+
+        for key in ("hits", "misses"):
+            metric = f"jarvis_cache_{key}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for name, entry in sorted(_caches.items()):
+                lines.append(f'{metric}{{cache="{name}"}} {entry[key]}')
+
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    """모든 지표를 지운다."""
+    with _lock:
+        _tools.clear()
+        _tool_errors.clear()
+        _tool_outcomes.clear()
+        _upstream.clear()
+        _caches.clear()
@@ -0,0 +1,84 @@
+"""Gmail API 메시지 리소스 읽기.
+
+헤더는 처음 찾을 때 한 번만 훑어 이름(소문자) → 값으로 색인하고, 본문은 MIME 트리를 반복문으로
+걸으며 고른 파트 하나만 디코딩한다. limit을 주면 base64 앞부분만 풀어 그 바이트 수까지만
+만든다. 수백 개의 Received 헤더나 수 MB짜리 본문이 있어도 필요한 만큼만 처리한다.
+"""
+
+import base64
+import codecs
+from collections.abc import Iterator
+
+
+def _decode(data: str, limit: int | None) -> str:
+    """base64url 본문을 디코딩한다. limit 바이트를 넘는 뒷부분은 풀지 않는다."""
+    if limit is not None:
+        # base64 4글자 = 3바이트
+        data = data[: -(-limit // 3) * 4]
+    raw = base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+    if limit is None or len(raw) <= limit:
+        return raw.decode("utf-8", errors="replace")
+    # 잘린 끝의 불완전한 멀티바이트 문자는 버린다
+    return codecs.getincrementaldecoder("utf-8")(errors="replace").decode(raw[:limit])
+
+
+class ParsedMessage:
+    """Gmail 메시지 dict 하나를 감싸 헤더 조회와 본문 추출을 제공한다."""
+
+    __slots__ = ("message", "_headers")
+
+    def __init__(self, message: dict):
+        self.message = message
+        self._headers: dict[str, str] | None = None
+
+    @property
+    def payload(self) -> dict:
+        return self.message.get("payload", {})
+
+    def header(self, name: str) -> str:
+        """헤더 값. 같은 이름이 여러 개면 첫 번째, 없으면 빈 문자열."""
+        if self._headers is None:
+            index: dict[str, str] = {}
+            for header in self.payload.get("headers", []):
+                index.setdefault(header["name"].lower(), header["value"])
+            self._headers = index
+        return self._headers.get(name.lower(), "")
+
+    def walk(self) -> Iterator[dict]:
+        """MIME 파트를 문서 순서(깊이 우선)로 돌려준다. 재귀 없이 스택으로 걷는다."""
+        stack = [self.payload]
+        while stack:
+            part = stack.pop()
+            yield part
+            stack.extend(reversed(part.get("parts", ())))
+
+    def body_part(self) -> dict | None:
+        """본문으로 보여줄 파트. text/plain이 먼저, 없으면 text/html. 첨부 파일은 건너뛴다."""
+        html = None
+        for part in self.walk():
+            if part.get("filename") or not part.get("body", {}).get("data"):
+                continue
+            mime_type = part.get("mimeType", "")
+            # mimeType이 없는 단일 파트 메시지는 본문으로 본다
+            if mime_type in ("text/plain", ""):
+                return part
+            if mime_type == "text/html" and html is None:
+                html = part
+        return html
+
+    def attachments(self) -> Iterator[dict]:
+        """첨부 파일 파트를 문서 순서로 돌려준다.
+
+        파일 이름이 있고 attachmentId가 있거나, 작은 첨부처럼 내용이 body.data에 바로 든 파트다.
+        """
+        for part in self.walk():
+            body = part.get("body", {})
+            if part.get("filename") and (body.get("attachmentId") or body.get("data")):
+                yield part
+
+    def body(self, limit: int | None = None) -> str:
+        """본문 텍스트. limit(바이트)을 주면 그만큼만 디코딩한다."""
+        part = self.body_part()
+        if part is None:
+            return ""
+        return _decode(part["body"]["data"], limit)
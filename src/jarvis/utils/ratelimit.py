@@ -0,0 +1,224 @@
+"""업스트림 API 호출 스케줄러.
+
+Calendar/Gmail/GitHub의 모든 HTTP 요청은 API별 스케줄러를 거친다.
+- 토큰 버킷으로 초당 요청 수를 제한하고, 동시에 나가는 요청 수에 상한을 둔다.
+- 429·쿼터 초과 응답은 Retry-After를 지키며 지터를 섞은 지수 백오프로 재시도한다.
+- 응답 헤더로 알 수 있는 남은 쿼터를 기록해 무거운 도구가 작업량을 줄일 수 있게 한다.
+"""
+
+import email.utils
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+from typing import TypeVar
+
+from jarvis.utils.metrics import record_upstream
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+# api: (초당 요청 수, 버스트 크기, 동시 요청 수)
+# Gmail은 사용자당 초당 250 쿼터 단위이고 messages.get이 5단위이므로 초당 50건 미만으로 둔다.
+# GitHub은 시간당 5,000건이지만 짧은 버스트는 허용되므로 남은 쿼터를 보고 조절한다.
+_LIMITS = {
+    "calendar": (10.0, 20, 8),
+    "gmail": (40.0, 100, 8),
+    "github": (10.0, 20, 6),
+}
+_DEFAULT_LIMIT = (10.0, 20, 8)
+
+# api: 쓰기 요청의 초당 수. 읽기 한도와 별도로 쓰기끼리 간격을 둔다.
+# GitHub은 내용을 만드는 요청(POST/PATCH/PUT/DELETE) 사이에 1초 이상 두라고 권장하며,
+# 어기면 2차 속도 제한에 걸린다.
+_WRITE_RATES = {"github": 1.0}
+
+MAX_RETRIES = 5
+# 백오프 기본 간격과 상한(초)
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 32.0
+# 서버가 이보다 오래 기다리라고 하면 재시도하지 않고 응답을 그대로 돌려준다
+MAX_RETRY_WAIT = 60.0
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 capacity개까지 쌓이는 토큰 버킷.
+
+    토큰이 모자라면 먼저 예약(음수 잔량)한 뒤 기다리므로 요청 순서대로 통과한다.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, cost: float = 1) -> float:
+        """토큰 cost개를 가져간다. 기다린 시간(초)을 반환한다."""
+        cost = min(cost, self.capacity)
+        with self._lock:
+            self._refill()
+            self._tokens -= cost
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 바꾼다."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def backoff_delay(attempt: int, retry_after: float = 0.0) -> float:
+    """attempt번째 재시도 전 대기 시간. full jitter 지수 백오프와 Retry-After 중 긴 쪽."""
+    ceiling = min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt)
+    return max(retry_after, random.uniform(0, ceiling))
+
+
+class UpstreamScheduler:
+    """API 하나로 나가는 요청의 속도·동시성·재시도를 관리한다."""
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: int,
+        max_concurrency: int,
+        write_rate: float | None = None,
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self._bucket = TokenBucket(rate, burst)
+        # 쓰기 요청만 따로 거치는 버킷. 버스트 없이 1/write_rate초 간격으로 내보낸다
+        self._writes = TokenBucket(write_rate, 1) if write_rate else None
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._throttled = 0
+        self._quota: dict[str, dict] = {}
+
+    def call(
+        self,
+        send: Callable[[], R],
+        retry_after: Callable[[R], float | None],
+        cost: float = 1,
+        size: Callable[[R], int] | None = None,
+        write: bool = False,
+    ) -> R:
+        """send()를 속도·동시성 제한 아래에서 실행하고, 필요하면 백오프 후 다시 보낸다.
+
+        retry_after(응답)은 재시도할 응답이면 서버가 요청한 대기 시간(없으면 0),
+        아니면 None을 반환한다. 재시도를 다 쓰면 마지막 응답을 그대로 돌려준다.
+        size(응답)은 받은 바이트 수로, 계측에만 쓴다. write면 쓰기 간격 제한도 지킨다.
+        """
+        attempt = 0
+        while True:
+            if write and self._writes is not None:
+                self._writes.acquire()
+            self._bucket.acquire(cost)
+            with self._slots:
+                with self._lock:
+                    self._in_flight += 1
+                started = time.perf_counter()
+                try:
+                    response = send()
+                finally:
+                    with self._lock:
+                        self._in_flight -= 1
+                elapsed = time.perf_counter() - started
+
+            wait = retry_after(response)
+            record_upstream(self.name, elapsed, size(response) if size else 0, wait is not None)
+            if wait is None:
+                return response
+
+            with self._lock:
+                self._throttled += 1
+            if attempt >= MAX_RETRIES or wait > MAX_RETRY_WAIT:
+                return response
+
+            delay = backoff_delay(attempt, wait)
+            logger.info("%s 요청 제한, %.1f초 후 재시도합니다 (%d회째).", self.name, delay, attempt + 1)
+            time.sleep(delay)
+            attempt += 1
+
+    def update_quota(
+        self, resource: str, limit: int | None, remaining: int | None, reset_at: float | None
+    ) -> None:
+        """응답 헤더에서 읽은 쿼터 정보를 기록한다."""
+        with self._lock:
+            self._quota[resource] = {
+                "limit": limit,
+                "remaining": remaining,
+                "reset_at": reset_at,
+            }
+
+    def remaining(self, resource: str = "core") -> int | None:
+        """마지막으로 알려진 남은 쿼터. 모르면 None."""
+        with self._lock:
+            quota = self._quota.get(resource)
+            return quota["remaining"] if quota else None
+
+    def snapshot(self) -> dict:
+        """현재 상태(버킷 잔량, 진행 중 요청, 재시도 횟수, 쿼터)를 반환한다."""
+        with self._lock:
+            return {
+                "tokens": round(self._bucket.available, 2),
+                "in_flight": self._in_flight,
+                "max_concurrency": self.max_concurrency,
+                "throttled": self._throttled,
+                "quota": {k: dict(v) for k, v in self._quota.items()},
+            }
+
+
+_schedulers: dict[str, UpstreamScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(api: str) -> UpstreamScheduler:
+    """API별 프로세스 전역 스케줄러를 반환한다."""
+    with _schedulers_lock:
+        scheduler = _schedulers.get(api)
+        if scheduler is None:
+            rate, burst, concurrency = _LIMITS.get(api, _DEFAULT_LIMIT)
+            scheduler = _schedulers[api] = UpstreamScheduler(
+                api, rate, burst, concurrency, _WRITE_RATES.get(api)
+            )
+        return scheduler
+
+
+def quota_status() -> dict[str, dict]:
+    """모든 API 스케줄러의 현재 상태를 반환한다."""
+    with _schedulers_lock:
+        schedulers = list(_schedulers.values())
+    return {s.name: s.snapshot() for s in schedulers}
+
+
+def low_quota(api: str, resource: str = "core", threshold: int = 100) -> bool:
+    """남은 쿼터가 threshold 미만인지 확인한다. 쿼터를 모르면 False."""
+    remaining = get_scheduler(api).remaining(resource)
+    return remaining is not None and remaining < threshold
@@ -0,0 +1,74 @@
+"""빈 시간 계산 유틸리티.
+
+구간은 (시작, 종료) UTC 타임스탬프 튜플이며 종료는 포함하지 않는다.
+"""
+
+from collections.abc import Iterable
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+Interval = tuple[float, float]
+
+
+def merge_busy(intervals: Iterable[Interval]) -> list[Interval]:
+    """겹치거나 맞닿은 바쁜 구간을 시작 순으로 훑으며(스윕 라인) 하나로 합친다."""
+    merged: list[list[float]] = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def working_windows(
+    first_day: date,
+    last_day: date,
+    work_start: time,
+    work_end: time,
+    tz: ZoneInfo,
+    include_weekends: bool = False,
+) -> list[Interval]:
+    """first_day ~ last_day의 날짜별 근무 시간 구간을 만든다. 서머타임은 벽시계 기준으로 맞춘다."""
+    windows = []
+    day = first_day
+    while day <= last_day:
+        if include_weekends or day.weekday() < 5:
+            start = datetime.combine(day, work_start, tz).timestamp()
+            end = datetime.combine(day, work_end, tz).timestamp()
+            if end > start:
+                windows.append((start, end))
+        day += timedelta(days=1)
+    return windows
+
+
+def free_slots(busy: list[Interval], windows: list[Interval], duration: float) -> list[Interval]:
+    """근무 시간 구간에서 바쁜 구간을 빼고 duration(초) 이상 남는 빈 구간을 반환한다.
+
+    busy는 merge_busy 결과(정렬·병합됨), windows는 시작 순으로 정렬되어 있어야 한다.
+    두 목록을 한 번씩만 훑으므로 O(len(busy) + len(windows))다.
+    """
+    slots = []
+    i = 0
+    for window_start, window_end in windows:
+        while i < len(busy) and busy[i][1] <= window_start:
+            i += 1
+
+        cursor = window_start
+        j = i
+        while j < len(busy) and busy[j][0] < window_end:
+            busy_start, busy_end = busy[j]
+            if busy_start - cursor >= duration:
+                slots.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+            j += 1
+        if window_end - cursor >= duration:
+            slots.append((cursor, window_end))
+
+        # 마지막으로 본 바쁜 구간은 다음 근무 시간까지 이어질 수 있다
+        i = max(i, j - 1)
+
+    return slots
@@ -0,0 +1,173 @@
+"""목록 도구의 간결한 표 출력.
+
+기본 텍스트 포맷터는 항목마다 이모지와 "보낸 사람:", "날짜:" 같은 라벨을 되풀이한다. 표 출력은
+열 이름을 머리글에 한 번만 쓰고 항목마다 값만 나열한다. output="json"이면 {"columns", "rows"}
+JSON을, "tsv"면 머리글 한 줄과 탭으로 구분한 행을 본문으로 보내고, 두 경우 모두 같은 표를
+MCP 구조화 출력(structuredContent)으로 함께 보낸다. 서버 기본값은 JARVIS_OUTPUT_FORMAT이다.
+"""
+
+import json
+import os
+from collections.abc import Callable
+from typing import NamedTuple
+
+from fastmcp.tools import ToolResult
+
+from jarvis.utils.metrics import timed_formatting
+from jarvis.utils.mime import ParsedMessage
+
+OUTPUT_FORMATS = ("text", "json", "tsv")
+# 호출에서 output을 생략했을 때 쓰는 형식
+OUTPUT_FORMAT = os.getenv("JARVIS_OUTPUT_FORMAT", "text")
+
+INVALID_OUTPUT = "output은 text, json, tsv 중 하나여야 합니다."
+
+
+def output_format(output: str | None) -> str:
+    """호출별 output(없으면 서버 기본값)을 확인해 돌려준다. 모르는 형식이면 ValueError."""
+    fmt = (output or OUTPUT_FORMAT).strip().lower()
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"알 수 없는 output: {fmt}")
+    return fmt
+
+
+class Table(NamedTuple):
+    """목록 한 종류의 열 이름과 항목 → 행 변환."""
+
+    columns: tuple[str, ...]
+    row: Callable[[object], list]
+
+
+def _names(items, attr: str) -> str:
+    return ",".join(getattr(item, attr) for item in items)
+
+
+def _when(value) -> str:
+    return value.strftime("%Y-%m-%d %H:%M")
+
+
+def _event_row(event: dict) -> list:
+    start = event.get("start", {})
+    end = event.get("end", {})
+    return [
+        event.get("summary", ""),
+        start.get("dateTime", start.get("date", "")),
+        end.get("dateTime", end.get("date", "")),
+        event.get("location", ""),
+    ]
+
+
+def _message_row(message: dict) -> list:
+    parsed = ParsedMessage(message)
+    return [
+        message.get("id", ""),
+        parsed.header("From"),
+        parsed.header("Date"),
+        parsed.header("Subject"),
+        message.get("snippet", "")[:100],
+    ]
+
+
+def _repo_row(repo) -> list:
+    return [
+        repo.full_name,
+        repo.description or "",
+        repo.language or "",
+        repo.stargazers_count,
+        repo.forks_count,
+        repo.private,
+        repo.default_branch,
+        repo.html_url,
+    ]
+
+
+def _issue_row(issue) -> list:
+    return [
+        issue.number,
+        issue.title,
+        issue.state,
+        issue.user.login,
+        _when(issue.created_at),
+        _names(issue.labels, "name"),
+        _names(issue.assignees, "login"),
+    ]
+
+
+def _pull_request_row(pr) -> list:
+    return [
+        pr.number,
+        pr.title,
+        pr.state,
+        pr.merged,
+        pr.user.login,
+        pr.head.ref,
+        pr.base.ref,
+        _when(pr.created_at),
+        _names(pr.labels, "name"),
+    ]
+
+
+def _notification_row(n) -> list:
+    return [
+        n.unread,
+        n.subject.type,
+        n.subject.title,
+        n.repository.full_name,
+        n.reason,
+        _when(n.updated_at),
+    ]
+
+
+EVENTS = Table(("summary", "start", "end", "location"), _event_row)
+CALENDARS = Table(
+    ("id", "summary", "primary"),
+    lambda cal: [cal.get("id", ""), cal.get("summary", ""), bool(cal.get("primary"))],
+)
+MESSAGES = Table(("id", "from", "date", "subject", "snippet"), _message_row)
+LABELS = Table(
+    ("id", "name", "type"),
+    lambda label: [label.get("id", ""), label.get("name", ""), label.get("type", "")],
+)
+REPOS = Table(
+    ("full_name", "description", "language", "stars", "forks", "private", "default_branch", "url"),
+    _repo_row,
+)
+ISSUES = Table(
+    ("number", "title", "state", "author", "created_at", "labels", "assignees"), _issue_row
+)
+PULL_REQUESTS = Table(
+    ("number", "title", "state", "merged", "author", "head", "base", "created_at", "labels"),
+    _pull_request_row,
+)
+NOTIFICATIONS = Table(
+    ("unread", "type", "title", "repo", "reason", "updated_at"), _notification_row
+)
+
+
+def _tsv_cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    # 셀 안의 탭·줄바꿈은 행 구분과 겹치므로 공백으로 바꾼다
+    return " ".join(str(value).split()) if isinstance(value, str) else str(value)
+
+
+@timed_formatting
+def format_table(table: Table, items: list, output: str, cursor: str | None = None) -> ToolResult:
+    """목록을 output 형식(json/tsv)의 표로 만든다. 다음 페이지가 있으면 cursor를 함께 싣는다."""
+    rows = [table.row(item) for item in items]
+    data = {"columns": list(table.columns), "rows": rows}
+    if cursor is not None:
+        data["cursor"] = cursor
+
+    if output == "tsv":
+        lines = ["\t".join(table.columns)]
+        lines.extend("\t".join(_tsv_cell(v) for v in row) for row in rows)
+        if cursor is not None:
+            lines.append(f"\ncursor={cursor}")
+        text = "\n".join(lines)
+    else:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+    return ToolResult(content=text, structured_content=data)
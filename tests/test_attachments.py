@@ -0,0 +1,107 @@
+"""첨부 파일 스트리밍 저장 테스트."""
+
+import base64
+import hashlib
+import json
+
+import pytest
+
+from jarvis.utils.attachments import decode_data_field, safe_filename, save_stream
+from jarvis.utils.fields import ATTACHMENT_FIELDS, project
+from jarvis.utils.mime import ParsedMessage
+
+
+def _response(content: bytes, **extra) -> bytes:
+    return json.dumps({**extra, "data": base64.urlsafe_b64encode(content).decode()}).encode()
+
+
+def _chunks(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 4096])
+def test_decode_data_field_across_chunk_boundaries(chunk_size):
+    content = bytes(range(256)) * 20 + b"tail"
+    response = _response(content, size=len(content))
+
+    pieces = list(decode_data_field(_chunks(response, chunk_size)))
+
+    assert b"".join(pieces) == content
+    # 조각 하나가 응답 조각보다 커지지 않는다
+    assert max(len(p) for p in pieces) <= max(chunk_size, 4)
+
+
+def test_decode_data_field_errors():
+    with pytest.raises(ValueError):
+        list(decode_data_field([b'{"size": 3}']))
+
+    truncated = _response(b"x" * 300)[:100]
+    with pytest.raises(ValueError):
+        list(decode_data_field(_chunks(truncated, 16)))
+
+
+def test_save_stream_hashes_and_leaves_no_partial_file(tmp_path):
+    path = tmp_path / "m1" / "a.bin"
+
+    size, digest = save_stream([b"abc", b"def"], path)
+
+    assert (size, digest) == (6, hashlib.sha256(b"abcdef").hexdigest())
+    assert path.read_bytes() == b"abcdef"
+
+    def _failing():
+        yield b"partial"
+        raise ValueError("끊김")
+
+    with pytest.raises(ValueError):
+        save_stream(_failing(), tmp_path / "m1" / "b.bin")
+    assert sorted(p.name for p in path.parent.iterdir()) == ["a.bin"]
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("report.pdf", "report.pdf"),
+        ("../../etc/passwd", "passwd"),
+        ("C:\\Users\\me\\문서.hwp", "문서.hwp"),
+        ("a:b*c?.txt", "a_b_c_.txt"),
+        ("..", "fallback"),
+        ("", "fallback"),
+    ],
+)
+def test_safe_filename(name, expected):
+    assert safe_filename(name, "fallback") == expected
+
+
+def test_attachment_mask_keeps_nested_parts_without_bodies():
+    inline = base64.urlsafe_b64encode(b"x" * 1000).decode()
+    message = {
+        "id": "m1",
+        "payload": {
+            "mimeType": "multipart/mixed",
+            "headers": [{"name": "Subject", "value": "첨부"}],
+            "parts": [
+                {
+                    "partId": "0",
+                    "mimeType": "multipart/alternative",
+                    "parts": [{"partId": "0.0", "mimeType": "text/plain", "body": {"data": inline}}],
+                },
+                {
+                    "partId": "1",
+                    "mimeType": "multipart/mixed",
+                    "parts": [
+                        {
+                            "partId": "1.0",
+                            "mimeType": "application/pdf",
+                            "filename": "a.pdf",
+                            "body": {"attachmentId": "att1", "size": 10},
+                        }
+                    ],
+                },
+            ],
+        },
+    }
+
+    projected = project(message, ATTACHMENT_FIELDS)
+
+    assert [p["filename"] for p in ParsedMessage(projected).attachments()] == ["a.pdf"]
+    assert "data" not in json.dumps(projected)
@@ -0,0 +1,90 @@
+"""브리핑 도구 테스트."""
+
+import asyncio
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from jarvis.tools.briefing import _gather_sections
+from jarvis.utils.formatting import format_briefing
+
+
+def _notification(title: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        subject=SimpleNamespace(title=title, type="Issue"),
+        repository=SimpleNamespace(full_name="octo/repo"),
+        reason="mention",
+        unread=True,
+        updated_at=datetime(2026, 1, 1),
+    )
+
+
+def test_gather_sections_keeps_finished_results_and_reports_the_rest():
+    def _fast(value):
+        return value
+
+    def _slow():
+        time.sleep(1)
+        return "늦은 결과"
+
+    def _broken():
+        raise RuntimeError("토큰 만료")
+
+    started = time.perf_counter()
+    sections = asyncio.run(
+        _gather_sections(
+            {"fast": (_fast, ([1], False)), "slow": (_slow,), "broken": (_broken,)},
+            timeout=0.2,
+        )
+    )
+
+    assert time.perf_counter() - started < 0.8
+    assert sections["fast"] == ([1], False)
+    assert sections["slow"].startswith("시간 초과")
+    assert sections["broken"] == "오류 - 토큰 만료"
+
+
+def test_format_briefing_one_line_per_item():
+    events = [
+        {
+            "summary": "주간 회의",
+            "start": {"dateTime": "2026-01-05T09:00:00+09:00"},
+            "end": {"dateTime": "2026-01-05T10:00:00+09:00"},
+            "location": "회의실 A",
+        },
+        {"summary": "휴가", "start": {"date": "2026-01-05"}, "end": {"date": "2026-01-06"}},
+    ]
+    messages = [
+        {
+            "id": "m1",
+            "payload": {
+                "headers": [
+                    {"name": "From", "value": "kim@example.com"},
+                    {"name": "Subject", "value": "견적 요청"},
+                ]
+            },
+        }
+    ]
+
+    text = format_briefing(
+        "2026-01-05", (events, False), (messages, True), "시간 초과 (5초 안에 응답 없음)"
+    )
+
+    assert text.splitlines() == [
+        "📋 2026-01-05 브리핑",
+        "",
+        "📅 일정 2개",
+        "  - 09:00~10:00 주간 회의 @회의실 A",
+        "  - 종일 휴가",
+        "📧 안 읽은 메일 1개+",
+        "  - kim@example.com: 견적 요청 [m1]",
+        "🔔 GitHub 알림: 시간 초과 (5초 안에 응답 없음)",
+    ]
+
+
+def test_format_briefing_empty_sections():
+    text = format_briefing("2026-01-05", ([], False), ([], False), ([_notification("빌드 실패")], False))
+
+    assert "📅 일정 없음" in text
+    assert "📧 안 읽은 메일 없음" in text
+    assert "  - [octo/repo] 빌드 실패 (mention)" in text
@@ -0,0 +1,93 @@
+"""LRU + TTL 캐시 테스트."""
+
+import pytest
+
+from jarvis.utils import cache
+from jarvis.utils.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_sizeof_counts_utf8_bytes():
+    assert cache.sizeof("abc") == 3
+    assert cache.sizeof("메일") == 6
+    assert cache.sizeof(b"\x00" * 5) == 5
+    assert cache.sizeof({"a": 1}) == len('{"a": 1}')
+
+
+def test_hits_misses_and_expiry(clock):
+    c = TTLCache(max_bytes=1000)
+    c.put("k", "value", ttl=10)
+
+    assert c.get("k") == "value"
+    clock[0] += 10
+    assert c.get("k") is None
+
+    stats = c.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+    assert stats["entries"] == 0
+    assert stats["bytes"] == 0
+
+
+def test_evicts_least_recently_used_over_byte_cap(clock):
+    c = TTLCache(max_bytes=10)
+    c.put("a", "aaaa", ttl=60)
+    c.put("b", "bbbb", ttl=60)
+    c.get("a")
+    c.put("c", "cccc", ttl=60)
+
+    assert c.get("b") is None
+    assert c.get("a") == "aaaa"
+    assert c.get("c") == "cccc"
+    assert c.bytes == 8
+    assert c.stats()["evictions"] == 1
+
+
+def test_expired_entries_go_before_live_ones(clock):
+    c = TTLCache(max_bytes=10)
+    c.put("old", "aaaa", ttl=60)
+    c.put("short", "bbbb", ttl=1)
+    clock[0] += 5
+    c.put("new", "cccc", ttl=60)
+
+    assert c.get("old") == "aaaa"
+    assert c.stats()["evictions"] == 0
+    assert c.stats()["expirations"] == 1
+
+
+def test_entry_cap_and_oversized_values(clock):
+    c = TTLCache(max_bytes=100, max_entries=2)
+    for key in "abc":
+        c.put(key, key, ttl=60)
+
+    assert len(c) == 2
+    assert c.get("a") is None
+    # 상한보다 큰 값은 넣지 않고, 같은 키의 이전 값도 남기지 않는다
+    assert c.put("b", "x" * 101, ttl=60) is False
+    assert c.get("b") is None
+    assert c.put("z", "z", ttl=0) is False
+
+
+def test_replacing_a_key_updates_size(clock):
+    c = TTLCache(max_bytes=100)
+    c.put("k", "aaaa", ttl=60)
+    c.put("k", "aa", ttl=60)
+
+    assert c.bytes == 2
+    assert len(c) == 1
+
+
+def test_invalidate_by_tag(clock):
+    c = TTLCache(max_bytes=100)
+    c.put("e1", "x", ttl=60, tags=[("event", "primary", "e1")])
+    c.put("list", "y", ttl=60, tags=[("calendar", "primary")])
+    c.put("other", "z", ttl=60, tags=[("calendar", "team")])
+
+    assert c.invalidate([("calendar", "primary"), ("event", "primary", "e1")]) == 2
+    assert c.get("other") == "z"
+    assert c.stats()["invalidations"] == 2
@@ -1,5 +1,15 @@
 """Google Calendar 도구 테스트."""
 
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastmcp import Client, FastMCP
+
+from jarvis.store.calendar import CalendarStore
+from jarvis.tools import calendar
+from jarvis.tools.calendar import _query_busy, _readable_calendars, timeline_page
+from jarvis.utils import coalesce
 from jarvis.utils.formatting import format_event, format_event_list, format_calendar_list
 
 
@@ -73,3 +83,250 @@ def test_format_calendar_list():
     assert "내 캘린더" in result
     assert "(기본)" in result
     assert "업무" in result
+
+
+# --- 여러 캘린더 병합 조회 ---
+
+
+class _Request:
+    def __init__(self, result):
+        self._result = result
+
+    def execute(self):
+        return self._result
+
+
+class _FakeCalendarService:
+    """calendarList.list / events.list만 흉내내는 Calendar 서비스."""
+
+    def __init__(self, calendars, events, page_size=2):
+        self.calendars = calendars
+        self.events_by_calendar = events
+        self.page_size = page_size
+        self.calls = []
+
+    def calendarList(self):
+        return SimpleNamespace(list=self._list_calendars)
+
+    def _list_calendars(self, minAccessRole, pageToken, fields):
+        return _Request({"items": self.calendars})
+
+    def events(self):
+        return self
+
+    def list(
+        self,
+        calendarId,
+        timeMin,
+        timeMax,
+        maxResults,
+        singleEvents,
+        orderBy,
+        fields,
+        q=None,
+        pageToken=None,
+    ):
+        self.calls.append((calendarId, pageToken))
+        start = int(pageToken or 0)
+        items = self.events_by_calendar[calendarId]
+        if q:
+            items = [e for e in items if q in e["summary"]]
+        # 서버는 maxResults보다 작은 페이지를 돌려줄 수 있다
+        end = start + min(self.page_size, maxResults)
+        result = {"items": items[start:end]}
+        if end < len(items):
+            result["nextPageToken"] = str(end)
+        return _Request(result)
+
+
+def _timed(summary, hour):
+    return {
+        "summary": summary,
+        "start": {"dateTime": f"2025-02-12T{hour:02d}:00:00+09:00"},
+        "end": {"dateTime": f"2025-02-12T{hour:02d}:30:00+09:00"},
+    }
+
+
+def _merge_service():
+    return _FakeCalendarService(
+        calendars=[
+            {"id": "work", "timeZone": "Asia/Seoul"},
+            {"id": "me", "primary": True, "timeZone": "Asia/Seoul"},
+            {"id": "holidays", "timeZone": "Asia/Seoul"},
+        ],
+        events={
+            "me": [_timed("운동", 7), _timed("점심", 12), _timed("저녁 약속", 19)],
+            "work": [
+                _timed("스탠드업", 9),
+                _timed("회의 A", 10),
+                _timed("회의 B", 11),
+                _timed("회의 C", 15),
+            ],
+            "holidays": [
+                {
+                    "summary": "기념일",
+                    "start": {"date": "2025-02-12"},
+                    "end": {"date": "2025-02-13"},
+                }
+            ],
+        },
+    )
+
+
+_DAY = ("2025-02-12T00:00:00+09:00", "2025-02-12T23:59:59+09:00")
+
+
+def test_merged_timeline_orders_across_calendars():
+    service = _merge_service()
+
+    events, _ = timeline_page(service, _readable_calendars(service), *_DAY, 5)
+
+    assert [e["summary"] for e in events] == ["기념일", "운동", "스탠드업", "회의 A", "회의 B"]
+    # 모든 캘린더의 첫 페이지를 받고, 다음 페이지는 병합에 필요한 캘린더만 가져온다
+    assert {c for c, page in service.calls if page is None} == {"me", "work", "holidays"}
+    assert ("work", "2") in service.calls
+    assert ("me", "2") not in service.calls
+
+
+def test_merged_timeline_search():
+    service = _merge_service()
+
+    events, positions = timeline_page(
+        service, _readable_calendars(service), *_DAY, 10, query="회의"
+    )
+
+    assert [e["summary"] for e in events] == ["회의 A", "회의 B", "회의 C"]
+    assert positions == {}
+
+
+def test_merged_timeline_resumes_each_calendar_where_it_stopped():
+    service = _merge_service()
+    calendars = _readable_calendars(service)
+    summaries = []
+    positions = None
+
+    while positions != {}:
+        events, positions = timeline_page(service, calendars, *_DAY, 3, positions=positions)
+        summaries.append([e["summary"] for e in events])
+
+    assert summaries == [
+        ["기념일", "운동", "스탠드업"],
+        ["회의 A", "회의 B", "점심"],
+        ["회의 C", "저녁 약속"],
+    ]
+    # 다 읽은 캘린더는 다음 페이지에서 다시 조회하지 않는다
+    assert ("holidays", None) in service.calls
+    assert service.calls.count(("holidays", None)) == 1
+
+
+# --- 빈 시간 조회 ---
+
+
+class _FakeFreeBusy:
+    def __init__(self, busy):
+        self.busy = busy
+        self.bodies = []
+
+    def freebusy(self):
+        return self
+
+    def query(self, body, fields):
+        self.bodies.append(body)
+        calendars = {}
+        for item in body["items"]:
+            if item["id"] in self.busy:
+                calendars[item["id"]] = {"busy": self.busy[item["id"]]}
+            else:
+                calendars[item["id"]] = {"errors": [{"domain": "global", "reason": "notFound"}]}
+        return _Request({"calendars": calendars})
+
+
+def test_query_busy_chunks_calendars_and_reports_errors():
+    interval = {"start": "2025-02-12T10:00:00+09:00", "end": "2025-02-12T11:00:00+09:00"}
+    ids = [f"user{i}@example.com" for i in range(120)]
+    service = _FakeFreeBusy({calendar_id: [interval] for calendar_id in ids[:-1]})
+
+    busy, unavailable = _query_busy(
+        service, ids, "2025-02-12T00:00:00+09:00", "2025-02-13T00:00:00+09:00"
+    )
+
+    assert sorted(len(body["items"]) for body in service.bodies) == [20, 50, 50]
+    assert len(busy) == 119
+    assert unavailable == {"user119@example.com": "notFound"}
+
+
+# --- 쓰기 후 무효화 ---
+
+
+class _SyncedCalendarService:
+    """기본 캘린더 하나(실제 ID는 이메일)만 있는 Calendar 서비스. 저장소 동기화와 일정 생성을 흉내 낸다."""
+
+    owner = "me@example.com"
+
+    def __init__(self):
+        self.items = [{**_timed("기존 일정", 12), "id": "old", "status": "confirmed"}]
+
+    def calendarList(self):
+        return SimpleNamespace(
+            list=lambda **kwargs: _Request(
+                {"items": [{"id": self.owner, "primary": True, "timeZone": "Asia/Seoul"}]}
+            )
+        )
+
+    def calendars(self):
+        return SimpleNamespace(get=lambda calendarId, fields: _Request({"id": self.owner}))
+
+    def events(self):
+        return SimpleNamespace(list=self._list, insert=self._insert)
+
+    def _list(self, calendarId, singleEvents, maxResults, pageToken, fields, syncToken=None, **kwargs):
+        assert calendarId in ("primary", self.owner)
+        # 변경분 요청에도 전체를 돌려준다. 저장소는 같은 ID를 덮어쓴다
+        return _Request(
+            {"items": list(self.items), "nextSyncToken": "s", "timeZone": "Asia/Seoul"}
+        )
+
+    def _insert(self, calendarId, body):
+        event = {**body, "id": f"e{len(self.items)}", "status": "confirmed"}
+        self.items.append(event)
+        return _Request(event)
+
+
+@pytest.mark.parametrize(
+    "read_id, write_id",
+    [("all", "primary"), ("primary", _SyncedCalendarService.owner), ("all", _SyncedCalendarService.owner)],
+)
+def test_write_invalidates_every_alias_of_the_primary_calendar(monkeypatch, read_id, write_id):
+    service = _SyncedCalendarService()
+    store = CalendarStore(":memory:")
+    monkeypatch.setattr(calendar, "get_store", lambda: store)
+    monkeypatch.setattr(calendar, "get_calendar_service", lambda: service)
+    monkeypatch.setattr(calendar, "_primary_id", None)
+    coalesce.clear()
+    # 최초 동기화는 백그라운드에서 하므로 저장소가 답하도록 미리 동기화해 둔다
+    for calendar_id in ("primary", service.owner):
+        store.sync(service, calendar_id)
+
+    mcp = FastMCP("test")
+    calendar.register_calendar_tools(mcp)
+    day = {"start_date": "2025-02-12", "calendar_id": read_id}
+
+    async def _run():
+        async with Client(mcp) as client:
+            before = await client.call_tool("list_events", day)
+            await client.call_tool(
+                "create_event",
+                {
+                    "summary": "새 일정",
+                    "start_time": "2025-02-12T15:00:00+09:00",
+                    "end_time": "2025-02-12T16:00:00+09:00",
+                    "calendar_id": write_id,
+                },
+            )
+            after = await client.call_tool("list_events", day)
+            return before.content[0].text, after.content[0].text
+
+    before, after = asyncio.run(_run())
+
+    assert "기존 일정" in before and "새 일정" not in before
+    assert "기존 일정" in after and "새 일정" in after
@@ -0,0 +1,452 @@
+"""Calendar 로컬 저장소 테스트."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from jarvis.store.calendar import CalendarStore
+from jarvis.store.recurrence import expand, recurrence_end
+from jarvis.utils.formatting import format_event_list
+
+SEOUL = ZoneInfo("Asia/Seoul")
+
+
+def _ts(value: str) -> float:
+    return datetime.fromisoformat(value).timestamp()
+
+
+def _event(event_id, start, end, summary=None, **extra):
+    key = "dateTime" if "T" in start else "date"
+    return {
+        "id": event_id,
+        "status": "confirmed",
+        "summary": summary or f"일정 {event_id}",
+        "start": {key: start},
+        "end": {key: end},
+        **extra,
+    }
+
+
+class _Request:
+    def __init__(self, result):
+        self._result = result
+
+    def execute(self):
+        if isinstance(self._result, Exception):
+            raise self._result
+        return self._result
+
+
+class _FakeCalendar:
+    """events.list(syncToken) 페이지를 차례로 돌려주는 Calendar 서비스."""
+
+    def __init__(self):
+        self.pages = []
+        self.calls = []
+
+    def events(self):
+        return self
+
+    def list(self, calendarId, singleEvents, maxResults, pageToken, fields, syncToken=None):
+        assert singleEvents is False
+        self.calls.append((calendarId, syncToken, pageToken))
+        return _Request(self.pages.pop(0))
+
+
+@pytest.fixture
+def store():
+    return CalendarStore(":memory:")
+
+
+def _ids(events):
+    return [e["id"] for e in events]
+
+
+def test_full_sync_with_pages_then_list(store):
+    service = _FakeCalendar()
+    service.pages = [
+        {
+            "timeZone": "Asia/Seoul",
+            "items": [_event("b", "2025-02-12T15:00:00+09:00", "2025-02-12T16:00:00+09:00")],
+            "nextPageToken": "p2",
+        },
+        {
+            "items": [
+                _event("a", "2025-02-12T09:00:00+09:00", "2025-02-12T10:00:00+09:00"),
+                _event("holiday", "2025-02-12", "2025-02-13"),
+                _event("later", "2025-02-14T09:00:00+09:00", "2025-02-14T10:00:00+09:00"),
+            ],
+            "nextSyncToken": "s1",
+        },
+    ]
+
+    store.sync(service, "primary")
+
+    assert service.calls == [("primary", None, None), ("primary", None, "p2")]
+    assert store.sync_token("primary") == "s1"
+    day = store.list_events(
+        "primary", _ts("2025-02-12T00:00:00+09:00"), _ts("2025-02-13T00:00:00+09:00"), 10
+    )
+    assert _ids(day) == ["holiday", "a", "b"]
+    assert "일정 a" in format_event_list(day)
+    page = store.list_events(
+        "primary", _ts("2025-02-12T00:00:00+09:00"), _ts("2025-02-13T00:00:00+09:00"), 1, offset=1
+    )
+    assert _ids(page) == ["a"]
+    assert store.list_events("other", 0, 1, 10) is None
+
+
+def test_incremental_sync_applies_deltas(store):
+    service = _FakeCalendar()
+    service.pages = [
+        {
+            "timeZone": "Asia/Seoul",
+            "items": [
+                _event("a", "2025-02-12T09:00:00+09:00", "2025-02-12T10:00:00+09:00"),
+                _event("b", "2025-02-12T11:00:00+09:00", "2025-02-12T12:00:00+09:00"),
+            ],
+            "nextSyncToken": "s1",
+        },
+        {
+            "items": [
+                {"id": "a", "status": "cancelled"},
+                _event("b", "2025-02-12T13:00:00+09:00", "2025-02-12T14:00:00+09:00", "변경됨"),
+                _event("c", "2025-02-12T08:00:00+09:00", "2025-02-12T08:30:00+09:00"),
+            ],
+            "nextSyncToken": "s2",
+        },
+    ]
+    store.sync(service, "primary")
+    store.invalidate("primary")
+
+    assert store.ensure_fresh(service, "primary")
+    assert service.calls[-1] == ("primary", "s1", None)
+    events = store.list_events(
+        "primary", _ts("2025-02-12T00:00:00+09:00"), _ts("2025-02-13T00:00:00+09:00"), 10
+    )
+    assert _ids(events) == ["c", "b"]
+    assert events[1]["summary"] == "변경됨"
+    assert store.sync_token("primary") == "s2"
+
+
+def test_expired_sync_token_triggers_full_resync(store):
+    service = _FakeCalendar()
+    service.pages = [
+        {
+            "timeZone": "UTC",
+            "items": [_event("old", "2025-02-12T09:00:00Z", "2025-02-12T10:00:00Z")],
+            "nextSyncToken": "s1",
+        },
+        HttpError(httplib2.Response({"status": 410}), b""),
+        {
+            "timeZone": "UTC",
+            "items": [_event("new", "2025-02-12T09:00:00Z", "2025-02-12T10:00:00Z")],
+            "nextSyncToken": "s9",
+        },
+    ]
+    store.sync(service, "primary")
+    store.sync(service, "primary")
+
+    assert [c[1] for c in service.calls] == [None, "s1", None]
+    assert store.sync_token("primary") == "s9"
+    events = store.list_events(
+        "primary", _ts("2025-02-12T00:00:00Z"), _ts("2025-02-13T00:00:00Z"), 10
+    )
+    assert _ids(events) == ["new"]
+
+
+def test_sync_failure_falls_back_to_api(store):
+    service = _FakeCalendar()
+    service.pages = [
+        {"timeZone": "UTC", "items": [], "nextSyncToken": "s1"},
+        HttpError(httplib2.Response({"status": 500}), b""),
+    ]
+    store.sync(service, "primary")
+    store.invalidate("primary")
+
+    assert not store.ensure_fresh(service, "primary")
+
+
+def test_initial_sync_runs_in_background(store):
+    service = _FakeCalendar()
+    release = threading.Event()
+    service.pages = [
+        {
+            "timeZone": "UTC",
+            "items": [_event("a", "2025-02-12T09:00:00Z", "2025-02-12T10:00:00Z")],
+            "nextSyncToken": "s1",
+        }
+    ]
+    list_page = service.list
+
+    def _slow_list(**kwargs):
+        release.wait(5)
+        return list_page(**kwargs)
+
+    service.list = _slow_list
+
+    # 첫 조회는 전체 동기화를 기다리지 않고 API로 넘긴다
+    assert not store.ensure_fresh(service, "primary")
+    first = store._initial_syncs["primary"]
+    # 동기화가 도는 동안에는 새로 시작하지 않는다
+    assert not store.ensure_fresh(service, "primary")
+    assert store._initial_syncs["primary"] is first
+
+    release.set()
+    first.join(5)
+
+    assert store.ensure_fresh(service, "primary")
+    assert service.calls == [("primary", None, None)]
+    events = store.list_events(
+        "primary", _ts("2025-02-12T00:00:00Z"), _ts("2025-02-13T00:00:00Z"), 10
+    )
+    assert _ids(events) == ["a"]
+
+
+def test_failed_initial_sync_is_retried(store):
+    service = _FakeCalendar()
+    service.pages = [
+        HttpError(httplib2.Response({"status": 500}), b""),
+        {"timeZone": "UTC", "items": [], "nextSyncToken": "s1"},
+    ]
+
+    assert not store.ensure_fresh(service, "primary")
+    store._initial_syncs["primary"].join(5)
+    assert store.sync_token("primary") is None
+
+    assert not store.ensure_fresh(service, "primary")
+    store._initial_syncs["primary"].join(5)
+    assert store.ensure_fresh(service, "primary")
+
+
+class _BarrierCalendar:
+    """두 캘린더의 events.list가 동시에 들어와야 응답하는 서비스."""
+
+    def __init__(self):
+        self.barrier = threading.Barrier(2, timeout=2)
+
+    def events(self):
+        return self
+
+    def list(self, calendarId, **kwargs):
+        self.barrier.wait()
+        event = _event(f"{calendarId}-1", "2025-02-12T09:00:00Z", "2025-02-12T10:00:00Z")
+        return _Request({"timeZone": "UTC", "items": [event], "nextSyncToken": "s1"})
+
+
+def test_different_calendars_sync_concurrently(store):
+    service = _BarrierCalendar()
+
+    with ThreadPoolExecutor(2) as pool:
+        # 한 캘린더가 다른 캘린더의 동기화를 기다리면 배리어가 깨진다
+        list(pool.map(lambda calendar_id: store.sync(service, calendar_id), ["work", "home"]))
+
+    assert store.sync_token("work") == store.sync_token("home") == "s1"
+
+
+# --- 반복 일정 전개 ---
+
+
+def test_recurring_events_expand_with_exceptions(store):
+    weekly = _event(
+        "standup",
+        "2025-02-10T09:00:00+09:00",
+        "2025-02-10T09:15:00+09:00",
+        "스탠드업",
+        recurrence=["RRULE:FREQ=DAILY;COUNT=5"],
+    )
+    weekly["start"]["timeZone"] = weekly["end"]["timeZone"] = "Asia/Seoul"
+    moved = _event(
+        "standup_20250211T000000Z",
+        "2025-02-11T10:00:00+09:00",
+        "2025-02-11T10:15:00+09:00",
+        "스탠드업(변경)",
+        recurringEventId="standup",
+        originalStartTime={"dateTime": "2025-02-11T09:00:00+09:00"},
+    )
+    cancelled = {
+        "id": "standup_20250212T000000Z",
+        "status": "cancelled",
+        "recurringEventId": "standup",
+        "originalStartTime": {"dateTime": "2025-02-12T09:00:00+09:00"},
+    }
+    service = _FakeCalendar()
+    service.pages = [
+        {"timeZone": "Asia/Seoul", "items": [weekly, moved, cancelled], "nextSyncToken": "s1"}
+    ]
+    store.sync(service, "primary")
+
+    events = store.list_events(
+        "primary", _ts("2025-02-01T00:00:00+09:00"), _ts("2025-03-01T00:00:00+09:00"), 10
+    )
+
+    assert _ids(events) == [
+        "standup_20250210T000000Z",
+        "standup_20250211T000000Z",
+        "standup_20250213T000000Z",
+        "standup_20250214T000000Z",
+    ]
+    assert events[1]["summary"] == "스탠드업(변경)"
+    assert events[2]["start"]["dateTime"] == "2025-02-13T09:00:00+09:00"
+    assert events[2]["recurringEventId"] == "standup"
+    assert "recurrence" not in events[2]
+    # COUNT가 끝난 뒤 기간에는 원본이 조회되지 않는다
+    after = store.list_events(
+        "primary", _ts("2025-03-01T00:00:00Z"), _ts("2025-04-01T00:00:00Z"), 10
+    )
+    assert after == []
+
+
+def test_expand_keeps_wall_clock_across_dst():
+    master = _event(
+        "m",
+        "2025-03-03T09:00:00-05:00",
+        "2025-03-03T10:00:00-05:00",
+        recurrence=["RRULE:FREQ=WEEKLY", "EXDATE;TZID=America/New_York:20250310T090000"],
+    )
+    master["start"]["timeZone"] = "America/New_York"
+
+    instances = expand(master, SEOUL, _ts("2025-03-01T00:00:00Z"), _ts("2025-03-20T00:00:00Z"))
+
+    assert [i["start"]["dateTime"] for i in instances] == [
+        "2025-03-03T09:00:00-05:00",
+        "2025-03-17T09:00:00-04:00",
+    ]
+    assert instances[1]["id"] == "m_20250317T130000Z"
+
+
+def test_expand_date_only_until_includes_that_day():
+    master = _event(
+        "m",
+        "2025-02-10T09:00:00+09:00",
+        "2025-02-10T10:00:00+09:00",
+        recurrence=["RRULE:FREQ=DAILY;UNTIL=20250212"],
+    )
+    master["start"]["timeZone"] = "Asia/Seoul"
+
+    instances = expand(master, SEOUL, _ts("2025-02-01T00:00:00Z"), _ts("2025-03-01T00:00:00Z"))
+
+    assert [i["start"]["dateTime"] for i in instances] == [
+        "2025-02-10T09:00:00+09:00",
+        "2025-02-11T09:00:00+09:00",
+        "2025-02-12T09:00:00+09:00",
+    ]
+    assert recurrence_end(master, SEOUL) == _ts("2025-02-12T10:00:00+09:00")
+
+
+def test_expand_all_day_with_utc_until():
+    master = _event(
+        "d", "2025-01-01", "2025-01-02", recurrence=["RRULE:FREQ=DAILY;UNTIL=20250105T000000Z"]
+    )
+
+    instances = expand(
+        master, SEOUL, _ts("2025-01-01T00:00:00+09:00"), _ts("2025-02-01T00:00:00+09:00")
+    )
+
+    assert [i["start"]["date"] for i in instances] == [
+        "2025-01-01",
+        "2025-01-02",
+        "2025-01-03",
+        "2025-01-04",
+        "2025-01-05",
+    ]
+    assert recurrence_end(master, SEOUL) == _ts("2025-01-06T00:00:00+09:00")
+
+
+def test_expand_floating_until_uses_the_event_zone():
+    master = _event(
+        "m",
+        "2025-02-10T09:00:00+09:00",
+        "2025-02-10T10:00:00+09:00",
+        recurrence=["RRULE:FREQ=DAILY;UNTIL=20250212T090000"],
+    )
+    master["start"]["timeZone"] = "Asia/Seoul"
+
+    instances = expand(master, SEOUL, _ts("2025-02-01T00:00:00Z"), _ts("2025-03-01T00:00:00Z"))
+
+    assert len(instances) == 3
+    assert instances[-1]["start"]["dateTime"] == "2025-02-12T09:00:00+09:00"
+
+
+def test_unparseable_recurrence_does_not_abort_sync(store):
+    service = _FakeCalendar()
+    service.pages = [
+        {
+            "timeZone": "Asia/Seoul",
+            "items": [
+                _event("ok", "2025-02-12T09:00:00+09:00", "2025-02-12T10:00:00+09:00"),
+                _event(
+                    "bad",
+                    "2025-02-12T11:00:00+09:00",
+                    "2025-02-12T12:00:00+09:00",
+                    recurrence=["RRULE:FREQ=SOMETIMES;COUNT=3"],
+                ),
+            ],
+            "nextSyncToken": "s1",
+        }
+    ]
+
+    store.sync(service, "primary")
+
+    events = store.list_events(
+        "primary", _ts("2025-02-12T00:00:00+09:00"), _ts("2025-02-13T00:00:00+09:00"), 10
+    )
+    assert _ids(events) == ["ok"]
+    assert store.sync_token("primary") == "s1"
+
+
+def test_expand_all_day():
+    master = _event("bday", "2025-02-12", "2025-02-13", recurrence=["RRULE:FREQ=YEARLY"])
+
+    instances = expand(
+        master, SEOUL, _ts("2026-01-01T00:00:00+09:00"), _ts("2027-01-01T00:00:00+09:00")
+    )
+
+    assert [(i["id"], i["start"], i["end"]) for i in instances] == [
+        ("bday_20260212", {"date": "2026-02-12"}, {"date": "2026-02-13"})
+    ]
+
+
+def test_search_matches_all_terms(store):
+    service = _FakeCalendar()
+    service.pages = [
+        {
+            "timeZone": "UTC",
+            "items": [
+                _event(
+                    "a",
+                    "2025-02-12T09:00:00Z",
+                    "2025-02-12T10:00:00Z",
+                    "주간 회의",
+                    location="회의실 A",
+                ),
+                _event(
+                    "b",
+                    "2025-02-12T11:00:00Z",
+                    "2025-02-12T12:00:00Z",
+                    "점심",
+                    attendees=[{"email": "boss@corp.com"}],
+                ),
+                _event(
+                    "r",
+                    "2025-02-10T08:00:00Z",
+                    "2025-02-10T09:00:00Z",
+                    "회의 정리",
+                    recurrence=["RRULE:FREQ=DAILY"],
+                ),
+            ],
+            "nextSyncToken": "s1",
+        }
+    ]
+    store.sync(service, "primary")
+    window = ("primary", _ts("2025-02-12T00:00:00Z"), _ts("2025-02-13T00:00:00Z"), 10)
+
+    assert _ids(store.list_events(*window, query="회의")) == ["r_20250212T080000Z", "a"]
+    assert _ids(store.list_events(*window, query="회의 회의실")) == ["a"]
+    assert _ids(store.list_events(*window, query="BOSS")) == ["b"]
+    assert store.list_events(*window, query="없는 일정") == []
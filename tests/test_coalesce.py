@@ -0,0 +1,212 @@
+"""동일 도구 호출 합치기·결과 캐시 테스트."""
+
+import asyncio
+import threading
+
+import pytest
+
+from jarvis.utils import cache, coalesce, metrics
+from jarvis.utils.concurrency import threaded
+
+
+@pytest.fixture(autouse=True)
+def _clean(monkeypatch):
+    monkeypatch.setattr(coalesce, "RESULT_TTL", 10.0)
+    coalesce.clear()
+    metrics.reset()
+    yield
+    coalesce.clear()
+
+
+def _tool(calls: list, gate: asyncio.Event | None = None):
+    @coalesce.coalesced(lambda args: [("calendar", args["calendar_id"])])
+    async def list_events(calendar_id: str = "primary", max_results: int = 10):
+        calls.append((calendar_id, max_results))
+        n = len(calls)
+        if gate is not None:
+            await gate.wait()
+        return f"{calendar_id}:{n}"
+
+    return list_events
+
+
+def test_concurrent_identical_calls_run_once():
+    calls = []
+
+    async def _run():
+        gate = asyncio.Event()
+        tool = _tool(calls, gate)
+        pending = [asyncio.ensure_future(tool()) for _ in range(5)]
+        await asyncio.sleep(0)
+        gate.set()
+        return await asyncio.gather(*pending)
+
+    assert asyncio.run(_run()) == ["primary:1"] * 5
+    assert calls == [("primary", 10)]
+    assert metrics.snapshot()["caches"]["tool_inflight"]["hits"] == 4
+
+
+def test_hits_and_joins_are_recorded_as_tool_calls():
+    gate = threading.Event()
+
+    @coalesce.coalesced(lambda args: [("calendar", args["calendar_id"])])
+    @threaded
+    def list_events(calendar_id: str = "primary"):
+        gate.wait(5)
+        return calendar_id
+
+    async def _run():
+        pending = [asyncio.ensure_future(list_events()) for _ in range(3)]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(*pending)
+        await list_events()
+
+    asyncio.run(_run())
+
+    tool = metrics.snapshot()["tools"]["list_events"]
+    # 클라이언트가 부른 4번이 모두 호출 시간에 들어간다
+    assert tool["outcomes"] == {"hit": 1, "joined": 2, "run": 1}
+    assert tool["duration_ms"]["count"] == 4
+    assert tool["cache_hits"]["sum"] == 3
+    text = metrics.prometheus_text()
+    assert 'jarvis_tool_calls_total{tool="list_events",outcome="joined"} 2' in text
+
+
+def test_defaults_and_keyword_order_share_a_key():
+    calls = []
+
+    async def _run():
+        tool = _tool(calls)
+        await tool()
+        await tool("primary", max_results=10)
+        await tool(max_results=10, calendar_id="primary")
+        await tool(max_results=20)
+
+    asyncio.run(_run())
+
+    assert calls == [("primary", 10), ("primary", 20)]
+
+
+def test_results_expire(monkeypatch):
+    calls = []
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+
+    async def _run():
+        tool = _tool(calls)
+        await tool()
+        now[0] += 5
+        await tool()
+        now[0] += 10
+        await tool()
+
+    asyncio.run(_run())
+
+    assert len(calls) == 2
+
+
+def test_zero_ttl_only_merges_concurrent_calls(monkeypatch):
+    monkeypatch.setattr(coalesce, "RESULT_TTL", 0)
+    calls = []
+
+    async def _run():
+        tool = _tool(calls)
+        await tool()
+        await tool()
+
+    asyncio.run(_run())
+
+    assert len(calls) == 2
+
+
+def test_write_invalidates_only_matching_tags():
+    calls = []
+
+    @coalesce.invalidates(lambda args: [("calendar", args["calendar_id"])])
+    async def create_event(calendar_id: str = "primary"):
+        return "created"
+
+    async def _run():
+        tool = _tool(calls)
+        await tool("primary")
+        await tool("team")
+        await create_event("primary")
+        await tool("primary")
+        await tool("team")
+
+    asyncio.run(_run())
+
+    assert calls == [("primary", 10), ("team", 10), ("primary", 10)]
+
+
+def test_write_during_flight_is_not_cached_or_joined():
+    calls = []
+
+    async def _run():
+        gate = asyncio.Event()
+        tool = _tool(calls, gate)
+        first = asyncio.ensure_future(tool())
+        await asyncio.sleep(0)
+        # 읽기가 진행 중일 때 쓰기가 끝났다
+        coalesce.invalidate(("calendar", "primary"))
+        second = asyncio.ensure_future(tool())
+        await asyncio.sleep(0)
+        gate.set()
+        results = await asyncio.gather(first, second)
+        return results, await tool()
+
+    results, later = asyncio.run(_run())
+
+    # 쓰기 뒤의 호출은 새로 요청하고, 쓰기 전에 시작한 결과는 캐시되지 않는다
+    assert len(calls) == 2
+    assert results[0] != results[1]
+    assert later == results[1]
+
+
+def test_errors_are_shared_but_not_cached():
+    calls = []
+
+    @coalesce.coalesced(lambda args: [])
+    async def get_event(event_id: str):
+        calls.append(event_id)
+        raise RuntimeError("boom")
+
+    async def _run():
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await get_event("e1")
+
+    asyncio.run(_run())
+
+    assert calls == ["e1", "e1"]
+
+
+def test_detail_reads_live_longer_until_a_write(monkeypatch):
+    monkeypatch.setattr(coalesce, "DETAIL_TTL", 300.0)
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    calls = []
+
+    @coalesce.coalesced(lambda args: [("message", args["message_id"])], detail=True)
+    async def get_message(message_id: str):
+        calls.append(message_id)
+        return message_id
+
+    @coalesce.invalidates(lambda args: [("message", args["message_id"])])
+    async def trash_message(message_id: str):
+        return "trashed"
+
+    before = coalesce.cache_stats()["invalidations"]
+
+    async def _run():
+        await get_message("m1")
+        now[0] += 60
+        await get_message("m1")
+        await trash_message("m1")
+        await get_message("m1")
+
+    asyncio.run(_run())
+
+    assert calls == ["m1", "m1"]
+    assert coalesce.cache_stats()["invalidations"] == before + 1
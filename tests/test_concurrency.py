@@ -0,0 +1,37 @@
+"""스레드 풀 실행 유틸리티 테스트."""
+
+import asyncio
+import inspect
+import threading
+import time
+
+from jarvis.utils.concurrency import threaded
+
+
+def test_threaded_keeps_signature_and_doc():
+    @threaded
+    def tool(a: int, b: str | None = None) -> str:
+        """도구 설명"""
+        return f"{a}{b}"
+
+    assert inspect.iscoroutinefunction(tool)
+    assert list(inspect.signature(tool).parameters) == ["a", "b"]
+    assert tool.__doc__ == "도구 설명"
+    assert asyncio.run(tool(1, b="x")) == "1x"
+
+
+def test_threaded_calls_overlap():
+    @threaded
+    def slow() -> str:
+        time.sleep(0.2)
+        return threading.current_thread().name
+
+    async def _run_both():
+        return await asyncio.gather(slow(), slow())
+
+    started = time.perf_counter()
+    names = asyncio.run(_run_both())
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.35
+    assert all(name.startswith("jarvis") for name in names)
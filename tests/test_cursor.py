@@ -0,0 +1,88 @@
+"""목록 커서 테스트."""
+
+import pytest
+
+from jarvis.utils.cursor import (
+    PageStream,
+    decode_cursor,
+    encode_cursor,
+    take_page,
+    with_cursor,
+)
+
+
+def _pages(items: list, page_size: int, fixed: bool = False):
+    """정수 오프셋을 페이지 키로 쓰는 가짜 fetch와 호출 기록.
+
+    fixed면 REST next 링크처럼 요청 크기와 무관하게 page_size개씩 돌려준다.
+    """
+    calls = []
+
+    def fetch(page, size):
+        calls.append((page, size))
+        start = page or 0
+        end = start + (page_size if fixed else min(size, page_size))
+        return items[start:end], end if end < len(items) else None
+
+    return fetch, calls
+
+
+def test_cursor_round_trip_and_rejects_other_queries():
+    cursor = encode_cursor("list_issues", {"owner_repo": "octo/repo", "state": "open"}, ["c1", 3])
+
+    assert decode_cursor(cursor, "list_issues", {"state": "open", "owner_repo": "octo/repo"}) == ["c1", 3]
+    assert decode_cursor(None, "list_issues", {}) is None
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "list_pull_requests", {"owner_repo": "octo/repo", "state": "open"})
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "list_issues", {"owner_repo": "octo/repo", "state": "closed"})
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", "list_issues", {})
+
+
+def test_with_cursor():
+    assert with_cursor("목록", None) == "목록"
+    assert 'cursor="abc"' in with_cursor("목록", "abc")
+
+
+def test_take_page_resumes_inside_a_page():
+    fetch, calls = _pages(list(range(10)), page_size=4, fixed=True)
+
+    first, position = take_page(PageStream(fetch, 6), 6)
+    assert first == [0, 1, 2, 3, 4, 5]
+    assert position == [4, 2]
+
+    second, position = take_page(PageStream(fetch, 6, position), 6)
+    assert second == [6, 7, 8, 9]
+    assert position is None
+    # 이어 읽을 때는 건너뛸 만큼 더 요청한다
+    assert calls[2] == (4, 8)
+
+
+def test_page_boundary_does_not_fetch_ahead():
+    fetch, calls = _pages(list(range(10)), page_size=5)
+
+    items, position = take_page(PageStream(fetch, 5), 5)
+
+    assert items == [0, 1, 2, 3, 4]
+    assert position == [5, 0]
+    assert len(calls) == 1
+
+
+def test_skip_larger_than_page_carries_over():
+    fetch, _ = _pages(list(range(10)), page_size=3)
+
+    items, position = take_page(PageStream(fetch, 2, [None, 7]), 2)
+
+    assert items == [7, 8]
+    assert position == [9, 0]
+
+
+def test_more_callback_defers_remaining_pages():
+    fetch, calls = _pages(list(range(10)), page_size=3)
+
+    items, position = take_page(PageStream(fetch, 5, more=lambda: False), 5, keep=lambda x: x % 2)
+
+    assert items == [1]
+    assert position == [3, 0]
+    assert len(calls) == 1
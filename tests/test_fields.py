@@ -0,0 +1,184 @@
+"""fields 마스크 테스트.
+
+마스크로 잘라낸 응답과 전체 응답의 포맷 결과가 같아야 한다.
+포맷터가 마스크에 없는 필드를 읽기 시작하면 이 테스트가 실패한다.
+"""
+
+import base64
+
+from jarvis.utils.fields import (
+    CALENDAR_LIST_FIELDS,
+    EVENT_FIELDS,
+    EVENT_PAGE_FIELDS,
+    LABEL_LIST_FIELDS,
+    MESSAGE_FIELDS,
+    MESSAGE_LIST_FIELDS,
+    MESSAGE_LIST_HEADERS,
+    parse_field_mask,
+    project,
+)
+from jarvis.utils.formatting import (
+    format_calendar_list,
+    format_event,
+    format_event_list,
+    format_label_list,
+    format_message,
+    format_message_list,
+)
+
+
+def _full_event(i: int) -> dict:
+    return {
+        "kind": "calendar#event",
+        "etag": f'"etag{i}"',
+        "id": f"event{i}",
+        "status": "confirmed",
+        "htmlLink": f"https://calendar.google.com/event?eid={i}",
+        "created": "2025-02-01T00:00:00.000Z",
+        "updated": "2025-02-02T00:00:00.000Z",
+        "summary": f"회의 {i}",
+        "description": "주간 회의",
+        "location": "회의실 A",
+        "colorId": "5",
+        "creator": {"email": "me@example.com", "self": True},
+        "organizer": {"email": "me@example.com", "self": True},
+        "start": {"dateTime": "2025-02-12T15:00:00+09:00", "timeZone": "Asia/Seoul"},
+        "end": {"dateTime": "2025-02-12T16:00:00+09:00", "timeZone": "Asia/Seoul"},
+        "recurringEventId": "recurring1",
+        "transparency": "opaque",
+        "visibility": "default",
+        "iCalUID": f"event{i}@google.com",
+        "sequence": 0,
+        "attendees": [
+            {"email": "a@example.com", "responseStatus": "accepted", "displayName": "A"},
+            {"email": "b@example.com", "responseStatus": "needsAction", "optional": True},
+        ],
+        "hangoutLink": "https://meet.google.com/abc",
+        "conferenceData": {"conferenceId": "abc"},
+        "reminders": {"useDefault": True},
+        "eventType": "default",
+    }
+
+
+def _full_message(i: int) -> dict:
+    body = base64.urlsafe_b64encode(f"본문 {i}".encode()).decode()
+    return {
+        "id": f"msg{i}",
+        "threadId": f"thread{i}",
+        "labelIds": ["INBOX", "UNREAD"],
+        "snippet": f"미리보기 {i}",
+        "historyId": "12345",
+        "internalDate": "1739235600000",
+        "sizeEstimate": 4096,
+        "payload": {
+            "partId": "",
+            "mimeType": "multipart/alternative",
+            "filename": "",
+            "headers": [
+                {"name": "Delivered-To", "value": "me@example.com"},
+                {"name": "Received", "value": "from mx.example.com"},
+                {"name": "Subject", "value": f"제목 {i}"},
+                {"name": "From", "value": "sender@example.com"},
+                {"name": "To", "value": "me@example.com"},
+                {"name": "Date", "value": "Tue, 11 Feb 2025 10:00:00 +0900"},
+                {"name": "Message-ID", "value": f"<{i}@example.com>"},
+            ],
+            "body": {"size": 0},
+            "parts": [
+                {
+                    "partId": "0",
+                    "mimeType": "text/plain",
+                    "filename": "",
+                    "headers": [{"name": "Content-Type", "value": "text/plain"}],
+                    "body": {"size": 10, "data": body},
+                }
+            ],
+        },
+    }
+
+
+def _only_headers(message: dict, names: list[str]) -> dict:
+    """metadataHeaders로 지정한 헤더만 돌려주는 서버 동작을 흉내낸다."""
+    wanted = {n.lower() for n in names}
+    payload = message["payload"]
+    headers = [h for h in payload["headers"] if h["name"].lower() in wanted]
+    return {**message, "payload": {**payload, "headers": headers}}
+
+
+def test_parse_field_mask():
+    assert parse_field_mask("id,items(summary,start/dateTime)") == {
+        "id": {},
+        "items": {"summary": {}, "start": {"dateTime": {}}},
+    }
+
+
+def test_project():
+    resource = {"items": [{"a": 1, "b": {"c": 2, "d": 3}}], "etag": "x"}
+    assert project(resource, "items(b/c)") == {"items": [{"b": {"c": 2}}]}
+
+
+def test_event_list_mask_covers_formatter():
+    response = {
+        "kind": "calendar#events",
+        "etag": '"list"',
+        "summary": "primary",
+        "items": [_full_event(i) for i in range(3)],
+    }
+    projected = project(response, EVENT_PAGE_FIELDS)
+    assert format_event_list(projected["items"]) == format_event_list(response["items"])
+
+
+def test_event_mask_covers_detailed_formatter():
+    event = _full_event(1)
+    projected = project(event, EVENT_FIELDS)
+    assert format_event(projected, detailed=True) == format_event(event, detailed=True)
+
+
+def test_calendar_list_mask_covers_formatter():
+    response = {
+        "items": [
+            {
+                "kind": "calendar#calendarListEntry",
+                "id": "primary@example.com",
+                "summary": "내 캘린더",
+                "timeZone": "Asia/Seoul",
+                "accessRole": "owner",
+                "backgroundColor": "#fff",
+                "primary": True,
+            },
+            {"id": "work@group.calendar.google.com", "summary": "업무", "accessRole": "reader"},
+        ]
+    }
+    projected = project(response, CALENDAR_LIST_FIELDS)
+    assert format_calendar_list(projected["items"]) == format_calendar_list(response["items"])
+
+
+def test_message_list_mask_covers_formatter():
+    messages = [_full_message(i) for i in range(3)]
+    projected = [
+        project(_only_headers(m, MESSAGE_LIST_HEADERS), MESSAGE_LIST_FIELDS) for m in messages
+    ]
+    assert format_message_list(projected) == format_message_list(messages)
+
+
+def test_message_mask_covers_formatter():
+    message = _full_message(1)
+    projected = project(message, MESSAGE_FIELDS)
+    assert format_message(projected) == format_message(message)
+
+
+def test_label_list_mask_covers_formatter():
+    response = {
+        "labels": [
+            {
+                "id": "INBOX",
+                "name": "INBOX",
+                "type": "system",
+                "messageListVisibility": "hide",
+                "labelListVisibility": "labelShow",
+            },
+            {"id": "Label_1", "name": "프로젝트", "type": "user", "color": {"textColor": "#000"}},
+        ]
+    }
+    projected = project(response, LABEL_LIST_FIELDS)
+    assert format_label_list(projected["labels"]) == format_label_list(response["labels"])
@@ -1,8 +1,13 @@
 """GitHub 도구 테스트."""
 
+import asyncio
 from types import SimpleNamespace
 from datetime import datetime
 
+import pytest
+
+from jarvis.tools import github
+from jarvis.utils import coalesce
 from jarvis.utils.formatting import (
     format_repo,
     format_repo_list,
@@ -218,3 +223,226 @@ def test_format_notification_list():
 def test_format_notification_list_empty():
     result = format_notification_list([])
     assert "알림이 없습니다" in result
+
+
+# --- 조건부 요청 테스트 ---
+
+
+class _FakeRequester:
+    """ETag가 일치하면 304(빈 본문)를 돌려주는 GitHub 요청자."""
+
+    auth = SimpleNamespace(token="ghp_test")
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def requestJsonAndCheck(self, verb, url, parameters=None, headers=None):
+        self.calls.append((url, dict(parameters or {}), dict(headers or {})))
+        data, etag, next_url = self.pages[url]
+        response_headers = {"etag": etag}
+        if next_url:
+            response_headers["link"] = f'<{next_url}>; rel="next"'
+        if headers and headers.get("If-None-Match") == etag:
+            return response_headers, None
+        return response_headers, data
+
+
+def _make_element(requester, headers, element, completed):
+    return element
+
+
+@pytest.fixture
+def _empty_etag_cache(monkeypatch):
+    monkeypatch.setattr(github, "_etag_cache", github.OrderedDict())
+
+
+def test_list_conditional_follows_pages(_empty_etag_cache):
+    requester = _FakeRequester(
+        {
+            "/notifications": ([1, 2], '"a"', "https://api.github.com/notifications?page=2"),
+            "https://api.github.com/notifications?page=2": ([3, 4], '"b"', None),
+        }
+    )
+    g = SimpleNamespace(requester=requester)
+
+    items, position = github.list_conditional(g, _make_element, "/notifications", {}, 3)
+
+    assert items == [1, 2, 3]
+    assert requester.calls[0][1] == {"per_page": 3}
+    assert requester.calls[1][1] == {}
+    assert position == ["https://api.github.com/notifications?page=2", 1]
+
+    rest, position = github.list_conditional(
+        g, _make_element, "/notifications", {}, 3, position
+    )
+    assert rest == [4]
+    assert position is None
+
+
+def test_list_conditional_reuses_cached_page_on_304(_empty_etag_cache):
+    requester = _FakeRequester({"/notifications": ([1, 2], '"a"', None)})
+    g = SimpleNamespace(requester=requester)
+
+    first, _ = github.list_conditional(g, _make_element, "/notifications", {}, 10)
+    second, _ = github.list_conditional(g, _make_element, "/notifications", {}, 10)
+
+    assert first == second == [1, 2]
+    assert "If-None-Match" not in requester.calls[0][2]
+    assert requester.calls[1][2]["If-None-Match"] == '"a"'
+
+
+# --- GraphQL 목록 테스트 ---
+
+
+def _issue_node(number, labels=()):
+    return {
+        "number": number,
+        "title": f"이슈 {number}",
+        "state": "OPEN",
+        "createdAt": "2025-02-12T10:00:00Z",
+        "url": f"https://github.com/user/repo/issues/{number}",
+        "body": "",
+        "author": {"login": "testuser"},
+        "labels": {"nodes": [{"name": name} for name in labels]},
+        "assignees": {"nodes": [{"login": "dev1"}]},
+    }
+
+
+class _FakeGraphQLRequester:
+    def __init__(self, pages):
+        self.pages = pages
+        self.variables = []
+
+    def graphql_query(self, query, variables):
+        self.variables.append(variables)
+        nodes = self.pages[variables["after"]]
+        index = list(self.pages).index(variables["after"])
+        has_next = index + 1 < len(self.pages)
+        end_cursor = list(self.pages)[index + 1] if has_next else None
+        page = {
+            "pageInfo": {"hasNextPage": has_next, "endCursor": end_cursor},
+            "nodes": nodes,
+        }
+        return {}, {"data": {"repository": {"issues": page}}}
+
+
+def test_graphql_nodes_returns_exactly_max_results():
+    requester = _FakeGraphQLRequester(
+        {None: [_issue_node(1), _issue_node(2)], "c1": [_issue_node(3), _issue_node(4)]}
+    )
+    g = SimpleNamespace(requester=requester)
+
+    nodes, position = github._graphql_nodes(g, "", {}, "issues", 3)
+
+    assert [n["number"] for n in nodes] == [1, 2, 3]
+    assert [v["first"] for v in requester.variables] == [3, 1]
+    # 두 번째 페이지의 첫 노드까지 썼으므로 같은 페이지에서 하나를 건너뛰고 이어 읽는다
+    assert position == ["c1", 1]
+
+    rest, position = github._graphql_nodes(g, "", {}, "issues", 3, position=position)
+    assert [n["number"] for n in rest] == [4]
+    assert position is None
+
+
+def test_graphql_nodes_requires_all_labels():
+    requester = _FakeGraphQLRequester(
+        {
+            None: [_issue_node(1, ["bug"]), _issue_node(2, ["bug", "urgent"])],
+            "c1": [_issue_node(3, ["urgent"]), _issue_node(4, ["urgent", "bug"])],
+        }
+    )
+    g = SimpleNamespace(requester=requester)
+    keep = github.partial(github._has_all_labels, {"bug", "urgent"})
+
+    nodes, _ = github._graphql_nodes(g, "", {}, "issues", 5, keep)
+
+    assert [n["number"] for n in nodes] == [2, 4]
+
+
+def test_graphql_nodes_stops_filtered_paging_when_quota_low(monkeypatch):
+    requester = _FakeGraphQLRequester(
+        {None: [_issue_node(1, ["bug"])], "c1": [_issue_node(2, ["bug"])]}
+    )
+    g = SimpleNamespace(requester=requester)
+    monkeypatch.setattr(github, "low_quota", lambda api, resource: True)
+    keep = github.partial(github._has_all_labels, {"bug"})
+
+    nodes, position = github._graphql_nodes(g, "", {}, "issues", 5, keep)
+
+    assert [n["number"] for n in nodes] == [1]
+    assert len(requester.variables) == 1
+    # 남은 페이지는 커서로 이어 받을 수 있다
+    assert position == ["c1", 0]
+
+
+def test_issue_from_node_renders_with_formatter():
+    issue = github._issue_from_node(_issue_node(7, ["bug"]))
+    result = format_issue(issue, detailed=True)
+    assert "🟢 #7 이슈 7" in result
+    assert "testuser" in result
+    assert "bug" in result
+    assert "dev1" in result
+    assert "2025-02-12 10:00" in result
+
+
+def test_pull_request_from_node_merged():
+    node = {
+        "number": 3,
+        "title": "기능 추가",
+        "state": "MERGED",
+        "merged": True,
+        "createdAt": "2025-02-12T14:00:00Z",
+        "url": "https://github.com/user/repo/pull/3",
+        "body": "",
+        "headRefName": "feature",
+        "baseRefName": "main",
+        "author": None,
+        "labels": {"nodes": []},
+    }
+    result = format_pull_request(github._pull_request_from_node(node))
+    assert "🟣" in result
+    assert "closed(merged)" in result
+    assert "feature → main" in result
+    assert "ghost" in result
+
+
+def test_issue_write_on_a_pr_number_drops_pr_results(monkeypatch):
+    monkeypatch.setattr(coalesce, "RESULT_TTL", 10.0)
+    coalesce.clear()
+    calls = []
+
+    @coalesce.coalesced(lambda args: [github._repo_tag("pulls", args)])
+    async def list_pull_requests(owner_repo: str):
+        calls.append("list")
+        return len(calls)
+
+    @coalesce.coalesced(lambda args: [github._repo_tag("pull", args, "pr_number")], detail=True)
+    async def get_pull_request(owner_repo: str, pr_number: int):
+        calls.append("get")
+        return len(calls)
+
+    @coalesce.coalesced(lambda args: [github._repo_tag("pulls", args)])
+    async def list_other_pull_requests(owner_repo: str):
+        calls.append("other")
+        return len(calls)
+
+    @coalesce.invalidates(github._issue_write_tags)
+    async def update_issue(owner_repo: str, issue_number: int, state: str | None = None):
+        return "ok"
+
+    async def _run():
+        await list_pull_requests("Octo/Repo")
+        await get_pull_request("octo/repo", 7)
+        await list_other_pull_requests("octo/other")
+        # PR #7을 이슈 API로 닫는다
+        await update_issue("octo/repo", 7, state="closed")
+        await list_pull_requests("Octo/Repo")
+        await get_pull_request("octo/repo", 7)
+        await list_other_pull_requests("octo/other")
+
+    asyncio.run(_run())
+    coalesce.clear()
+
+    # 다른 저장소의 PR 목록은 그대로 재사용한다
+    assert calls == ["list", "get", "other", "list", "get"]
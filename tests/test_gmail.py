@@ -1,7 +1,15 @@
 """Gmail 도구 테스트."""
 
+import asyncio
 import base64
+import json
+from types import SimpleNamespace
 
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from jarvis.tools import gmail
 from jarvis.utils.formatting import (
     format_message,
     format_message_list,
@@ -48,6 +56,30 @@ def test_format_message():
     assert "msg123" in result
 
 
+def test_format_message_lists_attachments():
+    message = {
+        "id": "msg123",
+        "payload": {
+            "mimeType": "multipart/mixed",
+            "headers": [{"name": "Subject", "value": "견적서"}],
+            "parts": [
+                {
+                    "mimeType": "text/plain",
+                    "body": {"data": base64.urlsafe_b64encode("첨부 확인".encode()).decode()},
+                },
+                {
+                    "mimeType": "application/pdf",
+                    "filename": "견적.pdf",
+                    "body": {"attachmentId": "att1", "size": 2048},
+                },
+            ],
+        },
+    }
+    result = format_message(message)
+    assert "첨부: 견적.pdf (2,048바이트)" in result
+    assert "첨부 확인" in result
+
+
 def test_format_message_list():
     messages = [
         {
@@ -119,3 +151,286 @@ def test_extract_body_multipart():
         }
     }
     assert _extract_body(message) == "멀티파트 본문"
+
+
+class _FakeBatch:
+    def __init__(self, service, callback):
+        self._service = service
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, request_id):
+        self._requests.append((request_id, request))
+
+    def execute(self):
+        self._service.batch_sizes.append(len(self._requests))
+        # 배치 응답은 순서가 보장되지 않는다
+        for request_id, request in reversed(self._requests):
+            failures = self._service.failures.get(request["id"])
+            if failures:
+                self._callback(request_id, None, failures.pop(0))
+            else:
+                self._callback(request_id, {"id": request["id"]}, None)
+
+
+class _FakeGmailService:
+    def __init__(self, failures=None):
+        self.batch_sizes = []
+        # 메일 ID → 차례로 돌려줄 부분 응답 오류
+        self.failures = failures or {}
+        self.requests = []
+
+    def new_batch_http_request(self, callback):
+        return _FakeBatch(self, callback)
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def get(self, **kwargs):
+        self.requests.append(kwargs)
+        return kwargs
+
+
+def test_batch_get_messages_keeps_order_and_chunks():
+    service = _FakeGmailService()
+    ids = [f"msg{i}" for i in range(gmail._BATCH_SIZE + 3)]
+
+    result = gmail._batch_get_messages(service, ids)
+
+    assert [m["id"] for m in result] == ids
+    assert service.batch_sizes == [gmail._BATCH_SIZE, 3]
+
+
+def _part_error(status: int, reason: str = "", retry_after: str | None = None) -> HttpError:
+    headers = {"status": status}
+    if retry_after:
+        headers["retry-after"] = retry_after
+    body = json.dumps({"error": {"code": status, "errors": [{"reason": reason}]}}).encode()
+    return HttpError(httplib2.Response(headers), body)
+
+
+def test_batch_get_messages_retries_only_throttled_parts(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(gmail.time, "sleep", sleeps.append)
+    ids = [f"msg{i}" for i in range(10)]
+    service = _FakeGmailService(
+        {
+            "msg2": [_part_error(429, "rateLimitExceeded", retry_after="3")],
+            "msg5": [_part_error(403, "userRateLimitExceeded"), _part_error(429)],
+            "msg7": [_part_error(404, "notFound")],
+        }
+    )
+
+    result = gmail._batch_get_messages(service, ids)
+
+    assert [m["id"] for m in result] == [i for i in ids if i != "msg7"]
+    # 실패한 메일만 다시 묶는다
+    assert service.batch_sizes == [10, 2, 1]
+    assert len(sleeps) == 2 and sleeps[0] >= 3
+
+
+def test_batch_get_messages_raises_permanent_and_exhausted_errors(monkeypatch):
+    monkeypatch.setattr(gmail.time, "sleep", lambda _: None)
+
+    service = _FakeGmailService({"msg1": [_part_error(400, "badRequest")]})
+    with pytest.raises(HttpError):
+        gmail._batch_get_messages(service, ["msg0", "msg1"])
+    assert service.batch_sizes == [2]
+
+    throttled = [_part_error(429) for _ in range(gmail.MAX_RETRIES + 1)]
+    service = _FakeGmailService({"msg1": throttled})
+    with pytest.raises(HttpError):
+        gmail._batch_get_messages(service, ["msg0", "msg1"])
+    assert service.batch_sizes == [2] + [1] * gmail.MAX_RETRIES
+
+
+def test_mirror_misses_are_fetched_as_metadata(monkeypatch):
+    from jarvis.store.gmail import GmailMirror
+
+    mirror = GmailMirror(":memory:")
+    mirror.add_messages([{"id": "msg0", "payload": {"headers": []}}])
+    monkeypatch.setattr(gmail, "get_mirror", lambda: mirror)
+    service = _FakeGmailService()
+
+    result = gmail._get_message_metadata(service, ["msg0", "msg1"])
+
+    assert [m["id"] for m in result] == ["msg0", "msg1"]
+    assert [(r["id"], r["format"]) for r in service.requests] == [("msg1", "metadata")]
+    assert "msg1" in mirror.get_messages(["msg1"])
+
+
+class _FakeMessageGet:
+    """messages.get에 fields 마스크를 적용해 돌려주는 Gmail 서비스."""
+
+    def __init__(self, message):
+        self.message = message
+        self.masks = []
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def get(self, userId, id, format, fields):
+        from jarvis.utils.fields import project
+
+        self.masks.append(fields)
+        return SimpleNamespace(execute=lambda: project(self.message, fields))
+
+
+def test_attachments_beyond_the_mask_are_refetched_and_saved(monkeypatch, tmp_path):
+    from jarvis.utils.fields import ATTACHMENT_FIELDS, MESSAGE_FIELDS
+
+    monkeypatch.setenv("JARVIS_ATTACHMENT_DIR", str(tmp_path))
+    inline = base64.urlsafe_b64encode(b"a,b\n1,2\n").decode()
+    deep = {
+        "partId": "9",
+        "mimeType": "application/pdf",
+        "filename": "deep.pdf",
+        "body": {"attachmentId": "att-deep", "size": 10},
+    }
+    # 첨부 마스크 깊이보다 깊이 중첩된 첨부
+    for depth in range(8):
+        deep = {"partId": f"d{depth}", "mimeType": "multipart/mixed", "body": {}, "parts": [deep]}
+    message = {
+        "id": "m1",
+        "payload": {
+            "mimeType": "multipart/mixed",
+            "body": {},
+            "parts": [
+                {
+                    "partId": "1",
+                    "mimeType": "text/csv",
+                    "filename": "small.csv",
+                    "body": {"data": inline, "size": 8},
+                },
+                deep,
+            ],
+        },
+    }
+    service = _FakeMessageGet(message)
+
+    parts = gmail._attachment_parts(service, "m1")
+
+    assert service.masks == [ATTACHMENT_FIELDS, MESSAGE_FIELDS]
+    assert [p["filename"] for p in parts] == ["small.csv", "deep.pdf"]
+
+    text = gmail._save_attachments(service, "m1", parts[:1])
+
+    assert (tmp_path / "m1" / "small.csv").read_bytes() == b"a,b\n1,2\n"
+    assert "8바이트" in text
+
+
+def test_shallow_attachments_use_the_mask_only():
+    message = {
+        "id": "m1",
+        "payload": {
+            "mimeType": "multipart/mixed",
+            "parts": [
+                {
+                    "partId": "1",
+                    "mimeType": "application/pdf",
+                    "filename": "a.pdf",
+                    "body": {"attachmentId": "att1", "size": 10},
+                }
+            ],
+        },
+    }
+    service = _FakeMessageGet(message)
+
+    assert [p["filename"] for p in gmail._attachment_parts(service, "m1")] == ["a.pdf"]
+    assert len(service.masks) == 1
+
+
+class _FakeBulkService:
+    """messages.list 페이지와 batchModify 호출을 기록하는 가짜 서비스."""
+
+    def __init__(self, matching: int = 0, bad_ids: set[str] = frozenset()):
+        self.ids = [f"msg{i}" for i in range(matching)]
+        self.bad_ids = bad_ids
+        self.list_calls = []
+        self.modified = []
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def list(self, **kwargs):
+        self.list_calls.append(kwargs)
+        offset = int(kwargs["pageToken"] or 0)
+        end = offset + kwargs["maxResults"]
+        result = {"messages": [{"id": i} for i in self.ids[offset:end]]}
+        if end < len(self.ids):
+            result["nextPageToken"] = str(end)
+        return SimpleNamespace(execute=lambda: result)
+
+    def batchModify(self, userId, body):
+        def _execute():
+            if self.bad_ids & set(body["ids"]):
+                raise HttpError(SimpleNamespace(status=400, reason="Bad Request"), b"")
+            self.modified.append(body)
+            return ""
+
+        return SimpleNamespace(execute=_execute)
+
+
+def test_resolve_message_ids_follows_pages_up_to_limit():
+    service = _FakeBulkService(matching=1200)
+
+    ids, truncated = gmail._resolve_message_ids(service, None, "from:news", 1100)
+
+    assert ids == service.ids[:1100]
+    assert truncated
+    assert [c["maxResults"] for c in service.list_calls] == [500, 500, 100]
+
+
+def test_resolve_message_ids_dedupes_given_ids():
+    ids, truncated = gmail._resolve_message_ids(None, ["a", "b", "a"], None, 10)
+
+    assert ids == ["a", "b"]
+    assert not truncated
+
+
+@pytest.mark.parametrize("query", ["", "   "])
+def test_bulk_tools_reject_blank_query(monkeypatch, query):
+    from fastmcp import Client, FastMCP
+
+    service = _FakeBulkService(matching=10)
+    monkeypatch.setattr(gmail, "get_gmail_service", lambda: service)
+    mcp = FastMCP("test")
+    gmail.register_gmail_tools(mcp)
+
+    async def _run():
+        async with Client(mcp) as client:
+            trashed = await client.call_tool("bulk_trash_messages", {"query": query})
+            modified = await client.call_tool(
+                "bulk_modify_labels", {"query": query, "add_labels": ["STARRED"]}
+            )
+            return trashed.content[0].text, modified.content[0].text
+
+    assert asyncio.run(_run()) == ("message_ids와 query 중 하나만 지정하세요.",) * 2
+    # 메일함 전체를 고르는 빈 검색어로는 아무 요청도 보내지 않는다
+    assert service.list_calls == []
+    assert service.modified == []
+
+
+def test_batch_modify_chunks_and_reports_failed_chunks():
+    ids = [f"msg{i}" for i in range(gmail._BATCH_MODIFY_MAX + 10)]
+    service = _FakeBulkService(bad_ids={ids[-1]})
+
+    failures = gmail._batch_modify(service, ids, ["TRASH"], [])
+
+    assert len(service.modified) == 1
+    assert service.modified[0]["ids"] == ids[: gmail._BATCH_MODIFY_MAX]
+    assert [chunk for chunk, _ in failures] == [ids[gmail._BATCH_MODIFY_MAX :]]
+
+    text = gmail._format_bulk_result("휴지통 이동", len(ids), failures, truncated=False)
+    assert text.startswith("휴지통 이동 완료: 1000개 성공, 10개 실패")
+    assert "msg1000, msg1001" in text
+    assert "외 5개" in text
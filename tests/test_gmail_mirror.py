@@ -0,0 +1,338 @@
+"""Gmail 로컬 미러 테스트."""
+
+import base64
+import threading
+from datetime import datetime
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from jarvis.store import gmail as gmail_store
+from jarvis.store.gmail import GmailMirror
+from jarvis.store.gmail_query import parse_gmail_query, to_fts_match
+from jarvis.utils.formatting import format_message_list
+
+
+def _meta(message_id, labels=("INBOX",), date=0, subject=None):
+    return {
+        "id": message_id,
+        "threadId": f"t-{message_id}",
+        "labelIds": list(labels),
+        "snippet": f"미리보기 {message_id}",
+        "internalDate": str(date),
+        "payload": {
+            "headers": [
+                {"name": "Subject", "value": subject or f"제목 {message_id}"},
+                {"name": "From", "value": "sender@example.com"},
+                {"name": "Date", "value": "Tue, 11 Feb 2025 10:00:00 +0900"},
+            ]
+        },
+    }
+
+
+class _Request:
+    def __init__(self, result):
+        self._result = result
+
+    def execute(self):
+        if isinstance(self._result, Exception):
+            raise self._result
+        return self._result
+
+
+class _FakeGmail:
+    """getProfile / messages.list / history.list만 흉내내는 Gmail 서비스."""
+
+    def __init__(self, mailbox, history_id="100"):
+        self.mailbox = mailbox
+        self.history_id = history_id
+        self.history_pages = []
+        self.calls = []
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def history(self):
+        return _History(self)
+
+    def getProfile(self, userId):
+        self.calls.append("getProfile")
+        return _Request({"historyId": self.history_id})
+
+    def list(self, userId, maxResults, pageToken, fields):
+        self.calls.append("messages.list")
+        ids = sorted(self.mailbox, key=lambda i: -int(self.mailbox[i]["internalDate"]))
+        result = {"messages": [{"id": i} for i in ids[:maxResults]]}
+        if len(ids) > maxResults:
+            result["nextPageToken"] = "next"
+        return _Request(result)
+
+    def fetch(self, message_ids):
+        return [self.mailbox[i] for i in message_ids if i in self.mailbox]
+
+
+class _History:
+    def __init__(self, service):
+        self._service = service
+
+    def list(self, userId, startHistoryId, historyTypes, pageToken):
+        self._service.calls.append(("history.list", startHistoryId))
+        return _Request(self._service.history_pages.pop(0))
+
+
+@pytest.fixture
+def mirror():
+    return GmailMirror(":memory:")
+
+
+def test_full_sync_then_list(mirror):
+    service = _FakeGmail(
+        {
+            "a": _meta("a", ("INBOX", "UNREAD"), date=3),
+            "b": _meta("b", ("INBOX",), date=2),
+            "c": _meta("c", ("SENT",), date=1),
+        }
+    )
+
+    mirror.sync(service, service.fetch)
+
+    assert mirror.history_id == "100"
+    assert [m["id"] for m in mirror.list_messages(["INBOX"], 10)] == ["a", "b"]
+    assert [m["id"] for m in mirror.list_messages(["INBOX"], 1, offset=1)] == ["b"]
+    assert [m["id"] for m in mirror.list_messages(["INBOX", "UNREAD"], 10)] == ["a"]
+    assert mirror.list_messages(["TRASH"], 10) is None
+
+    formatted = format_message_list(mirror.list_messages(["INBOX"], 1))
+    assert "제목 a" in formatted
+    assert "sender@example.com" in formatted
+
+
+def test_incremental_sync_applies_history(mirror):
+    service = _FakeGmail({"a": _meta("a", date=1), "b": _meta("b", date=2)})
+    mirror.sync(service, service.fetch)
+
+    service.mailbox["c"] = _meta("c", ("INBOX", "UNREAD"), date=3)
+    service.history_pages = [
+        {
+            "history": [
+                {"messagesAdded": [{"message": {"id": "c"}}]},
+                {"messagesDeleted": [{"message": {"id": "b"}}]},
+                {"labelsRemoved": [{"message": {"id": "a", "labelIds": ["ARCHIVE"]}}]},
+            ],
+            "historyId": "120",
+        }
+    ]
+    mirror.invalidate()
+
+    assert mirror.ensure_fresh(service, service.fetch)
+    assert ("history.list", "100") in service.calls
+    assert mirror.history_id == "120"
+    assert [m["id"] for m in mirror.list_messages(["INBOX"], 10)] == ["c"]
+
+
+def test_expired_history_falls_back_to_full_sync_in_background(mirror):
+    service = _FakeGmail({"a": _meta("a", date=1)})
+    mirror.sync(service, service.fetch)
+
+    service.history_id = "500"
+    service.history_pages = [HttpError(httplib2.Response({"status": 404}), b"")]
+    mirror.invalidate()
+
+    # 전체 동기화가 끝날 때까지는 API로 조회한다
+    assert not mirror.ensure_fresh(service, service.fetch)
+    mirror._background_sync.join(5)
+
+    assert mirror.ensure_fresh(service, service.fetch)
+    assert mirror.history_id == "500"
+    assert service.calls.count("getProfile") == 2
+
+
+class _ArrivalLock:
+    """잠금에 도착한 스레드 수를 세는 잠금."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.arrived = threading.Semaphore(0)
+
+    def __enter__(self):
+        self.arrived.release()
+        return self._lock.__enter__()
+
+    def __exit__(self, *exc):
+        return self._lock.__exit__(*exc)
+
+
+def test_callers_queued_behind_a_sync_do_not_sync_again(mirror):
+    service = _FakeGmail({"a": _meta("a", date=1)})
+    mirror.sync(service, service.fetch)
+    service.history_pages = [{"history": [], "historyId": "110"}]
+    mirror.invalidate()
+
+    release = threading.Event()
+    history = service.history
+
+    def _slow_history():
+        release.wait(5)
+        return history()
+
+    service.history = _slow_history
+    lock = mirror._sync_lock = _ArrivalLock()
+    callers = 5
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(mirror.ensure_fresh(service, service.fetch)))
+        for _ in range(callers)
+    ]
+    for t in threads:
+        t.start()
+    # 모두 TTL이 지난 미러를 보고 동기화 잠금까지 온 뒤에 첫 동기화를 끝낸다
+    for _ in range(callers):
+        assert lock.arrived.acquire(timeout=5)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert results == [True] * callers
+    assert [c for c in service.calls if c != "getProfile"] == [
+        "messages.list",
+        ("history.list", "100"),
+    ]
+    assert mirror.history_id == "110"
+
+
+def test_initial_sync_runs_in_background(mirror):
+    service = _FakeGmail({"a": _meta("a", date=1)})
+    release = threading.Event()
+
+    def _slow_fetch(message_ids):
+        release.wait(5)
+        return service.fetch(message_ids)
+
+    # 첫 조회는 전체 동기화를 기다리지 않고 API로 넘긴다
+    assert not mirror.ensure_fresh(service, _slow_fetch)
+    first = mirror._background_sync
+    # 동기화가 도는 동안에는 새로 시작하지 않는다
+    assert not mirror.ensure_fresh(service, _slow_fetch)
+    assert mirror._background_sync is first
+
+    release.set()
+    first.join(5)
+
+    assert mirror.ensure_fresh(service, _slow_fetch)
+    assert service.calls.count("getProfile") == 1
+    assert [m["id"] for m in mirror.list_messages(["INBOX"], 10)] == ["a"]
+
+
+def test_failed_initial_sync_is_retried(mirror):
+    service = _FakeGmail({"a": _meta("a", date=1)})
+
+    def _broken_fetch(message_ids):
+        raise OSError("연결 끊김")
+
+    assert not mirror.ensure_fresh(service, _broken_fetch)
+    mirror._background_sync.join(5)
+    assert mirror.history_id is None
+
+    assert not mirror.ensure_fresh(service, service.fetch)
+    mirror._background_sync.join(5)
+    assert mirror.ensure_fresh(service, service.fetch)
+
+
+def test_partial_mirror_defers_to_api(mirror, monkeypatch):
+    monkeypatch.setattr(gmail_store, "MIRROR_LIMIT", 2)
+    service = _FakeGmail({i: _meta(i, date=n) for n, i in enumerate("abcd")})
+    mirror.sync(service, service.fetch)
+
+    assert not mirror.complete
+    assert [m["id"] for m in mirror.list_messages(["INBOX"], 2)] == ["d", "c"]
+    # 미러 범위를 넘는 요청은 API가 답해야 한다
+    assert mirror.list_messages(["INBOX"], 3) is None
+
+    # 검색 등으로 따로 추가된 오래된 메일은 목록에 끼어들지 않는다
+    mirror.add_messages([service.mailbox["a"]])
+    assert "a" in mirror.get_messages(["a", "b"])
+    assert mirror.list_messages(["INBOX"], 3) is None
+
+
+# --- 로컬 검색 ---
+
+
+def _with_body(message, text):
+    message["payload"]["body"] = {"data": base64.urlsafe_b64encode(text.encode()).decode()}
+    return message
+
+
+@pytest.fixture
+def indexed_mirror(mirror):
+    day = 24 * 60 * 60 * 1000
+    feb_11 = int(datetime(2025, 2, 11).timestamp() * 1000)
+    service = _FakeGmail(
+        {
+            "a": _with_body(
+                _meta("a", ("INBOX", "UNREAD"), date=feb_11 + day, subject="주간 회의록 공유"),
+                "다음 주 일정을 확인해 주세요.",
+            ),
+            "b": _with_body(_meta("b", date=feb_11, subject="청구서"), "2월 청구서입니다."),
+            "c": _with_body(_meta("c", date=feb_11 - day, subject="Weekly report"), "회의 내용 정리"),
+        }
+    )
+    service.mailbox["c"]["payload"]["headers"][1]["value"] = "Boss <boss@corp.com>"
+    mirror.sync(service, service.fetch)
+    return mirror
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("회의록", ["a"]),
+        ("회의", ["a", "c"]),
+        ("일정을", ["a"]),
+        ("from:boss@corp.com", ["c"]),
+        ("subject:weekly", ["c"]),
+        ("is:unread", ["a"]),
+        ("after:2025/02/11", ["a", "b"]),
+        ("before:2025/02/11", ["c"]),
+        ("after:2025/02/11 before:2025/02/12", ["b"]),
+        ('"청구서입니다"', ["b"]),
+        ("회의 is:unread", ["a"]),
+    ],
+)
+def test_search(indexed_mirror, query, expected):
+    parsed = parse_gmail_query(query)
+    assert [m["id"] for m in indexed_mirror.search(parsed, 10)] == expected
+
+
+def test_search_index_follows_deletes(indexed_mirror):
+    indexed_mirror.apply_changes([], {"a"}, {}, "200")
+    assert indexed_mirror.search(parse_gmail_query("회의"), 10) == [
+        indexed_mirror.get_messages(["c"])["c"]
+    ]
+
+
+def test_trashed_and_spam_messages_are_hidden_like_the_api(indexed_mirror):
+    # bulk_trash_messages는 INBOX를 남긴 채 TRASH를 붙인다
+    indexed_mirror.apply_changes([], set(), {"b": ["INBOX", "TRASH"], "c": ["SPAM"]}, "200")
+
+    assert [m["id"] for m in indexed_mirror.list_messages(["INBOX"], 10)] == ["a"]
+    assert indexed_mirror.search(parse_gmail_query("청구서"), 10) == []
+    assert [m["id"] for m in indexed_mirror.search(parse_gmail_query("회의"), 10)] == ["a"]
+    assert parse_gmail_query("청구서 in:trash") is None
+    assert parse_gmail_query("in:spam") is None
+
+
+@pytest.mark.parametrize(
+    "query", ["label:work", "from:a OR from:b", "-spam", "has:attachment", "(a b)", ""]
+)
+def test_unsupported_queries_go_to_api(query):
+    assert parse_gmail_query(query) is None
+
+
+def test_to_fts_match_escapes_quotes():
+    parsed = parse_gmail_query('from:a subject:"주간 보고" say"hi')
+    assert to_fts_match(parsed) == (
+        '"say""hi"* AND sender : "a"* AND subject : "주간 보고"*'
+    )
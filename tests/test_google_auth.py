@@ -0,0 +1,250 @@
+"""Google 인증 모듈 테스트."""
+
+import json
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import httplib2
+import pytest
+
+from jarvis.auth import google_auth
+
+
+@pytest.fixture(autouse=True)
+def _isolated_registry(monkeypatch):
+    monkeypatch.setattr(google_auth, "_credentials", None)
+    monkeypatch.setattr(google_auth, "_services", {})
+
+
+def _fake_creds(**kwargs):
+    defaults = {"expired": False, "valid": True, "refresh_token": "r"}
+    defaults.update(kwargs)
+    return SimpleNamespace(**defaults)
+
+
+def test_get_credentials_cached_in_memory(monkeypatch, tmp_path):
+    loads = []
+    creds = _fake_creds()
+
+    def _load(path, scopes):
+        loads.append(path)
+        return creds
+
+    tokens_file = tmp_path / "tokens.json"
+    tokens_file.write_text("{}")
+    monkeypatch.setattr(google_auth, "TOKENS_FILE", tokens_file)
+    monkeypatch.setattr(google_auth.Credentials, "from_authorized_user_file", _load)
+
+    assert google_auth.get_credentials() is creds
+    assert google_auth.get_credentials() is creds
+    assert len(loads) == 1
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _shared_creds(expires_in: timedelta, token="old"):
+    return google_auth._SharedCredentials(
+        token=token,
+        refresh_token="r",
+        token_uri="https://oauth2.googleapis.com/token",
+        client_id="id",
+        client_secret="secret",
+        expiry=_utcnow() + expires_in,
+    )
+
+
+@pytest.fixture
+def refresh_calls(monkeypatch, tmp_path):
+    """토큰 서버 대신 새 토큰을 발급하는 refresh와 임시 토큰 파일을 준비한다."""
+    calls = []
+
+    def _refresh(self, request):
+        calls.append(threading.current_thread().name)
+        time.sleep(0.05)
+        self.token = f"new-{len(calls)}"
+        self.expiry = _utcnow() + timedelta(hours=1)
+
+    monkeypatch.setattr(google_auth.Credentials, "refresh", _refresh)
+    monkeypatch.setattr(google_auth, "TOKENS_FILE", tmp_path / "tokens.json")
+    return calls
+
+
+def test_get_credentials_refreshes_in_place(monkeypatch, refresh_calls):
+    creds = _shared_creds(timedelta(minutes=-1))
+    monkeypatch.setattr(google_auth, "_credentials", creds)
+
+    assert google_auth.get_credentials() is creds
+    assert creds.valid and creds.token == "new-1"
+    assert json.loads(google_auth.TOKENS_FILE.read_text())["token"] == "new-1"
+
+
+def test_expired_token_refreshes_once_for_concurrent_callers(monkeypatch, refresh_calls):
+    creds = _shared_creds(timedelta(minutes=-1))
+    monkeypatch.setattr(google_auth, "_credentials", creds)
+    callers = 8
+    checked = threading.Barrier(callers, timeout=5)
+    first = threading.Lock()
+    refreshed = threading.Event()
+    seen = threading.local()
+    needs_refresh = google_auth._needs_refresh
+
+    def _checked_then_delayed(c):
+        result = needs_refresh(c)
+        if getattr(seen, "checked", False):
+            return result
+        seen.checked = True
+        # 모두 만료를 확인한 뒤, 한 스레드의 갱신이 끝나고 나서야 나머지가 refresh()에 들어간다
+        checked.wait()
+        if not first.acquire(blocking=False):
+            refreshed.wait(5)
+        return result
+
+    monkeypatch.setattr(google_auth, "_needs_refresh", _checked_then_delayed)
+    tokens = []
+
+    def _call():
+        token = google_auth.get_credentials().token
+        refreshed.set()
+        tokens.append(token)
+
+    threads = [threading.Thread(target=_call) for _ in range(callers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(refresh_calls) == 1
+    assert tokens == ["new-1"] * callers
+
+
+def test_transport_refresh_is_single_flight(refresh_calls):
+    # AuthorizedHttp가 401을 받고 각자 refresh를 부르는 경우. 늦게 부른 스레드는 방금 받은 토큰을 쓴다
+    creds = _shared_creds(timedelta(minutes=-1))
+    creds.refresh(None)
+    threads = [threading.Thread(target=creds.refresh, args=(None,)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(refresh_calls) == 1
+
+
+def test_unauthorized_old_token_is_refreshed_before_expiry(monkeypatch, refresh_calls):
+    # 만료 전이지만 폐기되어 401을 받은 토큰은 갱신한 지 오래되었으면 다시 갱신한다
+    creds = _shared_creds(timedelta(hours=1))
+    creds.refresh(None)
+    assert len(refresh_calls) == 1
+
+    monkeypatch.setattr(creds, "_refreshed_at", time.monotonic() - google_auth._RECENT_REFRESH)
+    creds.refresh(None)
+
+    assert len(refresh_calls) == 2
+
+
+def test_token_near_expiry_refreshes_without_blocking(monkeypatch, refresh_calls):
+    # 아직 유효하지만 REFRESH_MARGIN 안에 만료된다
+    creds = _shared_creds(timedelta(minutes=4, seconds=30))
+    assert creds.valid
+    monkeypatch.setattr(google_auth, "_credentials", creds)
+
+    # 다른 스레드가 갱신 중이면 기존 토큰을 바로 돌려준다
+    with google_auth._refresh_lock:
+        started = time.perf_counter()
+        holder = threading.Thread(target=lambda: google_auth.get_credentials())
+        holder.start()
+        holder.join(timeout=1)
+        assert not holder.is_alive()
+        assert time.perf_counter() - started < 0.5
+    assert refresh_calls == []
+
+    assert google_auth.get_credentials().token == "new-1"
+    assert len(refresh_calls) == 1
+
+
+def test_save_tokens_atomic_and_only_on_change(monkeypatch, tmp_path):
+    tokens_file = tmp_path / "tokens.json"
+    monkeypatch.setattr(google_auth, "TOKENS_FILE", tokens_file)
+    replaced = []
+    real_replace = os.replace
+    monkeypatch.setattr(
+        google_auth.os, "replace", lambda src, dst: (replaced.append(dst), real_replace(src, dst))
+    )
+    creds = _shared_creds(timedelta(hours=1))
+
+    google_auth._save_tokens(creds)
+    google_auth._save_tokens(creds)
+    assert replaced == [tokens_file]
+
+    creds.token = "rotated"
+    google_auth._save_tokens(creds)
+    assert len(replaced) == 2
+    assert json.loads(tokens_file.read_text())["token"] == "rotated"
+    assert [p.name for p in tmp_path.iterdir()] == ["tokens.json"]
+
+
+def test_get_service_builds_once_per_credential(monkeypatch):
+    built = []
+    creds = _fake_creds()
+    monkeypatch.setattr(google_auth, "_credentials", creds)
+
+    def _build(document, http):
+        built.append((document["name"], document["version"], http))
+        return object()
+
+    monkeypatch.setattr(google_auth, "build_from_document", _build)
+
+    first = google_auth.get_service("gmail", "v1")
+    assert google_auth.get_service("gmail", "v1") is first
+    assert google_auth.get_service("calendar", "v3") is not first
+    assert len(built) == 2
+
+    # 재인증으로 자격 증명이 바뀌면 다시 빌드한다
+    monkeypatch.setattr(google_auth, "_credentials", _fake_creds())
+    assert google_auth.get_service("gmail", "v1") is not first
+    assert len(built) == 3
+
+
+def test_thread_local_http_is_per_thread():
+    proxy = google_auth._ThreadLocalHttp(_fake_creds(), "gmail")
+    seen = []
+
+    def _grab():
+        seen.append(proxy._http())
+
+    threads = [threading.Thread(target=_grab) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert proxy._http() is proxy._http()
+    assert seen[0] is not seen[1]
+
+
+def test_services_build_from_bundled_documents_without_network(monkeypatch):
+    def _no_network(*args, **kwargs):
+        raise AssertionError("서비스 생성 중 네트워크 요청이 발생했습니다")
+
+    monkeypatch.setattr(socket.socket, "connect", _no_network)
+    monkeypatch.setattr(socket, "getaddrinfo", _no_network)
+    monkeypatch.setattr(httplib2.Http, "request", _no_network)
+    monkeypatch.setattr(google_auth, "_credentials", _fake_creds())
+
+    calendar = google_auth.get_service("calendar", "v3")
+    gmail = google_auth.get_service("gmail", "v1")
+
+    events = calendar.events().list(calendarId="primary", maxResults=5)
+    assert events.uri.startswith("https://www.googleapis.com/calendar/v3/calendars/primary/")
+    messages = gmail.users().messages().list(userId="me")
+    assert messages.uri.startswith("https://gmail.googleapis.com/gmail/v1/users/me/messages")
+
+    # 파싱한 문서는 프로세스 안에서 재사용한다
+    document = google_auth._discovery_document("gmail", "v1")
+    assert google_auth._discovery_document("gmail", "v1") is document
@@ -0,0 +1,130 @@
+"""도구 계측 테스트."""
+
+import asyncio
+import json
+
+import pytest
+from fastmcp import Client, FastMCP
+
+from jarvis.tools.metrics import register_metrics_resources
+from jarvis.utils import metrics, ratelimit
+from jarvis.utils.concurrency import submit, threaded
+from jarvis.utils.formatting import format_event_list
+
+
+@pytest.fixture(autouse=True)
+def _clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_histogram_buckets_and_quantiles():
+    h = metrics.Histogram((10, 100))
+    for value in (1, 10, 50, 500):
+        h.observe(value)
+
+    # 경계값은 그 버킷에 들어간다
+    assert h.counts == [2, 1, 1]
+    assert h.cumulative() == [(10, 2), (100, 3), ("+Inf", 4)]
+    assert h.quantile(0.5) == 10
+    assert h.quantile(0.75) == 100
+    assert h.quantile(0.99) == "+Inf"
+    assert metrics.Histogram((10,)).quantile(0.5) is None
+
+
+def test_tool_call_collects_upstream_cache_and_formatting():
+    def _fetch(n):
+        metrics.record_upstream("gmail", 0.01, n)
+
+    @threaded
+    def list_things():
+        metrics.record_upstream("gmail", 0.02, 300)
+        # 하위 요청 스레드에서 보낸 요청도 같은 도구 호출에 더해진다
+        submit(_fetch, 200).result()
+        metrics.record_cache("gmail_mirror", hits=3, misses=1)
+        return format_event_list([{"summary": "회의"}])
+
+    asyncio.run(list_things())
+
+    tool = metrics.snapshot()["tools"]["list_things"]
+    assert tool["duration_ms"]["count"] == 1
+    assert tool["upstream_requests"]["sum"] == 2
+    assert tool["bytes_received"]["sum"] == 500
+    assert tool["cache_hits"]["sum"] == 3
+    # format_event_list 안의 format_event는 따로 세지 않는다
+    assert tool["formatting_ms"]["count"] == 1
+    assert tool["errors"] == 0
+
+
+def test_tool_errors_counted():
+    @threaded
+    def broken():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(broken())
+
+    assert metrics.snapshot()["tools"]["broken"]["errors"] == 1
+
+
+def test_calls_outside_tools_only_update_global_counters():
+    metrics.record_upstream("github", 0.05, 1000, retried=True)
+    metrics.record_cache("github_etag", misses=1)
+
+    data = metrics.snapshot()
+    assert data["tools"] == {}
+    assert data["upstream"]["github"]["requests"] == 1
+    assert data["upstream"]["github"]["retried"] == 1
+    assert data["upstream"]["github"]["duration_ms"]["p50"] == 50
+    assert data["caches"] == {"github_etag": {"hits": 0, "misses": 1}}
+
+
+def test_scheduler_records_each_attempt(monkeypatch):
+    monkeypatch.setattr(ratelimit.time, "sleep", lambda seconds: None)
+    responses = iter([(429, b""), (200, b"{}")])
+    scheduler = ratelimit.UpstreamScheduler("calendar", 1000.0, 1000, 4)
+
+    scheduler.call(
+        lambda: next(responses),
+        lambda r: 0.0 if r[0] == 429 else None,
+        size=lambda r: len(r[1]),
+    )
+
+    upstream = metrics.snapshot()["upstream"]["calendar"]
+    assert upstream["requests"] == 2
+    assert upstream["retried"] == 1
+    assert upstream["bytes"] == 2
+
+
+def test_prometheus_text():
+    with metrics.tool_call("get_event"):
+        metrics.record_upstream("calendar", 0.003, 120)
+
+    text = metrics.prometheus_text()
+
+    assert "# TYPE jarvis_tool_duration_ms histogram" in text
+    assert 'jarvis_tool_upstream_requests_bucket{tool="get_event",le="1"} 1' in text
+    assert 'jarvis_tool_upstream_requests_count{tool="get_event"} 1' in text
+    assert 'jarvis_upstream_duration_ms_bucket{api="calendar",le="5"} 1' in text
+    assert 'jarvis_upstream_bytes_total{api="calendar"} 120' in text
+
+
+def test_metrics_resources():
+    mcp = FastMCP("test")
+    register_metrics_resources(mcp)
+    with metrics.tool_call("list_events"):
+        pass
+
+    async def _read():
+        async with Client(mcp) as client:
+            data = await client.read_resource("jarvis://metrics")
+            prom = await client.read_resource("jarvis://metrics/prometheus")
+            return data[0].text, prom[0].text
+
+    data, prom = asyncio.run(_read())
+
+    assert json.loads(data)["tools"]["list_events"]["duration_ms"]["count"] == 1
+    assert "schedulers" in json.loads(data)
+    assert json.loads(data)["result_cache"]["max_bytes"] > 0
+    assert 'tool="list_events"' in prom
@@ -0,0 +1,96 @@
+"""메일 리소스 파싱 테스트."""
+
+import base64
+
+from jarvis.utils.mime import ParsedMessage
+
+
+def _data(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode()).decode()
+
+
+def _part(mime_type: str, text: str, **extra) -> dict:
+    return {"mimeType": mime_type, "body": {"data": _data(text)}, **extra}
+
+
+def _multipart(mime_type: str, *parts: dict) -> dict:
+    return {"mimeType": mime_type, "body": {"size": 0}, "parts": list(parts)}
+
+
+def test_headers_are_case_insensitive_and_first_wins():
+    headers = [{"name": f"X-Trace-{i}", "value": str(i)} for i in range(300)]
+    headers += [
+        {"name": "Received", "value": "first"},
+        {"name": "RECEIVED", "value": "second"},
+        {"name": "Subject", "value": "제목"},
+    ]
+    parsed = ParsedMessage({"payload": {"headers": headers}})
+
+    assert parsed.header("subject") == "제목"
+    assert parsed.header("Received") == "first"
+    assert parsed.header("X-Trace-299") == "299"
+    assert parsed.header("Missing") == ""
+
+
+def test_nested_alternative_prefers_plain_and_skips_attachments():
+    payload = _multipart(
+        "multipart/mixed",
+        _part("text/plain", "첨부 텍스트", filename="note.txt"),
+        _multipart(
+            "multipart/related",
+            _multipart(
+                "multipart/alternative",
+                _part("text/html", "<p>HTML 본문</p>"),
+                _part("text/plain", "텍스트 본문"),
+            ),
+        ),
+    )
+
+    assert ParsedMessage({"payload": payload}).body() == "텍스트 본문"
+
+
+def test_html_is_used_when_there_is_no_plain_part():
+    payload = _multipart(
+        "multipart/mixed",
+        _multipart("multipart/alternative", _part("text/html", "<b>HTML</b>")),
+        _part("application/pdf", "pdf", filename="a.pdf"),
+    )
+
+    assert ParsedMessage({"payload": payload}).body() == "<b>HTML</b>"
+
+
+def test_limit_decodes_only_a_prefix_on_character_boundary():
+    parsed = ParsedMessage({"payload": _part("text/plain", "가나다라마" * 1000)})
+
+    # 한글 한 글자는 3바이트라 4바이트로 자르면 한 글자만 남는다
+    assert parsed.body(limit=4) == "가"
+    assert parsed.body(limit=30) == "가나다라마가나다라마"
+    assert len(parsed.body()) == 5000
+
+
+def test_unpadded_data_and_deep_trees():
+    part = {"mimeType": "text/plain", "body": {"data": _data("ab").rstrip("=")}}
+    for _ in range(5000):
+        part = _multipart("multipart/mixed", part)
+
+    assert ParsedMessage({"payload": part}).body() == "ab"
+
+
+def test_message_without_body_has_empty_text():
+    payload = _multipart("multipart/mixed", _part("image/png", "png", filename="a.png"))
+
+    assert ParsedMessage({"payload": payload}).body() == ""
+    assert ParsedMessage({}).body() == ""
+
+
+def test_attachments_include_inline_data_parts():
+    payload = _multipart(
+        "multipart/mixed",
+        _part("text/plain", "본문"),
+        _part("text/csv", "a,b", filename="small.csv"),
+        {"mimeType": "application/pdf", "filename": "big.pdf", "body": {"attachmentId": "att1"}},
+    )
+
+    names = [p["filename"] for p in ParsedMessage({"payload": payload}).attachments()]
+
+    assert names == ["small.csv", "big.pdf"]
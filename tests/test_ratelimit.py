@@ -0,0 +1,233 @@
+"""업스트림 스케줄러 테스트."""
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import httplib2
+import pytest
+from requests.structures import CaseInsensitiveDict
+
+from jarvis.auth import github_auth, google_auth
+from jarvis.utils import ratelimit
+
+
+@pytest.fixture(autouse=True)
+def _isolated_schedulers(monkeypatch):
+    monkeypatch.setattr(ratelimit, "_schedulers", {})
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """재시도 대기를 실제로 기다리지 않고 기록만 한다."""
+    delays = []
+    monkeypatch.setattr(ratelimit.time, "sleep", delays.append)
+    return delays
+
+
+def _scheduler(**kwargs):
+    options = {"rate": 1000.0, "burst": 1000, "max_concurrency": 4}
+    options.update(kwargs)
+    return ratelimit.UpstreamScheduler("test", **options)
+
+
+def test_token_bucket_limits_rate():
+    bucket = ratelimit.TokenBucket(rate=50, capacity=2)
+    started = time.perf_counter()
+    waits = [bucket.acquire() for _ in range(5)]
+    elapsed = time.perf_counter() - started
+
+    # 버스트 2개는 바로 통과하고 나머지 3개는 초당 50개 속도로 나간다
+    assert waits[:2] == [0.0, 0.0]
+    assert elapsed >= 0.05
+
+
+def test_parse_retry_after():
+    assert ratelimit.parse_retry_after("7") == 7.0
+    assert ratelimit.parse_retry_after(None) is None
+    assert ratelimit.parse_retry_after("soon") is None
+    assert ratelimit.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_call_retries_until_success_honoring_retry_after(sleeps):
+    responses = iter([429, 429, 200])
+    result = _scheduler().call(
+        lambda: next(responses), lambda status: 3.0 if status == 429 else None
+    )
+
+    assert result == 200
+    assert len(sleeps) == 2
+    assert all(delay >= 3.0 for delay in sleeps)
+
+
+def test_call_gives_up_after_max_retries(sleeps):
+    sent = []
+    scheduler = _scheduler()
+    result = scheduler.call(lambda: sent.append(1) or 503, lambda status: 0.0)
+
+    assert result == 503
+    assert len(sent) == ratelimit.MAX_RETRIES + 1
+    assert scheduler.snapshot()["throttled"] == ratelimit.MAX_RETRIES + 1
+
+
+def test_call_does_not_wait_longer_than_limit(sleeps):
+    sent = []
+    _scheduler().call(lambda: sent.append(1) or 429, lambda status: ratelimit.MAX_RETRY_WAIT + 1)
+
+    assert sent == [1]
+    assert sleeps == []
+
+
+def test_writes_are_spaced_apart_without_slowing_reads(sleeps):
+    scheduler = _scheduler(write_rate=2.0)
+
+    for _ in range(3):
+        scheduler.call(lambda: 200, lambda status: None)
+    assert sleeps == []
+
+    for _ in range(3):
+        scheduler.call(lambda: 200, lambda status: None, write=True)
+    # 첫 쓰기는 바로, 나머지는 0.5초 간격 (대기를 흉내만 내므로 예약이 쌓인다)
+    assert sleeps == pytest.approx([0.5, 1.0], abs=0.05)
+
+
+def test_github_write_classification():
+    assert ratelimit.get_scheduler("github")._writes is not None
+    assert github_auth._is_write("POST", "/repos/o/r/issues")
+    assert github_auth._is_write("DELETE", "/api/v3/notifications/threads/1")
+    assert not github_auth._is_write("POST", "/graphql")
+    assert not github_auth._is_write("POST", "/api/v3/graphql")
+    assert not github_auth._is_write("GET", "/repos/o/r/issues?state=open")
+
+
+def test_call_caps_concurrency():
+    scheduler = _scheduler(max_concurrency=2)
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def _send():
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.pop()
+        return 200
+
+    threads = [
+        threading.Thread(target=scheduler.call, args=(_send, lambda r: None)) for _ in range(6)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert max(peak) == 2
+    assert scheduler.snapshot()["in_flight"] == 0
+
+
+def test_quota_status_and_low_quota():
+    assert ratelimit.low_quota("github") is False
+
+    ratelimit.get_scheduler("github").update_quota("graphql", 5000, 42, 1_700_000_000.0)
+
+    assert ratelimit.low_quota("github", "graphql") is True
+    assert ratelimit.low_quota("github", "core") is False
+    status = ratelimit.quota_status()
+    assert status["github"]["quota"]["graphql"]["remaining"] == 42
+
+
+def _google_response(status, content=b"", **headers):
+    return httplib2.Response({"status": status, **headers}), content
+
+
+def test_google_retry_classification():
+    quota = json.dumps(
+        {"error": {"code": 403, "errors": [{"reason": "userRateLimitExceeded"}]}}
+    ).encode()
+    forbidden = json.dumps({"error": {"code": 403, "errors": [{"reason": "forbidden"}]}}).encode()
+
+    assert google_auth._google_retry_after("GET", _google_response(429, **{"retry-after": "4"})) == 4.0
+    assert google_auth._google_retry_after("POST", _google_response(403, quota)) == 0.0
+    assert google_auth._google_retry_after("GET", _google_response(403, forbidden)) is None
+    assert google_auth._google_retry_after("GET", _google_response(503)) == 0.0
+    # 멱등하지 않은 요청은 5xx여도 다시 보내지 않는다
+    assert google_auth._google_retry_after("POST", _google_response(503)) is None
+    assert google_auth._google_retry_after("GET", _google_response(200)) is None
+
+
+def test_google_batch_request_cost():
+    body = "--b\nContent-Type: application/http\n\n--b\nContent-Type: application/http\n\n--b--"
+    assert google_auth._request_cost("https://gmail.googleapis.com/batch/gmail/v1", body) == 2
+    assert google_auth._request_cost("https://gmail.googleapis.com/gmail/v1/users/me", body) == 1
+
+
+def test_google_transport_retries_through_scheduler(monkeypatch, sleeps):
+    responses = iter([_google_response(429), _google_response(200, b"{}")])
+    http = SimpleNamespace(request=lambda *args, **kwargs: next(responses))
+    proxy = google_auth._ThreadLocalHttp(SimpleNamespace(), "gmail")
+    monkeypatch.setattr(proxy, "_http", lambda: http)
+
+    response, content = proxy.request("https://gmail.googleapis.com/gmail/v1/users/me/labels")
+
+    assert response.status == 200 and content == b"{}"
+    assert len(sleeps) == 1
+    assert ratelimit.quota_status()["gmail"]["throttled"] == 1
+
+
+def _github_response(status, body="", **headers):
+    return SimpleNamespace(
+        status=status, headers=CaseInsensitiveDict(headers), read=lambda: body
+    )
+
+
+def test_github_records_quota_per_resource():
+    github_auth._github_retry_after(
+        "POST",
+        _github_response(
+            200,
+            **{
+                "X-RateLimit-Resource": "graphql",
+                "X-RateLimit-Limit": "5000",
+                "X-RateLimit-Remaining": "4990",
+                "X-RateLimit-Reset": "1700000000",
+            },
+        ),
+    )
+
+    quota = ratelimit.quota_status()["github"]["quota"]
+    assert quota == {"graphql": {"limit": 5000, "remaining": 4990, "reset_at": 1_700_000_000.0}}
+
+
+def test_github_retry_classification(monkeypatch):
+    monkeypatch.setattr(github_auth.time, "time", lambda: 1000.0)
+    retry_after = github_auth._github_retry_after
+
+    assert retry_after("GET", _github_response(429, **{"Retry-After": "2"})) == 2.0
+    exhausted = _github_response(403, **{"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1030"})
+    assert retry_after("GET", exhausted) == 30.0
+    secondary = _github_response(403, "You have exceeded a secondary rate limit.")
+    assert retry_after("POST", secondary) == github_auth._SECONDARY_LIMIT_WAIT
+    assert retry_after("GET", _github_response(403, "Resource not accessible")) is None
+    assert retry_after("GET", _github_response(502)) == 0.0
+    assert retry_after("POST", _github_response(502)) is None
+    assert retry_after("GET", _github_response(404)) is None
+
+
+def test_github_client_follows_api_url(monkeypatch):
+    monkeypatch.setattr(github_auth, "_local", threading.local())
+    monkeypatch.setenv("GITHUB_TOKEN", "t")
+
+    monkeypatch.delenv("GITHUB_API_URL", raising=False)
+    default = github_auth.get_github_client()
+    monkeypatch.setenv("GITHUB_API_URL", "http://ghe.local/api/v3")
+    enterprise = github_auth.get_github_client()
+
+    assert default is not enterprise
+    assert default.requester.base_url == github_auth._DEFAULT_API_URL
+    assert enterprise.requester.base_url == "http://ghe.local/api/v3"
+    # 평문 HTTP 주소도 스케줄러를 거친다
+    assert enterprise.requester._Requester__connectionClass is github_auth._scheduled_connection_class(False)
+    assert github_auth.get_github_client() is enterprise
@@ -0,0 +1,80 @@
+"""빈 시간 계산 유틸리티 테스트."""
+
+import random
+from datetime import date, datetime, time
+from zoneinfo import ZoneInfo
+
+from jarvis.utils.slots import free_slots, merge_busy, working_windows
+
+SEOUL = ZoneInfo("Asia/Seoul")
+
+
+def _at(day: int, hour: int, minute: int = 0, tz=SEOUL) -> float:
+    return datetime(2025, 2, day, hour, minute, tzinfo=tz).timestamp()
+
+
+def test_merge_busy_joins_overlapping_and_touching():
+    merged = merge_busy([(5, 7), (1, 3), (2, 4), (4, 4.5), (9, 10), (6, 6.5), (8, 8)])
+
+    assert merged == [(1, 4.5), (5, 7), (9, 10)]
+
+
+def test_working_windows_skip_weekends():
+    # 2025-02-14 금, 15 토, 16 일, 17 월
+    days = (date(2025, 2, 14), date(2025, 2, 17), time(9), time(18), SEOUL)
+
+    assert working_windows(*days) == [(_at(14, 9), _at(14, 18)), (_at(17, 9), _at(17, 18))]
+    assert len(working_windows(*days, include_weekends=True)) == 4
+
+
+def test_working_windows_follow_wall_clock_across_dst():
+    new_york = ZoneInfo("America/New_York")
+    windows = working_windows(date(2025, 3, 7), date(2025, 3, 10), time(9), time(17), new_york)
+
+    assert [datetime.fromtimestamp(s, new_york).hour for s, _ in windows] == [9, 9]
+
+
+def test_free_slots_between_meetings():
+    windows = working_windows(date(2025, 2, 12), date(2025, 2, 13), time(9), time(18), SEOUL)
+    busy = merge_busy(
+        [
+            (_at(12, 8), _at(12, 10)),  # 근무 시작 전부터 이어지는 일정
+            (_at(12, 10, 20), _at(12, 11)),
+            (_at(12, 13), _at(12, 14)),
+            (_at(12, 13, 30), _at(12, 17, 45)),
+            (_at(12, 17), _at(13, 12)),  # 다음 날까지 이어지는 일정
+        ]
+    )
+
+    slots = free_slots(busy, windows, 30 * 60)
+
+    assert slots == [
+        (_at(12, 11), _at(12, 13)),
+        (_at(13, 12), _at(13, 18)),
+    ]
+
+
+def test_free_slots_matches_brute_force():
+    rng = random.Random(7)
+    windows = working_windows(date(2025, 2, 3), date(2025, 2, 28), time(9), time(18), SEOUL)
+    busy = []
+    for _ in range(400):
+        start = rng.uniform(windows[0][0], windows[-1][1])
+        busy.append((start, start + rng.choice([15, 30, 60, 90]) * 60))
+    merged = merge_busy(busy)
+
+    slots = free_slots(merged, windows, 45 * 60)
+
+    # 분 단위로 빈 시간을 직접 세어 비교한다
+    step = 60
+    for window_start, window_end in windows:
+        minute = window_start
+        while minute < window_end:
+            is_busy = any(s <= minute < e for s, e in busy)
+            in_slot = any(s <= minute < e for s, e in slots)
+            if in_slot:
+                assert not is_busy
+            minute += step
+    for start, end in slots:
+        assert end - start >= 45 * 60
+        assert not any(s < end and e > start for s, e in busy)
@@ -0,0 +1,89 @@
+"""서버 시작 비용 테스트.
+
+MCP 호스트는 세션마다 서버를 새로 띄우므로 import 시간이 곧 사용자 대기 시간이다.
+python -X importtime으로 jarvis.server(진입점 jarvis.server:main)를 불러오는 비용을 측정한다.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# 첫 도구 호출 때 불러와야 하는 무거운 모듈
+DEFERRED_MODULES = [
+    "googleapiclient.discovery",
+    "google_auth_oauthlib",
+    "google.oauth2.credentials",
+    "google_auth_httplib2",
+    "httplib2",
+    "github",
+]
+
+# fastmcp 등 프레임워크를 제외한 Jarvis 자체 시작 비용 상한(ms). 도구 등록 시간을 포함한다.
+# 느린 환경에서는 환경 변수로 늘린다.
+IMPORT_BUDGET_MS = float(os.getenv("JARVIS_IMPORT_BUDGET_MS", "300"))
+
+
+def _import_profile(module: str) -> list[tuple[str, int, int, int]]:
+    """python -X importtime 결과를 (모듈, 깊이, self, cumulative) 목록으로 반환한다. 시간은 마이크로초."""
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def _own_cost_us(entries, module: str) -> int:
+    """module의 import 비용에서 Jarvis 밖 패키지(fastmcp 등)를 직접 불러온 비용을 뺀다.
+
+    도구 등록 중 fastmcp가 지연 import하는 모듈도 module의 직접 자식으로 잡히므로 함께 뺀다.
+    """
+    index = next(i for i, entry in enumerate(entries) if entry[0] == module)
+    _, depth, _, total = entries[index]
+    framework = 0
+    for name, child_depth, _, cumulative in reversed(entries[:index]):
+        if child_depth <= depth:
+            break
+        if child_depth == depth + 1 and not name.startswith("jarvis"):
+            framework += cumulative
+    return total - framework
+
+
+@pytest.fixture(scope="module")
+def server_profile():
+    return _import_profile("jarvis.server")
+
+
+def test_server_import_defers_heavy_clients(server_profile):
+    loaded = [
+        name
+        for name, *_ in server_profile
+        if any(name == m or name.startswith(m + ".") for m in DEFERRED_MODULES)
+    ]
+    assert loaded == []
+
+
+def test_server_import_within_budget(server_profile):
+    own_ms = _own_cost_us(server_profile, "jarvis.server") / 1000
+
+    slowest = sorted(
+        (entry for entry in server_profile if entry[0].startswith("jarvis")),
+        key=lambda entry: -entry[3],
+    )[:10]
+    report = "\n".join(f"{cumulative / 1000:8.1f}ms  {name}" for name, _, _, cumulative in slowest)
+    assert own_ms < IMPORT_BUDGET_MS, f"jarvis import {own_ms:.0f}ms\n{report}"
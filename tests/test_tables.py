@@ -0,0 +1,75 @@
+"""간결한 표 출력 테스트."""
+
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from jarvis.utils import tables
+from jarvis.utils.tables import ISSUES, MESSAGES, format_table, output_format
+
+
+def _message(msg_id: str, subject: str) -> dict:
+    headers = [
+        {"name": "Subject", "value": subject},
+        {"name": "From", "value": "a@example.com"},
+        {"name": "Date", "value": "Thu, 01 Jan 2026 00:00:00 +0000"},
+    ]
+    return {"id": msg_id, "snippet": "미리보기", "payload": {"headers": headers}}
+
+
+def _issue(number: int, labels: list[str]):
+    return SimpleNamespace(
+        number=number,
+        title=f"이슈 {number}",
+        state="open",
+        user=SimpleNamespace(login="octo"),
+        created_at=datetime(2026, 1, 2, 9, 30),
+        labels=[SimpleNamespace(name=n) for n in labels],
+        assignees=[],
+    )
+
+
+def test_output_format_uses_server_default(monkeypatch):
+    monkeypatch.setattr(tables, "OUTPUT_FORMAT", "tsv")
+
+    assert output_format(None) == "tsv"
+    assert output_format("JSON") == "json"
+    with pytest.raises(ValueError):
+        output_format("xml")
+
+
+def test_json_table_matches_structured_content():
+    result = format_table(MESSAGES, [_message("m1", "회의"), _message("m2", "보고서")], "json", "c1")
+
+    data = json.loads(result.content[0].text)
+    assert data == result.structured_content
+    assert data["columns"] == ["id", "from", "date", "subject", "snippet"]
+    assert [row[0] for row in data["rows"]] == ["m1", "m2"]
+    assert data["cursor"] == "c1"
+
+
+def test_tsv_has_one_header_and_flat_cells():
+    result = format_table(ISSUES, [_issue(1, ["bug", "urgent"]), _issue(2, [])], "tsv")
+
+    lines = result.content[0].text.split("\n")
+    assert lines[0] == "number\ttitle\tstate\tauthor\tcreated_at\tlabels\tassignees"
+    assert lines[1] == "1\t이슈 1\topen\tocto\t2026-01-02 09:30\tbug,urgent\t"
+    assert len(lines) == 3
+    assert result.structured_content["rows"][1][5] == ""
+
+
+def test_tsv_cells_cannot_break_rows():
+    message = _message("m1", "줄\n바꿈\t제목")
+
+    text = format_table(MESSAGES, [message], "tsv", "next").content[0].text
+
+    assert text.split("\n")[1].split("\t")[3] == "줄 바꿈 제목"
+    assert text.endswith("\n\ncursor=next")
+
+
+def test_empty_table_keeps_header():
+    result = format_table(MESSAGES, [], "json")
+
+    assert result.structured_content == {"columns": list(MESSAGES.columns), "rows": []}
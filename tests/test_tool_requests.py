@@ -0,0 +1,222 @@
+"""도구별 업스트림 요청 수 회귀 테스트.
+
+benchmarks/fake_upstream의 가짜 API 서버에 실제 클라이언트 스택을 붙여 도구를 호출하고,
+요청 수가 페이지 수만큼만 드는지(N+1 조회가 없는지) 확인한다.
+"""
+
+import asyncio
+import hashlib
+import math
+import re
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from fastmcp import Client, FastMCP
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+import bench_tools  # noqa: E402
+from fake_upstream import EVENTS_PER_DAY, FakeUpstream, attachment_content  # noqa: E402
+from jarvis.auth import google_auth  # noqa: E402
+from jarvis.utils import coalesce, ratelimit  # noqa: E402
+
+SIZE = 120
+_scenarios = {name: (tool, args) for name, tool, args in bench_tools.scenarios(SIZE)}
+
+
+@pytest.fixture(scope="module")
+def upstream():
+    server = FakeUpstream(SIZE).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def mcp(upstream, monkeypatch, tmp_path):
+    # connect()가 바꾸는 전역 상태를 테스트가 끝나면 되돌린다
+    monkeypatch.setattr(google_auth, "_discovery_document", google_auth._discovery_document)
+    monkeypatch.setattr(google_auth, "_credentials", None)
+    monkeypatch.setattr(google_auth, "_services", {})
+    monkeypatch.setattr(ratelimit, "_schedulers", {})
+    monkeypatch.setattr(coalesce, "RESULT_TTL", coalesce.RESULT_TTL)
+    monkeypatch.setenv("GITHUB_TOKEN", "")
+    monkeypatch.setenv("GITHUB_API_URL", "")
+    monkeypatch.setenv("JARVIS_ATTACHMENT_DIR", str(tmp_path))
+    bench_tools.connect(upstream.url, throttle=False)
+
+    server = FastMCP("test")
+    bench_tools.register_calendar_tools(server)
+    bench_tools.register_gmail_tools(server)
+    bench_tools.register_github_tools(server)
+    bench_tools.register_briefing_tools(server)
+    return server
+
+
+def _call(mcp, upstream, name: str, **overrides) -> tuple[str, dict]:
+    tool, args = _scenarios[name]
+    args = {**args, **overrides}
+
+    async def _run():
+        async with Client(mcp) as client:
+            return await client.call_tool(tool, args)
+
+    upstream.reset_stats()
+    result = asyncio.run(_run())
+    return result.content[0].text, upstream.snapshot_stats()
+
+
+def _requests(stats: dict) -> dict[str, int]:
+    return {api: entry["requests"] for api, entry in stats.items()}
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("list_events", {"calendar": 1}),
+        # calendarList 1 + 캘린더 4개의 첫 페이지
+        ("list_events[all]", {"calendar": 5}),
+        # 내 캘린더 + 참석자 120명을 freebusy 한도(50)로 나눈 만큼
+        ("find_free_slots", {"calendar": math.ceil((SIZE + 1) / 50)}),
+        # messages.list 1 + 메타데이터 배치(50개씩)
+        ("list_messages", {"gmail": 1 + math.ceil(SIZE / 50)}),
+        ("list_issues", {"github": math.ceil(SIZE / 100)}),
+        ("list_pull_requests", {"github": math.ceil(SIZE / 100)}),
+        ("list_notifications", {"github": math.ceil(SIZE / 100)}),
+        ("list_repos", {"github": math.ceil(SIZE / 100)}),
+        ("get_message", {"gmail": 1}),
+        ("bulk_trash_messages", {"gmail": math.ceil(SIZE / 1000)}),
+        ("get_issue", {"github": 2}),
+        # 첨부 메타데이터 1 + 첨부 2개를 하나씩
+        ("save_attachments", {"gmail": 3}),
+        # 영역마다 첫 페이지만: 일정 1, 메일 목록 1 + 메타데이터 배치 1, 알림 1
+        ("daily_briefing", {"calendar": 1, "gmail": 2, "github": 1}),
+    ],
+)
+def test_requests_scale_with_pages_not_items(mcp, upstream, name, expected):
+    text, stats = _call(mcp, upstream, name)
+
+    assert "오류" not in text
+    assert _requests(stats) == expected
+
+
+def test_list_messages_fetches_each_message_once(mcp, upstream):
+    text, stats = _call(mcp, upstream, "list_messages")
+
+    assert text.startswith(f"총 {SIZE}개 메일")
+    assert stats["gmail"]["batch_parts"] == SIZE
+
+
+@pytest.mark.parametrize(
+    "name, count_line",
+    [
+        ("list_events", r"총 (\d+)개 일정"),
+        ("list_events[all]", r"총 (\d+)개 일정"),
+        ("list_messages", r"총 (\d+)개 메일"),
+        ("list_issues", r"총 (\d+)개 이슈"),
+        ("list_issues[labels]", r"총 (\d+)개 이슈"),
+        ("list_pull_requests", r"총 (\d+)개 PR"),
+        ("list_repos", r"총 (\d+)개 저장소"),
+        ("list_notifications", r"총 (\d+)개 알림"),
+    ],
+)
+def test_cursor_walks_every_item_once(mcp, upstream, name, count_line):
+    first, _ = _call(mcp, upstream, name, max_results=SIZE * 10)
+    expected = int(re.search(count_line, first).group(1))
+    # 마지막 페이지가 꽉 차지 않도록 나눈다
+    page_size = max(expected // 3 - 1, 1)
+
+    total = 0
+    cursor = None
+    requests = 0
+    while True:
+        text, stats = _call(mcp, upstream, name, max_results=page_size, cursor=cursor)
+        requests += sum(_requests(stats).values())
+        match = re.search(count_line, text)
+        total += int(match.group(1)) if match else 0
+        found = re.search(r'cursor="([^"]+)"', text)
+        if found is None:
+            break
+        cursor = found.group(1)
+
+    assert total == expected
+    assert requests <= (math.ceil(expected / page_size) + 1) * 10
+
+
+def test_cursor_from_another_query_is_rejected(mcp, upstream):
+    text, _ = _call(mcp, upstream, "list_issues", max_results=10)
+    cursor = re.search(r'cursor="([^"]+)"', text).group(1)
+
+    other, stats = _call(mcp, upstream, "list_pull_requests", max_results=10, cursor=cursor)
+
+    assert "처음부터 다시 조회" in other
+    assert _requests(stats) == {}
+
+
+@pytest.mark.parametrize("output", ["json", "tsv"])
+def test_compact_output_is_smaller_and_pages_like_text(mcp, upstream, output):
+    text, _ = _call(mcp, upstream, "list_issues", max_results=10)
+
+    async def _run():
+        async with Client(mcp) as client:
+            args = {**_scenarios["list_issues"][1], "max_results": 10, "output": output}
+            return await client.call_tool("list_issues", args)
+
+    result = asyncio.run(_run())
+    table = result.structured_content
+    body = result.content[0].text
+
+    assert len(table["rows"]) == 10
+    assert len(body.encode()) < len(text.encode())
+    # 텍스트와 같은 조회 조건이므로 같은 다음 페이지를 가리킨다
+    assert table["cursor"] == re.search(r'cursor="([^"]+)"', text).group(1)
+
+
+def test_attachments_are_streamed_to_disk(mcp, upstream, tmp_path):
+    text, stats = _call(mcp, upstream, "download_attachment")
+
+    path = tmp_path / f"{0:016x}" / "report.pdf"
+    expected = attachment_content(f"att-{0:016x}-1", path.stat().st_size)
+    assert path.read_bytes() == expected
+    assert str(path) in text
+    assert hashlib.sha256(expected).hexdigest() in text
+    assert _requests(stats) == {"gmail": 2}
+    assert [p.name for p in path.parent.iterdir()] == ["report.pdf"]
+
+
+def _timed_call(mcp, upstream, name: str, **overrides) -> tuple[str, float]:
+    tool, args = _scenarios[name]
+
+    async def _run():
+        async with Client(mcp) as client:
+            started = time.perf_counter()
+            result = await client.call_tool(tool, {**args, **overrides})
+            return result, time.perf_counter() - started
+
+    result, elapsed = asyncio.run(_run())
+    return result.content[0].text, elapsed
+
+
+def test_briefing_waits_for_the_slowest_service_not_the_sum(mcp, upstream, monkeypatch):
+    for api in ("calendar", "gmail", "github"):
+        monkeypatch.setitem(upstream.latency, api, 0.2)
+
+    text, elapsed = _timed_call(mcp, upstream, "daily_briefing")
+
+    assert f"📅 일정 {EVENTS_PER_DAY}개\n" in text
+    assert re.search(r"📧 안 읽은 메일 10개\+", text)
+    assert re.search(r"🔔 GitHub 알림 10개\+", text)
+    # 차례로 부르면 일정 1 + 메일 2 + 알림 1 요청으로 0.8초, 동시에 부르면 메일의 0.4초
+    assert elapsed < 0.7
+
+
+def test_briefing_returns_partial_result_when_a_service_is_slow(mcp, upstream, monkeypatch):
+    monkeypatch.setitem(upstream.latency, "github", 1.5)
+
+    text, elapsed = _timed_call(mcp, upstream, "daily_briefing", timeout=0.5)
+
+    assert elapsed < 1.2
+    assert "🔔 GitHub 알림: 시간 초과" in text
+    assert f"📅 일정 {EVENTS_PER_DAY}개\n" in text
+    assert re.search(r"📧 안 읽은 메일 10개\+", text)